@@ -0,0 +1,105 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import config
+
+CHUNK_SIZE = 1024 * 1024
+REF_PREFIX = "sha256:"
+
+
+class BlobStore:
+    """Content-addressed file store keyed by SHA-256.
+
+    Blobs live at ``<root>/ab/cd/abcd...<ext>`` so no directory grows too
+    large. Identical content is stored once no matter how often or from
+    which run it is captured; the digest is computed while the bytes are
+    written to a temporary file that is then moved into place.
+    """
+    def __init__(self, root=None):
+        self.root = root or config.BLOB_DIR
+        self._tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(self._tmp_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def path_for(self, digest, ext=".png"):
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{digest}{ext}")
+
+    def put(self, data, ext=".png"):
+        """Store bytes and return ``(digest, path)``"""
+        hasher = hashlib.sha256()
+        view = memoryview(data)
+        fd, temp_path = tempfile.mkstemp(dir=self._tmp_dir, suffix=ext)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for offset in range(0, len(view), CHUNK_SIZE):
+                    chunk = view[offset:offset + CHUNK_SIZE]
+                    hasher.update(chunk)
+                    f.write(chunk)
+            return self._commit(temp_path, hasher.hexdigest(), ext)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def put_file(self, source_path, ext=None):
+        """Copy a file into the store in one read/hash/write pass"""
+        ext = ext or os.path.splitext(source_path)[1]
+        hasher = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self._tmp_dir, suffix=ext)
+        try:
+            with open(source_path, 'rb') as source, os.fdopen(fd, 'wb') as f:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+                    f.write(chunk)
+            return self._commit(temp_path, hasher.hexdigest(), ext)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _commit(self, temp_path, digest, ext):
+        path = self.path_for(digest, ext)
+        with self._lock:
+            if os.path.exists(path):
+                os.remove(temp_path)  # Already stored by an earlier capture
+                logging.info(f"Blob {digest[:12]} already stored, reusing {path}")
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp_path, path)
+        return digest, path
+
+    def exists(self, digest, ext=".png"):
+        return os.path.exists(self.path_for(digest, ext))
+
+    @staticmethod
+    def ref(digest):
+        """Reference to a blob as written into metadata JSON"""
+        return f"{REF_PREFIX}{digest}"
+
+    def resolve(self, value, ext=".png"):
+        """Turn a ``sha256:`` reference (or a plain path) into a file path"""
+        if isinstance(value, str) and value.startswith(REF_PREFIX):
+            digest = value[len(REF_PREFIX):]
+            path = self.path_for(digest, ext)
+            if not os.path.exists(path):
+                # Fall back to any extension stored under the same digest
+                directory = os.path.dirname(path)
+                if os.path.isdir(directory):
+                    for name in os.listdir(directory):
+                        if name.startswith(digest):
+                            return os.path.join(directory, name)
+            return path
+        return value
+
+
+_default_store = None
+
+
+def get_blob_store():
+    """Process-wide blob store rooted at BLOB_DIR"""
+    global _default_store
+    if _default_store is None:
+        _default_store = BlobStore()
+    return _default_store
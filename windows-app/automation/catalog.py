@@ -0,0 +1,305 @@
+from bs4 import BeautifulSoup
+from contextlib import contextmanager
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import config
+from automation.blob_store import REF_PREFIX
+from automation.watermarks import to_timestamp
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    platform TEXT NOT NULL,
+    target TEXT NOT NULL,
+    data_type TEXT,
+    instance TEXT,
+    source TEXT,
+    captured_at TEXT NOT NULL,
+    url TEXT,
+    metadata_file TEXT UNIQUE,
+    records_file TEXT,
+    posts_file TEXT,
+    previous_run TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_target ON runs (platform, target, data_type, captured_at);
+CREATE INDEX IF NOT EXISTS idx_runs_time ON runs (captured_at);
+
+CREATE TABLE IF NOT EXISTS screenshots (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    sha256 TEXT,
+    path TEXT,
+    PRIMARY KEY (run_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_screenshots_sha256 ON screenshots (sha256);
+
+CREATE TABLE IF NOT EXISTS posts (
+    platform TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    author TEXT,
+    posted_at TEXT,
+    text TEXT,
+    permalink TEXT,
+    media TEXT,
+    PRIMARY KEY (platform, post_id)
+);
+CREATE INDEX IF NOT EXISTS idx_posts_author ON posts (platform, author, posted_at);
+CREATE INDEX IF NOT EXISTS idx_posts_time ON posts (posted_at);
+CREATE INDEX IF NOT EXISTS idx_posts_run ON posts (run_id);
+"""
+
+# Metadata key holding the target, and the data type it implies when none is given
+_TARGET_KEYS = (("subreddit", "Subreddit"), ("hashtag", "Hashtag"), ("username", "User Profile"), ("target", None))
+
+
+def _sha256_file(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _html_text(value):
+    if value and "<" in value:
+        return BeautifulSoup(value, "html.parser").get_text(" ", strip=True)
+    return value
+
+
+def normalize_record(platform, record):
+    """Map a JSONL line (parsed post or raw API record) to the posts table fields"""
+    if "data" not in record:
+        return record  # Already id/author/timestamp/text/permalink/media from post_parser
+    data = record["data"]
+    if platform == "reddit":
+        permalink = data.get("permalink")
+        media = [data["url_overridden_by_dest"]] if data.get("url_overridden_by_dest") else []
+        return {
+            "id": data.get("name"),
+            "author": data.get("author"),
+            "timestamp": data.get("created_utc"),
+            "text": "\n\n".join(filter(None, [data.get("title"), data.get("selftext") or data.get("body")])),
+            "permalink": f"https://www.reddit.com{permalink}" if permalink else None,
+            "media": media
+        }
+    if platform == "mastodon":
+        return {
+            "id": data.get("id"),
+            "author": (data.get("account") or {}).get("acct"),
+            "timestamp": data.get("created_at"),
+            "text": _html_text(data.get("content")),
+            "permalink": data.get("url") or data.get("uri"),
+            "media": [attachment.get("url") for attachment in data.get("media_attachments", []) if attachment.get("url")]
+        }
+    return None
+
+
+class Catalog:
+    """SQLite index of every extraction run, its screenshots and the posts it captured.
+
+    The per-run metadata JSON files stay the source of truth; the catalog
+    is what answers questions across runs ("every capture of user X last
+    month") without globbing and parsing them.
+    """
+    def __init__(self, path=None):
+        self.path = path or config.CATALOG_DB
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection so the GUI thread, workers and processes can share the file"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def record_metadata(self, platform, metadata_file, metadata, data_type=None, conn=None):
+        """Catalog one run from its metadata dict; returns the run id (None if already cataloged)"""
+        if conn is None:
+            with self._connect() as conn:
+                return self.record_metadata(platform, metadata_file, metadata, data_type, conn)
+
+        target = None
+        for key, implied_type in _TARGET_KEYS:
+            if metadata.get(key):
+                target = metadata[key]
+                data_type = data_type or metadata.get("data_type") or implied_type
+                break
+        if target is None:
+            raise ValueError(f"No target in metadata {metadata_file}")
+
+        metadata_file = os.path.normpath(metadata_file)
+        incremental = metadata.get("incremental") or {}
+        cursor = conn.execute(
+            """INSERT OR IGNORE INTO runs (platform, target, data_type, instance, source, captured_at, url,
+                                           metadata_file, records_file, posts_file, previous_run)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (platform, target.lower(), data_type, metadata.get("instance"), metadata.get("source", "browser"),
+             metadata.get("extraction_time") or datetime.now().strftime("%Y-%m-%d %H:%M:%S"), metadata.get("url"),
+             metadata_file, metadata.get("records_file"), metadata.get("posts_file"), incremental.get("previous_run")))
+        if not cursor.rowcount:
+            return None
+        run_id = cursor.lastrowid
+
+        frames = {frame["sha256"]: frame for frame in metadata.get("frames") or []}
+        rows = []
+        for position, screenshot in enumerate(metadata.get("screenshots") or []):
+            if not screenshot:
+                continue
+            if screenshot.startswith(REF_PREFIX):
+                digest = screenshot[len(REF_PREFIX):]
+                frame = frames.get(digest, {})
+                name, path = frame.get("name"), frame.get("path")
+            else:
+                path = screenshot
+                digest = _sha256_file(path) if os.path.exists(path) else None  # Pre blob-store captures
+                name = os.path.basename(path)
+            rows.append((run_id, position, name, digest, path))
+        conn.executemany("INSERT INTO screenshots (run_id, position, name, sha256, path) VALUES (?, ?, ?, ?, ?)", rows)
+
+        for records_file in filter(None, [metadata.get("posts_file"), metadata.get("records_file")]):
+            self._import_posts(conn, platform, run_id, records_file)
+        return run_id
+
+    def _import_posts(self, conn, platform, run_id, path):
+        if not os.path.exists(path):
+            logging.warning(f"Post records file not found: {path}")
+            return
+        rows = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                post = normalize_record(platform, json.loads(line))
+                if not post or not post.get("id"):
+                    continue
+                rows.append((platform, str(post["id"]), run_id, post.get("author"), to_timestamp(post.get("timestamp")),
+                             post.get("text"), post.get("permalink"), json.dumps(post.get("media") or [])))
+        # First capture of a post wins; later runs only re-saw it
+        conn.executemany("INSERT OR IGNORE INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def import_tree(self, root=None, batch_size=200):
+        """Bulk-import existing ``<root>/<platform>/*.json`` metadata files; returns (imported, skipped)"""
+        root = root or config.DATA_DIR
+        imported = skipped = 0
+        pending = 0
+        with self._connect() as conn:
+            for platform in sorted(os.listdir(root)):
+                platform_dir = os.path.join(root, platform)
+                if not os.path.isdir(platform_dir):
+                    continue
+                for name in sorted(os.listdir(platform_dir)):
+                    if not name.endswith(".json"):
+                        continue
+                    path = os.path.join(platform_dir, name)
+                    conn.execute("SAVEPOINT import_file")  # A bad file leaves no partial rows behind
+                    try:
+                        with open(path, encoding='utf-8') as f:
+                            metadata = json.load(f)
+                        run_id = self.record_metadata(platform, path, metadata, conn=conn)
+                    except (OSError, ValueError, sqlite3.Error) as e:
+                        conn.execute("ROLLBACK TO import_file")
+                        logging.warning(f"Skipping {path}: {str(e)}")
+                        run_id = None
+                    conn.execute("RELEASE import_file")
+                    if run_id:
+                        imported += 1
+                        pending += 1
+                        if pending >= batch_size:
+                            conn.commit()
+                            pending = 0
+                    else:
+                        skipped += 1
+        logging.info(f"Catalog import from {root}: {imported} run(s) imported, {skipped} skipped")
+        return imported, skipped
+
+    def find_runs(self, platform=None, target=None, data_type=None, since=None, until=None, limit=None):
+        """Runs matching every given filter, newest first"""
+        clauses, params = [], []
+        for column, value in (("platform", platform), ("target", target.lower() if target else None), ("data_type", data_type)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("captured_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("captured_at < ?")
+            params.append(until)
+        sql = "SELECT * FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY captured_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def screenshots(self, run_id):
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(
+                "SELECT * FROM screenshots WHERE run_id = ? ORDER BY position", (run_id,))]
+
+    def runs_with_blob(self, digest):
+        """Every run that captured the screenshot with this SHA-256"""
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(
+                """SELECT runs.* FROM runs JOIN screenshots ON screenshots.run_id = runs.id
+                   WHERE screenshots.sha256 = ? ORDER BY captured_at DESC""", (digest,))]
+
+    def find_posts(self, platform=None, author=None, since=None, until=None, text=None, limit=None):
+        """Captured posts matching every given filter, newest first"""
+        clauses, params = [], []
+        if platform:
+            clauses.append("platform = ?")
+            params.append(platform)
+        if author:
+            clauses.append("author = ?")
+            params.append(author)
+        if since:
+            clauses.append("posted_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("posted_at < ?")
+            params.append(until)
+        if text:
+            clauses.append("text LIKE ?")
+            params.append(f"%{text}%")
+        sql = "SELECT * FROM posts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY posted_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._connect() as conn:
+            rows = [dict(row) for row in conn.execute(sql, params)]
+        for row in rows:
+            row["media"] = json.loads(row["media"] or "[]")
+        return rows
+
+
+def record_run(platform, metadata_file, metadata, data_type=None):
+    """Catalog a finished run without letting a catalog problem fail the extraction"""
+    try:
+        return Catalog().record_metadata(platform, metadata_file, metadata, data_type)
+    except Exception as e:
+        logging.error(f"Could not add {metadata_file} to the catalog: {str(e)}")
+        return None
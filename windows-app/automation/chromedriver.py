@@ -0,0 +1,171 @@
+import glob
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import config
+
+DRIVER_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+RESOLVED_FILE = "resolved.json"
+VERSION_TIMEOUT = 10  # Seconds allowed for a `--version` call
+CHROME_COMMANDS = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+MAC_CHROME = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+_VERSION = re.compile(r"\b(\d+)\.\d+\.\d+\.\d+\b")
+
+_resolved_path = None
+_lock = threading.Lock()
+
+
+class DriverNotFound(RuntimeError):
+    """No usable ChromeDriver was found and downloading is disabled"""
+
+
+def _major(version):
+    return version.split(".")[0] if version else None
+
+
+def _version_output(executable):
+    """The version printed by ``executable --version``, or None"""
+    try:
+        output = subprocess.run([executable, "--version"], capture_output=True, text=True,
+                                timeout=VERSION_TIMEOUT).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION.search(output)
+    return match.group(0) if match else None
+
+
+def _windows_chrome_version():
+    import winreg
+    for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            continue
+    # chrome.exe does not print its version; installs keep it as a folder name
+    for root in filter(None, [os.getenv("PROGRAMFILES"), os.getenv("PROGRAMFILES(X86)"), os.getenv("LOCALAPPDATA")]):
+        folder = os.path.join(root, "Google", "Chrome", "Application")
+        versions = [name for name in os.listdir(folder) if _VERSION.fullmatch(name)] if os.path.isdir(folder) else []
+        if versions:
+            return max(versions, key=lambda v: [int(part) for part in v.split(".")])
+    return None
+
+
+def chrome_version():
+    """Version of the installed Chrome, read locally (registry or ``--version``)"""
+    if config.CHROME_BINARY:
+        return _version_output(config.CHROME_BINARY)
+    if os.name == "nt":
+        return _windows_chrome_version()
+    for command in CHROME_COMMANDS:
+        executable = shutil.which(command)
+        if executable:
+            return _version_output(executable)
+    if os.path.exists(MAC_CHROME):
+        return _version_output(MAC_CHROME)
+    return None
+
+
+class ChromeDriverResolver:
+    """Finds a ChromeDriver matching the installed Chrome without network access.
+
+    Candidates are ``CHROMEDRIVER_PATH``, the driver remembered for this
+    Chrome version, ``CHROMEDRIVER_DIRS``, the bundled ``drivers/`` folder,
+    the per-version cache, PATH and webdriver-manager's download folder, in
+    that order. The match is remembered in the cache so later processes skip
+    the search. Downloading happens only with ``CHROMEDRIVER_DOWNLOAD``.
+    """
+    def __init__(self, cache_dir=None, search_dirs=None, allow_download=None):
+        self.cache_dir = cache_dir or config.CHROMEDRIVER_CACHE_DIR
+        self.search_dirs = search_dirs if search_dirs is not None else config.CHROMEDRIVER_DIRS + [config.DRIVERS_DIR]
+        self.allow_download = config.CHROMEDRIVER_DOWNLOAD if allow_download is None else allow_download
+
+    def _remembered(self):
+        try:
+            with open(os.path.join(self.cache_dir, RESOLVED_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _remember(self, chrome, path):
+        remembered = self._remembered()
+        remembered[chrome or "unknown"] = os.path.abspath(path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = os.path.join(self.cache_dir, RESOLVED_FILE + ".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(remembered, f, indent=4)
+            os.replace(temp_path, os.path.join(self.cache_dir, RESOLVED_FILE))
+        except OSError as e:
+            logging.warning(f"Could not remember ChromeDriver location: {str(e)}")
+
+    def _candidates(self, major):
+        for folder in self.search_dirs:
+            yield os.path.join(folder, DRIVER_NAME)
+        if major:
+            yield os.path.join(self.cache_dir, major, DRIVER_NAME)
+        on_path = shutil.which(DRIVER_NAME)
+        if on_path:
+            yield on_path
+        downloaded = glob.glob(os.path.join(os.path.expanduser("~"), ".wdm", "drivers", "chromedriver", "**", DRIVER_NAME),
+                               recursive=True)
+        yield from sorted(downloaded, reverse=True)
+
+    def resolve(self):
+        """Path of a ChromeDriver for the installed Chrome; raises DriverNotFound"""
+        if config.CHROMEDRIVER_PATH:
+            return config.CHROMEDRIVER_PATH
+        chrome = chrome_version()
+        major = _major(chrome)
+        remembered = self._remembered().get(chrome or "unknown")
+        if remembered and os.path.exists(remembered):
+            return remembered
+
+        for path in self._candidates(major):
+            if not os.path.isfile(path):
+                continue
+            version = _version_output(path)
+            if major and _major(version) != major:
+                logging.info(f"Skipping ChromeDriver {version or 'of unknown version'} at {path} (Chrome {chrome})")
+                continue
+            logging.info(f"Using ChromeDriver {version} from {path}")
+            self._remember(chrome, path)
+            return path
+
+        if not self.allow_download:
+            raise DriverNotFound(f"No ChromeDriver matching Chrome {chrome or '(version unknown)'} found; place one in "
+                                 f"{config.DRIVERS_DIR}, set CHROMEDRIVER_PATH, or set CHROMEDRIVER_DOWNLOAD=true")
+        return self._download(chrome, major)
+
+    def _download(self, chrome, major):
+        from webdriver_manager.chrome import ChromeDriverManager
+        logging.info(f"Downloading ChromeDriver for Chrome {chrome}")
+        downloaded = ChromeDriverManager().install()
+        target = os.path.join(self.cache_dir, major or "unknown", DRIVER_NAME)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(downloaded, target)
+        self._remember(chrome, target)
+        return target
+
+
+def resolve_chromedriver():
+    """ChromeDriver path for this process, resolved on first use"""
+    global _resolved_path
+    with _lock:
+        if _resolved_path is None:
+            _resolved_path = ChromeDriverResolver().resolve()
+        return _resolved_path
+
+
+def preload_chromedriver():
+    """Resolve the driver on a background thread so the first extraction does not wait for it"""
+    def run():
+        try:
+            resolve_chromedriver()
+        except Exception as e:
+            logging.warning(f"ChromeDriver not resolved at startup: {str(e)}")
+    threading.Thread(target=run, name="chromedriver-resolve", daemon=True).start()
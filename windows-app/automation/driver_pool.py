@@ -0,0 +1,290 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from urllib.parse import urlparse
+import atexit
+import threading
+import time
+import logging
+import config
+from automation.tracing import span
+from automation.chromedriver import resolve_chromedriver
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+def build_chrome_options(headless=False):
+    """Build the Chrome options shared by every automation module"""
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--disable-popup-blocking")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    # Add additional arguments to make the browser look more like a regular user
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+
+    # Expose CDP Network events so page readiness can detect network idle
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return chrome_options
+
+
+def create_chrome_driver(headless=False):
+    """Start a new Chrome WebDriver with the shared options"""
+    chrome_options = build_chrome_options(headless)
+    try:
+        service = Service(executable_path=resolve_chromedriver())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    except Exception as e:
+        logging.error(f"Error setting up Chrome WebDriver: {str(e)}")
+        raise
+
+    # Execute CDP commands to prevent detection
+    driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": USER_AGENT})
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+
+class PooledDriver:
+    """Bookkeeping for one browser owned by the pool"""
+    def __init__(self, driver, headless):
+        self.driver = driver
+        self.headless = headless
+        self.pages = 0
+        self.leases = 0
+        self.created = time.time()
+        self.origins = set()
+
+
+class DriverPool:
+    """Pool of warm Chrome browsers that automation classes lease and return.
+
+    A leased browser is reset (extra tabs closed, cookies, storage and cache
+    cleared) when it comes back, health-checked before it is handed out
+    again, and recycled once it has served ``max_pages`` page loads.
+    """
+    def __init__(self, size=None, max_pages=None, headless=None, acquire_timeout=None, driver_factory=create_chrome_driver):
+        self.size = max(1, size if size is not None else config.DRIVER_POOL_SIZE)
+        self.max_pages = max_pages if max_pages is not None else config.DRIVER_MAX_PAGES
+        self.headless = headless  # When set, overrides the headless flag of every lease
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else config.DRIVER_ACQUIRE_TIMEOUT
+        self.driver_factory = driver_factory
+        self._idle = []
+        self._leased = {}
+        self._starting = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def _resolve_headless(self, headless):
+        return self.headless if self.headless is not None else bool(headless)
+
+    def _total(self):
+        return len(self._idle) + len(self._leased) + self._starting
+
+    def warm(self, count=None, headless=False):
+        """Start browsers ahead of time so the first leases skip the cold start"""
+        headless = self._resolve_headless(headless)
+        count = self.size if count is None else min(count, self.size)
+        started = 0
+        while True:
+            with self._condition:
+                if self._closed or started >= count or self._total() >= self.size:
+                    break
+                self._starting += 1
+            entry = None
+            try:
+                with span("driver_start", "driver", headless=headless, warm=True):
+                    entry = PooledDriver(self.driver_factory(headless), headless)
+                started += 1
+            except Exception as e:
+                logging.error(f"Failed to warm browser: {str(e)}")
+            finally:
+                with self._condition:
+                    self._starting -= 1
+                    if entry:
+                        self._idle.append(entry)
+                    self._condition.notify_all()
+            if entry is None:
+                break
+        logging.info(f"Driver pool warmed {started} browser(s)")
+        return started
+
+    def acquire(self, headless=False, timeout=None):
+        """Lease a browser from the pool, starting one if there is capacity"""
+        with span("driver_acquire", "driver"):
+            return self._acquire(headless, timeout)
+
+    def _acquire(self, headless, timeout):
+        headless = self._resolve_headless(headless)
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        while True:
+            retired = None
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Driver pool has been shut down")
+                entry = next((e for e in self._idle if e.headless == headless), None)
+                if entry:
+                    self._idle.remove(entry)
+                elif self._total() < self.size:
+                    self._starting += 1
+                elif self._idle:
+                    # Free a slot held by an idle browser with the wrong mode
+                    retired = self._idle.pop(0)
+                    self._starting += 1
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser became available within {timeout} seconds")
+                    self._condition.wait(remaining)
+                    continue
+
+            if retired:
+                self._quit(retired)
+
+            if entry and not self._is_healthy(entry):
+                logging.warning("Discarding unhealthy pooled browser")
+                self._quit(entry)
+                with self._condition:
+                    self._condition.notify_all()
+                continue
+
+            if entry is None:
+                try:
+                    with span("driver_start", "driver", headless=headless):
+                        entry = PooledDriver(self.driver_factory(headless), headless)
+                finally:
+                    with self._condition:
+                        self._starting -= 1
+                        self._condition.notify_all()
+
+            with self._condition:
+                entry.leases += 1
+                self._leased[id(entry.driver)] = entry
+            logging.info(f"Leased browser (lease {entry.leases}, {entry.pages} pages served)")
+            return entry.driver
+
+    def release(self, driver, discard=False):
+        """Return a leased browser, resetting or recycling it"""
+        with self._condition:
+            entry = self._leased.pop(id(driver), None)
+        if entry is None:
+            return
+
+        if not discard and self.max_pages and entry.pages >= self.max_pages:
+            logging.info(f"Recycling browser after {entry.pages} pages")
+            discard = True
+        if not discard:
+            try:
+                self._reset(entry)
+            except Exception as e:
+                logging.warning(f"Failed to reset pooled browser: {str(e)}")
+                discard = True
+
+        with self._condition:
+            keep = not discard and not self._closed
+            if keep:
+                self._idle.append(entry)
+            self._condition.notify_all()
+        if not keep:
+            self._quit(entry)
+
+    def record_page(self, driver, url=None):
+        """Count a page load against the browser's recycle budget"""
+        entry = self._leased.get(id(driver))
+        if entry is None:
+            return
+        entry.pages += 1
+        if url:
+            parsed = urlparse(url)
+            if parsed.scheme in ("http", "https"):
+                entry.origins.add(f"{parsed.scheme}://{parsed.netloc}")
+
+    def navigate(self, driver, url):
+        """Load a URL in a leased browser and count it as a page"""
+        self.record_page(driver, url)
+        with span("page_load", "navigate", url=url):
+            driver.get(url)
+
+    def _is_healthy(self, entry):
+        try:
+            entry.driver.execute_script("return 1")
+            return bool(entry.driver.window_handles)
+        except Exception:
+            return False
+
+    def _reset(self, entry):
+        """Wipe tabs, cookies and storage so the next lease starts clean"""
+        driver = entry.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        try:
+            driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+        except Exception:
+            pass
+        driver.delete_all_cookies()
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        for origin in entry.origins:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {"origin": origin, "storageTypes": "all"})
+        entry.origins.clear()
+        driver.get("about:blank")
+
+    def _quit(self, entry):
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logging.warning(f"Error quitting pooled browser: {str(e)}")
+
+    def shutdown(self):
+        """Quit every browser owned by the pool"""
+        with self._condition:
+            self._closed = True
+            entries = self._idle + list(self._leased.values())
+            self._idle = []
+            self._leased = {}
+            self._condition.notify_all()
+        for entry in entries:
+            self._quit(entry)
+        if entries:
+            logging.info(f"Driver pool shut down {len(entries)} browser(s)")
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Return the process-wide driver pool shared by all automation classes"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool()
+            atexit.register(_shared_pool.shutdown)
+            if config.DRIVER_POOL_WARM > 0:
+                # Start browsers in the background so the first extraction finds one ready
+                threading.Thread(target=_shared_pool.warm, args=(config.DRIVER_POOL_WARM,), daemon=True).start()
+        return _shared_pool
+
+
+def set_driver_pool(pool):
+    """Replace the process-wide driver pool (e.g. with a headless pool in batch workers)"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None and _shared_pool is not pool:
+            _shared_pool.shutdown()
+        _shared_pool = pool
+        atexit.register(pool.shutdown)
+    return pool
@@ -0,0 +1,105 @@
+from PIL import Image, features
+import io
+import logging
+import config
+
+EXTENSIONS = {"png": ".png", "webp": ".webp", "jpeg": ".jpg"}
+
+
+class CaptureProfile:
+    """How screenshots are encoded and at what device scale factor.
+
+    Chrome encodes ``format``/``quality`` itself for JPEG and lossy WebP
+    (``cdp=True``); optimized PNG and lossless WebP are re-encoded from
+    Chrome's PNG with Pillow in the screenshot writer pool.
+    """
+    def __init__(self, name, format="png", quality=None, lossless=False, optimize=False, scale=1.0, cdp=False):
+        self.name = name
+        self.format = format
+        self.quality = quality
+        self.lossless = lossless
+        self.optimize = optimize
+        self.scale = scale
+        self.cdp = cdp
+
+    @property
+    def ext(self):
+        return EXTENSIONS[self.format]
+
+    @property
+    def encoder(self):
+        """Where the bytes are encoded: "cdp", "pillow" or "none" (Chrome's PNG as is)"""
+        if self.cdp:
+            return "cdp"
+        return "pillow" if self.format != "png" or self.optimize else "none"
+
+    def cdp_params(self):
+        """Page.captureScreenshot format/quality for this profile"""
+        if not self.cdp:
+            return {"format": "png"}
+        params = {"format": self.format}
+        if self.quality is not None:
+            params["quality"] = self.quality
+        return params
+
+    def encode(self, data):
+        """Turn captured bytes into the stored encoding; returns ``(bytes, extension)``"""
+        if self.encoder != "pillow":
+            return data, self.ext
+        return self.pillow_encode(data), self.ext
+
+    def pillow_encode(self, data):
+        """Encode captured bytes with Pillow using this profile's settings"""
+        image = Image.open(io.BytesIO(data))
+        options = {}
+        if self.format == "png":
+            options["optimize"] = self.optimize
+        elif self.format == "webp":
+            options["lossless"] = self.lossless
+            options["method"] = 4
+            if self.quality is not None:
+                options["quality"] = self.quality
+        else:
+            image = image.convert("RGB")  # JPEG has no alpha channel
+            options["quality"] = self.quality or 85
+            options["optimize"] = True
+        out = io.BytesIO()
+        image.save(out, self.format.upper(), **options)
+        return out.getvalue()
+
+    def describe(self):
+        """Encoding entry written into the run metadata"""
+        return {
+            "profile": self.name,
+            "format": self.format,
+            "quality": self.quality,
+            "lossless": self.lossless or (self.format == "png"),
+            "scale": self.scale,
+            "encoder": self.encoder,
+        }
+
+
+# Built-in capture profiles (CAPTURE_PROFILE picks one)
+PROFILES = {
+    "png": CaptureProfile("png"),
+    "png_optimized": CaptureProfile("png_optimized", optimize=True),
+    "webp_lossless": CaptureProfile("webp_lossless", "webp", lossless=True),
+    "webp": CaptureProfile("webp", "webp", quality=80, cdp=True),
+    "jpeg": CaptureProfile("jpeg", "jpeg", quality=85, cdp=True),
+}
+
+
+def get_capture_profile(name=None, quality=None, scale=None):
+    """The configured capture profile, with the CAPTURE_QUALITY/CAPTURE_SCALE overrides applied"""
+    name = name or config.CAPTURE_PROFILE
+    base = PROFILES.get(name)
+    if base is None:
+        logging.warning(f"Unknown capture profile {name}, using png")
+        base = PROFILES["png"]
+    if base.encoder == "pillow" and base.format == "webp" and not features.check("webp"):
+        logging.warning(f"Pillow was built without WebP support, using png instead of {name}")
+        base = PROFILES["png"]
+    quality = quality if quality is not None else (config.CAPTURE_QUALITY or None)
+    scale = scale if scale is not None else config.CAPTURE_SCALE
+    return CaptureProfile(base.name, base.format, quality if quality and base.cdp else base.quality,
+                          base.lossless, base.optimize, scale or 1.0, base.cdp)
@@ -0,0 +1,75 @@
+from PIL import Image
+import numpy as np
+import io
+import logging
+import config
+
+HASH_SIZE = 8  # 8x8 low-frequency DCT coefficients -> 64-bit hash
+_SAMPLE_SIZE = HASH_SIZE * 4
+
+
+def _dct_matrix(n):
+    """Orthonormal DCT-II basis so a 2-D DCT is two matrix products"""
+    k = np.arange(n).reshape(-1, 1)
+    i = np.arange(n).reshape(1, -1)
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+_DCT = _dct_matrix(_SAMPLE_SIZE)
+
+
+def perceptual_hash(image):
+    """64-bit pHash of PNG bytes or a PIL image.
+
+    The image is reduced to 32x32 grayscale, transformed with a 2-D DCT and
+    the top-left 8x8 coefficients are compared with their median.
+    """
+    if isinstance(image, (bytes, bytearray)):
+        image = Image.open(io.BytesIO(image))
+    image.draft("L", (_SAMPLE_SIZE * 4, _SAMPLE_SIZE * 4))  # Cheap pre-shrink for JPEG sources
+    pixels = np.asarray(image.convert("L").resize((_SAMPLE_SIZE, _SAMPLE_SIZE), Image.BILINEAR), dtype=np.float64)
+    coefficients = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    bits = (coefficients > np.median(coefficients.ravel()[1:])).ravel()  # DC term excluded from the median
+    return np.packbits(bits).view(">u8")[0].astype(np.uint64)
+
+
+def hamming_distances(hash_value, hashes):
+    """Bit distances between one hash and an array of hashes"""
+    if len(hashes) == 0:
+        return np.empty(0, dtype=np.int64)
+    xor = np.bitwise_xor(np.asarray(hashes, dtype=np.uint64), np.uint64(hash_value))
+    return np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class FrameDeduplicator:
+    """Drops screenshots that look the same as a frame already kept in this run"""
+    def __init__(self, threshold=None):
+        self.threshold = config.DEDUP_THRESHOLD if threshold is None else threshold
+        self.kept = []  # (name, hash) of frames that were written
+        self.dropped = []
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def check(self, png_bytes, name):
+        """Return the kept frame ``png_bytes`` duplicates, or None after keeping it"""
+        return self.check_hash(perceptual_hash(png_bytes), name)
+
+    def check_hash(self, hash_value, name):
+        """``check`` for a frame whose perceptual hash was already computed"""
+        distances = hamming_distances(hash_value, self._hashes)
+        if len(distances):
+            best = int(np.argmin(distances))
+            if distances[best] <= self.threshold:
+                original = self.kept[best][0]
+                self.dropped.append({
+                    "frame": name,
+                    "duplicate_of": original,
+                    "distance": int(distances[best]),
+                    "phash": f"{int(hash_value):016x}"
+                })
+                logging.info(f"Dropped near-duplicate frame {name} (distance {int(distances[best])} to {original})")
+                return original
+        self.kept.append((name, hash_value))
+        self._hashes = np.append(self._hashes, np.uint64(hash_value))
+        return None
@@ -1,100 +1,60 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import time
+from automation.pipeline import CapturePipeline, PageSpec
 import os
-from datetime import datetime
-import json
-from PIL import Image
 import logging
-import random
 
-class InstagramAutomation:
-    def __init__(self):
-        self.driver = None
-        self.screenshots_dir = "screenshots/instagram"
-        self.data_dir = "data/instagram"
-        self._create_directories()
-        self._setup_logging()
-        
-    def _create_directories(self):
-        """Create necessary directories for storing data"""
-        os.makedirs(self.screenshots_dir, exist_ok=True)
-        os.makedirs(self.data_dir, exist_ok=True)
-        os.makedirs('logs', exist_ok=True)
-        
-    def _setup_logging(self):
-        """Setup logging configuration"""
-        logging.basicConfig(
-            filename=f'logs/instagram_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+BASE_URL = "https://www.instagram.com"
 
-    def _setup_driver(self, headless=False):
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--disable-notifications")
-        chrome_options.add_argument("--disable-popup-blocking")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # Add additional arguments to make the browser look more like a regular user
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+# Elements that show the login page, a profile or a list has rendered
+LOGIN_LOCATORS = [(By.NAME, "username"), (By.XPATH, "//a[contains(@href, '/home')]")]
+PROFILE_LOCATORS = [(By.XPATH, "//header"), (By.XPATH, "//main")]
+POST_SELECTOR = "a[href*='/p/'], div[role='dialog'] a[role='link']"
+ARTICLE = [(By.XPATH, "//article")]
+MAIN = [(By.XPATH, "//main")]
+HEADER = [(By.XPATH, "//header")]
+DIALOG = [(By.XPATH, "//div[@role='dialog']")]
+
+# Pages captured from an open profile
+PUBLIC_PAGES = {
+    "Posts": PageSpec("public_posts", records="public_posts", locators=ARTICLE),
+    "Timeline": PageSpec("public_timeline", records="public_timeline", locators=MAIN),
+    "Account Info": PageSpec("public_info", locators=HEADER),
+}
+
+# Pages captured with a logged-in session, once the target profile is open
+FOLLOWING = PageSpec("following_{profile}", scroll=True, locators=DIALOG, click=(By.XPATH, "//a[contains(@href, '/following')]"))
+AUTHORIZED_PAGES = {
+    "Posts": PageSpec("posts_{profile}", records="posts_{profile}", locators=ARTICLE),
+    "Messages": PageSpec("messages", "direct/inbox/", locators=MAIN),
+    "Friends List": FOLLOWING,
+    "Following": FOLLOWING,
+    "Followers": PageSpec("followers_{profile}", scroll=True, locators=DIALOG, click=(By.XPATH, "//a[contains(@href, '/followers')]")),
+    "Account Info": PageSpec("account_info_{profile}", locators=HEADER),
+}
+
+class InstagramAutomation(CapturePipeline):
+    """Instagram adapter: profile page specs, the login flows and direct profile navigation"""
+    platform = "instagram"
+    content_locators = PROFILE_LOCATORS
+    post_selector = POST_SELECTOR
 
-        # Try to use local ChromeDriver first
-        try:
-            driver_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "drivers", "chromedriver.exe")
-            if os.path.exists(driver_path):
-                logging.info(f"Using local ChromeDriver from {driver_path}")
-                service = Service(executable_path=driver_path)
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                # Execute CDP commands to prevent detection
-                self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                    "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                })
-                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                return
-        except Exception as e:
-            logging.warning(f"Failed to use local ChromeDriver: {str(e)}")        # Fallback to WebDriver Manager
-        try:
-            logging.info("Attempting to use ChromeDriverManager")
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            # Execute CDP commands to prevent detection
-            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        except Exception as e:
-            logging.error(f"Error setting up Chrome WebDriver: {str(e)}")
-            raise
-        
     def login(self, username, password):
         """Login to Instagram with credentials"""
         try:
             self._setup_driver()
-            self.driver.get("https://www.instagram.com")
-            time.sleep(5)  # Increased wait time for initial page load
+            self._navigate(BASE_URL)
+            self.readiness.page_loaded(LOGIN_LOCATORS)
             
+            self.progress.phase("consent", "Dismissing cookie consent")
             # Handle cookie consent if present
             try:
                 cookie_button = WebDriverWait(self.driver, 5).until(
                     EC.presence_of_element_located((By.XPATH, "//button[contains(text(), 'Allow')]"))
                 )
                 cookie_button.click()
-                time.sleep(2)
+                self.readiness.element_gone(cookie_button, name="consent_dismissed")
             except:
                 logging.info("No cookie consent popup found")
             
@@ -146,18 +106,9 @@ class InstagramAutomation:
                 username_field.clear()
                 password_field.clear()
                 
-                # Type credentials with random delays and human-like behavior
-                for char in username:
-                    username_field.send_keys(char)
-                    time.sleep(random.uniform(0.1, 0.3))
-                
-                time.sleep(random.uniform(0.5, 1.0))  # Pause between fields
-                
-                for char in password:
-                    password_field.send_keys(char)
-                    time.sleep(random.uniform(0.1, 0.3))
-                
-                time.sleep(random.uniform(0.5, 1.0))  # Pause before clicking
+                # Type credentials
+                username_field.send_keys(username)
+                password_field.send_keys(password)
                 
                 # Try multiple selectors for login button
                 login_button_selectors = [
@@ -188,7 +139,7 @@ class InstagramAutomation:
                         EC.element_to_be_clickable((By.XPATH, "//button[contains(text(),'Not now') or contains(text(),'Not Now') ]"))
                     )
                     save_not_now.click()
-                    time.sleep(2)
+                    self.readiness.element_gone(save_not_now, name="save_login_dismissed")
                 except:
                     pass
                 
@@ -219,7 +170,7 @@ class InstagramAutomation:
                     try:
                         not_now_button = self.driver.find_element(By.XPATH, "//div[@role='button' and contains(text(), 'Not Now')]")
                         not_now_button.click()
-                        time.sleep(2)
+                        self.readiness.element_gone(not_now_button, name="notifications_dismissed")
                     except:
                         logging.info("No notification popup found")
                     
@@ -238,16 +189,14 @@ class InstagramAutomation:
             logging.error(f"Login process failed: {str(e)}")
             return False
             
-    def capture_screenshot(self, element_name):
-        """Capture and save a screenshot"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{self.screenshots_dir}/{element_name}_{timestamp}.png"
-        self.driver.save_screenshot(filename)
-        logging.info(f"Screenshot saved: {filename}")
-        return filename
-        
+    def extract(self, target, data_type, mode=None, incremental=None, instance=None):
+        return self.extract_public_profile(target, data_type)
+
     def extract_public_profile(self, profile_id, data_type):
         """Extract data from a public profile"""
+        if data_type not in PUBLIC_PAGES:
+            logging.warning(f"Public extraction not supported for {data_type}")
+            return None
         try:
             self._setup_driver(headless=False)
             
@@ -256,9 +205,9 @@ class InstagramAutomation:
                 logging.error("Default login failed")
                 return None
                 
-            url = f"https://www.instagram.com/{profile_id}"
-            self.driver.get(url)
-            time.sleep(5)  # Wait for page load
+            url = f"{BASE_URL}/{profile_id}"
+            self._navigate(url)
+            self._wait_for_page()
             
             # Take a screenshot of the current state for debugging
             self.capture_screenshot("debug_before_extraction")
@@ -272,27 +221,22 @@ class InstagramAutomation:
             except:
                 pass  # Profile is not private
                 
-            if data_type == "Posts":
-                return self._extract_public_posts()
-            elif data_type == "Timeline":
-                return self._extract_public_timeline()
-            elif data_type == "Account Info":
-                return self._extract_public_info()
-            else:
-                logging.warning(f"Public extraction not supported for {data_type}")
-                return None
+            result = self.capture_page(PUBLIC_PAGES[data_type], profile_id)
+            return self._save_run(profile_id, data_type, url, result)
                 
         except Exception as e:
             logging.error(f"Public profile extraction failed: {str(e)}")
             # Take a screenshot of the error state
-            self.capture_screenshot("error_state")
+            self.capture_screenshot("error_state", deduplicate=False)
             return None
+        finally:
+            self._release_driver()
             
     def _try_default_login(self):
         """Try to log in with default credentials"""
         try:
-            self.driver.get("https://www.instagram.com")
-            time.sleep(3)
+            self._navigate(BASE_URL)
+            self.readiness.page_loaded(LOGIN_LOCATORS)
             
             # Check if already logged in
             try:
@@ -321,18 +265,13 @@ class InstagramAutomation:
             username_field.clear()
             password_field.clear()
             
-            # Type credentials with random delays
-            for char in username:
-                username_field.send_keys(char)
-                time.sleep(random.uniform(0.1, 0.3))
-                
-            for char in password:
-                password_field.send_keys(char)
-                time.sleep(random.uniform(0.1, 0.3))
+            # Type credentials
+            username_field.send_keys(username)
+            password_field.send_keys(password)
                 
-            # Click login button
-            login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
-            time.sleep(1)
+            # Click login button once the form accepts it
+            login_button = self.readiness.element_clickable((By.XPATH, "//button[@type='submit']"), name="login_button") \
+                or self.driver.find_element(By.XPATH, "//button[@type='submit']")
             login_button.click()
             
             # Wait for login to complete
@@ -346,7 +285,7 @@ class InstagramAutomation:
                 try:
                     not_now_button = self.driver.find_element(By.XPATH, "//div[@role='button' and contains(text(), 'Not Now')]")
                     not_now_button.click()
-                    time.sleep(2)
+                    self.readiness.element_gone(not_now_button, name="notifications_dismissed")
                 except:
                     pass
                     
@@ -364,13 +303,13 @@ class InstagramAutomation:
     def _search_and_navigate_to_profile(self, profile_id):
         """Navigate directly to the user's profile URL instead of using search UI"""
         try:
-            url = f"https://www.instagram.com/{profile_id}/"
-            self.driver.get(url)
+            url = f"{BASE_URL}/{profile_id}/"
+            self._navigate(url)
             # Wait until profile header loads
             WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.XPATH, "//header"))
             )
-            time.sleep(2)
+            self.readiness.network_idle()
             return True
         except Exception as e:
             logging.error(f"Direct navigation failed: {str(e)}")
@@ -378,181 +317,21 @@ class InstagramAutomation:
 
     def extract_authorized_data(self, data_type, target_profile="me"):
         """Extract data using authorized access for any profile (default: self)"""
+        if data_type not in AUTHORIZED_PAGES:
+            logging.warning(f"Authorized extraction not supported for {data_type}")
+            return None
+        self._reset_run()
         try:
             if target_profile != "me":
                 if not self._search_and_navigate_to_profile(target_profile):
                     logging.error(f"Failed to navigate to profile: {target_profile}")
                     return None
             
-            if data_type == "Posts":
-                return self._extract_posts(target_profile)
-            elif data_type == "Messages":
-                return self._extract_messages()
-            elif data_type == "Friends List":
-                return self._extract_following(target_profile)
-            elif data_type == "Following":
-                return self._extract_following(target_profile)
-            elif data_type == "Followers":
-                return self._extract_followers(target_profile)
-            elif data_type == "Account Info":
-                return self._extract_account_info(target_profile)
-            else:
-                logging.warning(f"Authorized extraction not supported for {data_type}")
-                return None
+            result = self.capture_page(AUTHORIZED_PAGES[data_type], target_profile, BASE_URL)
+            return self._save_run(target_profile, data_type, None, result)
         except Exception as e:
             logging.error(f"Authorized data extraction failed: {str(e)}")
             return None
             
-    def _extract_public_posts(self):
-        """Extract public posts"""
-        try:
-            # Wait for posts to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//article"))
-            )
-            
-            # Scroll to load more posts
-            self._scroll_page(scroll_count=3)  # Reduced scroll count for testing
-            
-            # Take screenshot of posts
-            return self.capture_screenshot("public_posts")
-        except Exception as e:
-            logging.error(f"Failed to extract public posts: {str(e)}")
-            return None
-            
-    def _extract_public_timeline(self):
-        """Extract public timeline"""
-        try:
-            # Wait for timeline to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//main"))
-            )
-            
-            # Scroll to load more content
-            self._scroll_page(scroll_count=3)  # Reduced scroll count for testing
-            
-            # Take screenshot of timeline
-            return self.capture_screenshot("public_timeline")
-        except Exception as e:
-            logging.error(f"Failed to extract public timeline: {str(e)}")
-            return None
-            
-    def _extract_public_info(self):
-        """Extract public account information"""
-        try:
-            # Wait for profile info to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//header"))
-            )
-            
-            # Take screenshot of profile info
-            return self.capture_screenshot("public_info")
-        except Exception as e:
-            logging.error(f"Failed to extract public info: {str(e)}")
-            return None
-            
-    def _extract_posts(self, profile_id="me"):
-        """Extract posts for any profile (default: self)"""
-        try:
-            if profile_id != "me":
-                if not self._search_and_navigate_to_profile(profile_id):
-                    return None
-            
-            # Wait for posts to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//article"))
-            )
-            
-            # Scroll to load more posts
-            self._scroll_page(scroll_count=3)
-            
-            return self.capture_screenshot(f"posts_{profile_id}")
-        except Exception as e:
-            logging.error(f"Failed to extract posts: {str(e)}")
-            return None
-            
-    def _extract_messages(self):
-        """Extract messages (requires special handling)"""
-        try:
-            self.driver.get("https://www.instagram.com/direct/inbox/")
-            time.sleep(3)
-            return self.capture_screenshot("messages")
-        except Exception as e:
-            logging.error(f"Failed to extract messages: {str(e)}")
-            return None
-            
-    def _extract_following(self, profile_id="me"):
-        """Extract following list for any profile (default: self)"""
-        try:
-            if profile_id != "me":
-                if not self._search_and_navigate_to_profile(profile_id):
-                    return None
-            
-            # Click following button
-            following_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//a[contains(@href, '/following')]"))
-            )
-            following_button.click()
-            time.sleep(2)
-            
-            # Scroll to load more following
-            self._scroll_page(scroll_count=3)
-            
-            return self.capture_screenshot(f"following_{profile_id}")
-        except Exception as e:
-            logging.error(f"Failed to extract following: {str(e)}")
-            return None
-            
-    def _extract_followers(self, profile_id="me"):
-        """Extract followers list for any profile (default: self)"""
-        try:
-            if profile_id != "me":
-                if not self._search_and_navigate_to_profile(profile_id):
-                    return None
-            
-            # Click followers button
-            followers_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//a[contains(@href, '/followers')]"))
-            )
-            followers_button.click()
-            time.sleep(2)
-            
-            # Scroll to load more followers
-            self._scroll_page(scroll_count=3)
-            
-            return self.capture_screenshot(f"followers_{profile_id}")
-        except Exception as e:
-            logging.error(f"Failed to extract followers: {str(e)}")
-            return None
-            
-    def _extract_account_info(self, profile_id="me"):
-        """Extract account information for any profile (default: self)"""
-        try:
-            if profile_id != "me":
-                if not self._search_and_navigate_to_profile(profile_id):
-                    return None
-            
-            # Wait for profile info to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//header"))
-            )
-            
-            return self.capture_screenshot(f"account_info_{profile_id}")
-        except Exception as e:
-            logging.error(f"Failed to extract account info: {str(e)}")
-            return None
-            
-    def _scroll_page(self, scroll_count=5):
-        """Scroll the page to load more content"""
-        for _ in range(scroll_count):
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            
-    def close(self):
-        """Close the browser"""
-        if self.driver:
-            self.driver.quit()
-            logging.info("Browser closed")
-            
     def __del__(self):
-        self.close()
\ No newline at end of file
+        self.close()
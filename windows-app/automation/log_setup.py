@@ -0,0 +1,131 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+import atexit
+import json
+import logging
+import os
+import queue
+import uuid
+import config
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - [%(platform)s %(run)s] %(message)s'
+CONTEXT_FIELDS = ("platform", "target", "run")
+
+_context = ContextVar("log_context", default={})
+_queue = None
+_listener = None
+
+
+class ContextFilter(logging.Filter):
+    """Stamps records with the platform/target/run of the extraction that logged them.
+
+    Attached to the queue handler, so it runs on the logging thread before
+    the record is handed to the background listener.
+    """
+    def filter(self, record):
+        context = _context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field, "-"))
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, for log ingestion"""
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, "-")
+            if value != "-":
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _file_handler(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if config.LOG_ROTATION == "time":
+        return TimedRotatingFileHandler(path, when=config.LOG_ROTATE_WHEN, backupCount=config.LOG_BACKUPS,
+                                        encoding='utf-8', delay=True)
+    return RotatingFileHandler(path, maxBytes=config.LOG_MAX_MB * 1024 * 1024, backupCount=config.LOG_BACKUPS,
+                               encoding='utf-8', delay=True)
+
+
+def _handlers():
+    """File handlers the listener writes to"""
+    text = _file_handler(config.LOG_FILE)
+    text.setFormatter(logging.Formatter(TEXT_FORMAT))
+    handlers = [text]
+    if config.LOG_JSON:
+        jsonl = _file_handler(os.path.splitext(config.LOG_FILE)[0] + ".jsonl")
+        jsonl.setFormatter(JsonLinesFormatter())
+        handlers.append(jsonl)
+    return handlers
+
+
+def configure_logging(log_queue=None, listen=True):
+    """Route all logging through a queue drained by a background file writer.
+
+    Safe to call repeatedly: without arguments only the first call in a
+    process configures anything. Batch runs pass a multiprocessing queue:
+    the parent listens on it (``listen=True``) and each worker process only
+    feeds it (``listen=False``), so a single process owns the log files and
+    their rotation.
+    """
+    global _queue, _listener
+    if log_queue is None:
+        if _queue is not None:
+            return _queue
+        log_queue = queue.SimpleQueue()
+    if log_queue is _queue and (listen or _listener is None):
+        return _queue
+    if listen:
+        shutdown_logging()
+        _listener = QueueListener(log_queue, *_handlers(), respect_handler_level=True)
+        _listener.start()
+    else:
+        _listener = None  # A forked worker inherits the object but not the thread
+    handler = QueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(config.LOG_LEVEL.upper())
+    _queue = log_queue
+    return log_queue
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def new_run_id():
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+@contextmanager
+def log_context(**fields):
+    """Add context fields (``platform``, ``target``, ``run``) to records logged inside the block"""
+    token = _context.set({**_context.get(), **{key: value for key, value in fields.items() if value}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
@@ -0,0 +1,124 @@
+import aiohttp
+import asyncio
+from datetime import datetime, timezone
+import logging
+import time
+import config
+from automation.tracing import record
+
+API_USER_AGENT = "ForensicCapture/1.0 (public evidence collection)"
+PAGE_SIZE = 40  # Largest page Mastodon serves for statuses and timelines
+
+
+class MastodonApiError(Exception):
+    """Raised when an instance answers with an unexpected HTTP status"""
+
+
+class MastodonApiClient:
+    """Asynchronous client for the public Mastodon REST API of one instance.
+
+    Use as ``async with MastodonApiClient(instance) as client``: the session
+    keeps a pool of keep-alive connections to the instance for the lifetime
+    of the block. Timelines are paged with ``max_id`` (walking back in time)
+    or ``min_id`` (walking forward from a known status) and yielded status by
+    status so callers can stream them to disk.
+    """
+    def __init__(self, instance, progress=None, timeout=20, max_retries=3):
+        self.instance = instance
+        self.base_url = f"{config.MASTODON_API_SCHEME}://{instance}/api/v1"
+        self.progress = progress
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit_per_host=config.HTTP_POOL_SIZE, keepalive_timeout=30)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": API_USER_AGENT, "Accept": "application/json"}
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+        self.session = None
+
+    async def _sleep(self, seconds):
+        """Sleep in short slices so a cancelled job stops promptly"""
+        deadline = time.monotonic() + seconds
+        while True:
+            if self.progress:
+                self.progress.check_cancelled()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, 0.5))
+
+    def _reset_delay(self, headers):
+        """Seconds until the rate-limit window in ``headers`` resets"""
+        reset = headers.get("X-RateLimit-Reset")
+        if not reset:
+            return 0
+        try:
+            reset_at = datetime.fromisoformat(reset.replace("Z", "+00:00"))
+        except ValueError:
+            return 0
+        return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+
+    async def _get(self, path, params=None):
+        for attempt in range(self.max_retries + 1):
+            if self.progress:
+                self.progress.check_cancelled()
+            start = time.perf_counter()
+            async with self.session.get(f"{self.base_url}{path}", params=params) as response:
+                if response.status == 429 or response.status >= 500:
+                    if attempt == self.max_retries:
+                        raise MastodonApiError(f"{path} failed with HTTP {response.status}")
+                    delay = self._reset_delay(response.headers) if response.status == 429 else 0
+                    delay = delay or 2 ** attempt
+                    logging.warning(f"Mastodon {self.instance} returned HTTP {response.status}, retrying in {delay:.0f}s")
+                    await self._sleep(delay)
+                    continue
+                if response.status != 200:
+                    raise MastodonApiError(f"{path} failed with HTTP {response.status}")
+                data = await response.json(content_type=None)
+                record("http_get", "api", start, path=path, status=response.status)
+                remaining = response.headers.get("X-RateLimit-Remaining")
+                if remaining is not None and remaining.isdigit() and int(remaining) < 1:
+                    delay = self._reset_delay(response.headers)
+                    logging.warning(f"Mastodon {self.instance} rate limit reached, waiting {delay:.0f}s")
+                    await self._sleep(delay)
+                return data
+
+    async def lookup_account(self, acct):
+        return await self._get("/accounts/lookup", {"acct": acct})
+
+    async def iter_statuses(self, path, limit=None, params=None, min_id=None):
+        """Yield statuses of a timeline, newest first unless paging forward from ``min_id``"""
+        limit = config.MASTODON_API_MAX_ITEMS if limit is None else limit
+        params = dict(params or {})
+        cursor = {"min_id": str(min_id)} if min_id else {}
+        fetched = 0
+        while True:
+            if self.progress:
+                self.progress.phase("capture", f"{path} ({fetched} statuses)")
+            page = await self._get(path, dict(params, limit=PAGE_SIZE, **cursor))
+            if not page:
+                return
+            for status in page:
+                yield status
+                fetched += 1
+                if limit and fetched >= limit:
+                    return
+            ids = [int(status["id"]) for status in page]
+            if min_id:
+                cursor = {"min_id": str(max(ids))}
+            else:
+                cursor = {"max_id": str(min(ids))}
+
+    def account_statuses(self, account_id, limit=None, min_id=None):
+        return self.iter_statuses(f"/accounts/{account_id}/statuses", limit, None, min_id)
+
+    def tag_timeline(self, hashtag, limit=None, min_id=None):
+        return self.iter_statuses(f"/timelines/tag/{hashtag}", limit, None, min_id)
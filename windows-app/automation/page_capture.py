@@ -0,0 +1,50 @@
+import base64
+import logging
+import math
+from automation.tracing import span
+
+# Chrome cannot rasterise textures much taller than 16384px, so tall pages
+# are captured as several clips of at most this height.
+MAX_TILE_HEIGHT = 8000
+
+
+def get_page_size(driver):
+    """Return the (width, height) of the page content in CSS pixels"""
+    metrics = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+    content = metrics.get("cssContentSize") or metrics["contentSize"]
+    viewport = metrics.get("cssLayoutViewport") or metrics["layoutViewport"]
+    width = viewport.get("clientWidth") or content["width"]
+    return int(math.ceil(width)), int(math.ceil(content["height"]))
+
+
+def _capture(driver, x, y, width, height, profile=None, beyond_viewport=False):
+    """Page.captureScreenshot of a CSS-pixel clip, encoded as ``profile`` asks Chrome to"""
+    params = profile.cdp_params() if profile else {"format": "png"}
+    params.update({"captureBeyondViewport": beyond_viewport,
+                   "clip": {"x": x, "y": y, "width": width, "height": height, "scale": profile.scale if profile else 1}})
+    result = driver.execute_cdp_cmd("Page.captureScreenshot", params)
+    return base64.b64decode(result["data"])
+
+
+def capture_viewport(driver, profile=None):
+    """Capture the visible part of the page and return the encoded bytes"""
+    viewport = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+    viewport = viewport.get("cssVisualViewport") or viewport["visualViewport"]
+    return _capture(driver, viewport["pageX"], viewport["pageY"], viewport["clientWidth"], viewport["clientHeight"], profile)
+
+
+def capture_full_page(driver, max_tile_height=MAX_TILE_HEIGHT, profile=None):
+    """Capture the whole page with Page.captureScreenshot and return the encoded bytes.
+
+    Returns a single image for normal pages, or one image per
+    ``max_tile_height`` slice of the page when it is very tall. ``profile``
+    (a CaptureProfile) sets the format, quality and scale Chrome uses.
+    """
+    width, height = get_page_size(driver)
+    tiles = []
+    for top in range(0, max(height, 1), max_tile_height):
+        clip_height = min(max_tile_height, height - top) or 1
+        with span("cdp_capture", "capture", top=top, height=clip_height):
+            tiles.append(_capture(driver, 0, top, width, clip_height, profile, beyond_viewport=True))
+    logging.info(f"Captured full page {width}x{height} in {len(tiles)} image(s)")
+    return tiles
@@ -0,0 +1,454 @@
+from selenium.webdriver.common.by import By
+from automation.driver_pool import get_driver_pool
+from automation.progress import ProgressReporter
+from automation.tracing import span
+from automation.log_setup import configure_logging
+from automation.readiness import PageReadiness
+from automation.page_capture import capture_full_page, capture_viewport
+from automation.encoding import get_capture_profile
+from automation.image_dedup import FrameDeduplicator
+from automation.blob_store import BlobStore
+from automation.screenshot_writer import FrameBatch, get_screenshot_writer
+from automation.scroll_engine import ScrollEngine
+from automation.post_parser import PostRecorder
+from automation.watermarks import IncrementalRun
+from automation.catalog import record_run
+from datetime import datetime
+import json
+import logging
+import os
+import config
+
+CONSENT_XPATH = "//button[contains(text(), 'Accept') or contains(text(), 'I Accept') or contains(text(), 'Agree')]"
+
+
+class FeedPage:
+    """A public feed an adapter captures (profile, subreddit, hashtag...).
+
+    ``prefix`` names the files written for it, ``fields`` identify it in
+    the metadata and ``result_keys`` are the result entries that point to
+    the page screenshot.
+    """
+    def __init__(self, kind, name, url, prefix, watermark_key, fields, screenshot_name, result_keys=("profile",), label=None):
+        self.kind = kind
+        self.name = name
+        self.url = url
+        self.prefix = prefix
+        self.watermark_key = watermark_key
+        self.fields = fields
+        self.screenshot_name = screenshot_name
+        self.result_keys = result_keys
+        self.label = label or name
+
+
+class PageSpec:
+    """One page of a profile an adapter captures in a single screenshot.
+
+    ``{profile}`` in ``path``, ``name`` and ``records`` stands for the
+    target profile; without a ``path`` the page already open is used.
+    ``click`` is a link to open first (e.g. a followers dialog), and
+    ``records`` names the JSONL file of the posts seen while scrolling.
+    """
+    def __init__(self, name, path=None, scroll=False, records=None, locators=None, click=None):
+        self.name = name
+        self.path = path
+        self.scroll = scroll or bool(records)
+        self.records = records
+        self.locators = locators
+        self.click = click
+
+
+class CapturePipeline:
+    """Capture steps shared by every platform adapter.
+
+    An extraction leases a browser, navigates, waits until the page is
+    ready, dismisses overlays, captures, parses posts and persists the
+    metadata the same way on every site. Adapters subclass this and supply
+    the URLs and selectors (``platform``, ``content_locators``,
+    ``post_selector``, ``consent_xpath``) plus anything only their site
+    needs, such as a login form or an API client.
+    """
+    platform = None
+    content_locators = []
+    post_selector = None
+    consent_xpath = CONSENT_XPATH
+    page_screenshots = {}  # Data type -> (result key, label) of the page screenshot
+
+    def __init__(self):
+        self.driver = None
+        self.driver_pool = get_driver_pool()
+        self.progress = ProgressReporter()
+        self.readiness = None
+        self.capture_mode = config.CAPTURE_MODE
+        self.capture_profile = get_capture_profile()
+        self.extraction_mode = config.EXTRACTION_MODE
+        self.deduplicator = FrameDeduplicator()
+        self.screenshot_writer = get_screenshot_writer()
+        self.frame_batch = FrameBatch(self.deduplicator, self.capture_profile)
+        self.frames = []
+        self.scroll_engine = None
+        self.last_scroll = None
+        self.post_recorder = None
+        self.incremental_run = None
+        self.last_posts_file = None
+        self.screenshots_dir = f"screenshots/{self.platform}"
+        self.data_dir = f"data/{self.platform}"
+        self._create_directories()
+        self._setup_logging()
+
+    def _create_directories(self):
+        """Create necessary directories for storing data"""
+        os.makedirs(self.screenshots_dir, exist_ok=True)
+        os.makedirs(self.data_dir, exist_ok=True)
+        os.makedirs('logs', exist_ok=True)
+
+    def _setup_logging(self):
+        """Use the shared log (a no-op when the application already configured it)"""
+        configure_logging()
+
+    def _reset_run(self):
+        """Forget the frames and posts of the previous extraction"""
+        self.deduplicator = FrameDeduplicator()
+        self.frame_batch = FrameBatch(self.deduplicator, self.capture_profile)
+        self.frames = []
+        self.last_scroll = None
+        self.last_posts_file = None
+
+    def _setup_driver(self, headless=False):
+        """Lease a Chrome WebDriver from the shared driver pool"""
+        self._release_driver()
+        self.progress.phase("driver", "Starting browser")
+        self.driver = self.driver_pool.acquire(headless=headless)
+        self.readiness = PageReadiness(self.driver, self.progress)
+        self.scroll_engine = ScrollEngine(self.driver, self.readiness, self.post_selector)
+        self._reset_run()
+
+    def _release_driver(self):
+        """Return the leased WebDriver to the shared driver pool"""
+        if self.driver:
+            self.driver_pool.release(self.driver)
+            self.driver = None
+
+    def _navigate(self, url):
+        """Load a page in the leased browser"""
+        self.progress.phase("navigate", url)
+        logging.info(f"Navigating to {url}")
+        self.readiness.reset_network()
+        self.driver_pool.navigate(self.driver, url)
+
+    def _wait_for_page(self, locators=None):
+        """Wait for the page content to render and the network to settle"""
+        self.readiness.page_loaded(locators or self.content_locators)
+
+    def dismiss_overlays(self):
+        """Click away a cookie or consent dialog if one is showing"""
+        self.progress.phase("consent", "Dismissing consent dialogs")
+        try:
+            consent_buttons = self.driver.find_elements(By.XPATH, self.consent_xpath)
+            if consent_buttons:
+                consent_buttons[0].click()
+                self.readiness.element_gone(consent_buttons[0], name="consent_dismissed")
+        except Exception as e:
+            logging.warning(f"No consent dialog found or could not interact: {str(e)}")
+
+    def _capture_screenshot(self, element_name, step=None, total=None, deduplicate=True):
+        """Capture a screenshot and queue it for storage; returns its PendingFrame.
+
+        The path is set once ``_flush_frames`` has run; a near-duplicate
+        frame is dropped and keeps no path.
+        """
+        self.progress.phase("capture", element_name, step, total)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        with span("screenshot", "capture", frame=element_name):
+            image = capture_viewport(self.driver, self.capture_profile)
+        return self._save_frame(image, f"{element_name}_{timestamp}", deduplicate)
+
+    def capture_screenshot(self, element_name, deduplicate=True):
+        """Capture a screenshot into the blob store and return its path.
+
+        A frame that looks the same as one already saved during this
+        extraction is not written again; the earlier file is returned.
+        Waits for the writer pool, so use it for single captures only.
+        """
+        frame = self._capture_screenshot(element_name, deduplicate=deduplicate)
+        self._flush_frames([frame])
+        return frame.path or (frame.duplicate_of.path if frame.duplicate_of else None)
+
+    def _save_frame(self, image, name, deduplicate=True):
+        """Hand a captured frame to the writer pool (blocks only while its queue is full)"""
+        return self.screenshot_writer.submit(self.frame_batch, image, name, deduplicate)
+
+    def _flush_frames(self, frames=None):
+        """Barrier before metadata or reports: wait until queued frames are stored and synced"""
+        self.screenshot_writer.flush(self.frame_batch, frames)
+        self.frames = [frame.frame() for frame in self.frame_batch.frames if frame.done and frame.path]
+
+    def _frame_paths(self, frames):
+        """Paths of the flushed frames that were kept"""
+        return [frame.path for frame in frames if frame.path]
+
+    def _blob_refs(self, paths):
+        """Metadata references (``sha256:<hex>``) for stored screenshot paths"""
+        digests = {frame["path"]: frame["sha256"] for frame in self.frames}
+        return [BlobStore.ref(digests[path]) if path in digests else path for path in paths if path]
+
+    def _start_post_records(self, prefix, watermark_key, incremental=None, run=None):
+        """Begin collecting structured post records for this extraction (into ``run`` when given)"""
+        path = f"{self.data_dir}/{prefix}_posts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        self.incremental_run = run or IncrementalRun(watermark_key, incremental)
+        self.post_recorder = PostRecorder(self.platform, path, run=self.incremental_run)
+
+    def _watermark_reached(self):
+        """Scroll stop condition: the feed is back at posts an earlier run captured"""
+        if self.post_recorder and self.post_recorder.reached_watermark:
+            return "watermark"
+        return None
+
+    def _record_posts(self, step=None, state=None):
+        """Parse the posts currently in the DOM into the records file"""
+        if self.post_recorder:
+            self.progress.phase("capture", "Parsing posts", step)
+            self.post_recorder.ingest(self.driver)
+
+    def _finish_post_records(self):
+        """Close the post records file; returns (path or None, record count)"""
+        recorder, self.post_recorder = self.post_recorder, None
+        if not recorder:
+            return None, 0
+        return recorder.close(), recorder.count
+
+    def _scroll_page(self, num_scrolls=4):
+        """Scroll one screen at a time and capture each new screen, up to num_scrolls screenshots"""
+        if self.capture_mode == "full_page":
+            return self._capture_full_page()
+
+        frames = []
+        self._record_posts()
+
+        # Take initial screenshot of posts section
+        frames.append(self._capture_screenshot(f"posts_section_1", 1, num_scrolls))
+
+        # Let the scroll engine decide when the feed is exhausted; frames are stored while it scrolls on
+        def capture_step(step, state):
+            frames.append(self._capture_screenshot(f"posts_section_{step+1}", step + 1, num_scrolls))
+            self._record_posts(step, state)
+
+        self.last_scroll = self.scroll_engine.scroll(mode="viewport", max_steps=num_scrolls - 1, on_step=capture_step,
+                                                    stop_condition=self._watermark_reached)
+
+        self._flush_frames()
+        post_screenshots = self._frame_paths(frames)
+        logging.info(f"Efficiently captured {len(post_screenshots)} unique post screenshots ({len(self.deduplicator.dropped)} duplicates dropped)")
+        return post_screenshots
+
+    def _capture_full_page(self):
+        """Capture the whole feed in one CDP screenshot (tiled for very tall pages)"""
+        # Load the feed until it is exhausted or a scroll limit is hit, then render it all at once
+        self._record_posts()
+        self.last_scroll = self.scroll_engine.scroll(mode="bottom", on_step=self._record_posts,
+                                                    stop_condition=self._watermark_reached)
+        self.driver.execute_script("window.scrollTo(0, 0);")
+
+        self.progress.phase("capture", "Rendering full page")
+        tiles = capture_full_page(self.driver, profile=self.capture_profile)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        frames = []
+        for i, image in enumerate(tiles):
+            self.progress.phase("capture", f"posts_full_page_{i+1}", i + 1, len(tiles))
+            frames.append(self._save_frame(image, f"posts_full_page_{i+1}_{timestamp}"))
+        self._flush_frames()
+        return self._frame_paths(frames)
+
+    def _load_feed(self, target_count=None, time_budget=None, date_cutoff=None, records=None):
+        """Scroll the page until the feed stops growing or a scroll limit is reached.
+
+        With ``records`` set, the posts seen along the way are parsed into
+        ``<data_dir>/<records>_posts_<timestamp>.jsonl`` (see last_posts_file).
+        """
+        engine = ScrollEngine(self.driver, self.readiness, self.post_selector)
+        if not records:
+            self.last_scroll = engine.scroll(mode="bottom", target_count=target_count, time_budget=time_budget, date_cutoff=date_cutoff)
+            return self.last_scroll
+
+        recorder = PostRecorder(self.platform, f"{self.data_dir}/{records}_posts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+        recorder.ingest(self.driver)
+        try:
+            self.last_scroll = engine.scroll(mode="bottom", target_count=target_count, time_budget=time_budget, date_cutoff=date_cutoff,
+                                             on_step=lambda step, state: recorder.ingest(self.driver))
+            return self.last_scroll
+        finally:
+            self.last_posts_file = recorder.close()
+
+    def _write_metadata(self, metadata, stem, run=None, timestamp=None):
+        """Write a run's metadata JSON, commit its watermarks and add it to the evidence catalog"""
+        metadata_file = f"{self.data_dir}/{stem}_{timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        self.progress.phase("metadata", metadata_file)
+        with open(metadata_file, 'w') as f:
+            json.dump(metadata, f, indent=4)
+        if run:
+            run.commit(metadata_file)
+        record_run(self.platform, metadata_file, metadata)
+        return metadata_file
+
+    def capture_feed(self, page, incremental=None, run=None):
+        """Run the whole browser pipeline for a public feed and return the result dict (None on failure).
+
+        With ``run`` the posts are tracked in that IncrementalRun and its owner
+        commits the watermark, so one extraction commits exactly once.
+        """
+        try:
+            self._setup_driver(headless=False)  # Set to True for headless operation
+            self._navigate(page.url)
+            self._start_post_records(page.prefix, page.watermark_key, incremental, run)
+            self._wait_for_page()
+            self.dismiss_overlays()
+
+            # Capture the page itself, then the feed below it
+            page_frame = self._capture_screenshot(page.screenshot_name)
+            post_screenshots = self._scroll_page(4)  # At most 4 post screenshots in viewport mode; flushes all frames
+            page_screenshot = page_frame.path
+            logging.info(f"Captured page screenshot: {page_screenshot}")
+            logging.info(f"Captured {len(post_screenshots)} post screenshots")
+            posts_file, post_count = self._finish_post_records()
+
+            metadata = dict(page.fields)
+            metadata.update({
+                "extraction_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "url": page.url,
+                "capture_mode": self.capture_mode,
+                "encoding": self.capture_profile.describe(),
+                "wait_timings": self.readiness.timings,
+                "scroll": self.last_scroll,
+                "dropped_frames": self.deduplicator.dropped,
+                "posts_file": posts_file,
+                "post_count": post_count,
+                "incremental": self.incremental_run.summary(),
+                "frames": self.frames,
+                "screenshots": self._blob_refs([page_screenshot] + post_screenshots)
+            })
+            metadata_file = self._write_metadata(metadata, page.prefix, None if run else self.incremental_run)
+            logging.info(f"Extraction completed successfully for {page.label}")
+
+            result = {key: page_screenshot for key in page.result_keys}
+            result.update({
+                "posts": post_screenshots[0] if post_screenshots else None,  # For backward compatibility
+                "posts_all": post_screenshots,
+                "metadata": metadata_file
+            })
+            # Add numbered posts for easier access
+            for i, screenshot in enumerate(post_screenshots):
+                result[f"posts_{i+1}"] = screenshot
+            return result
+
+        except Exception as e:
+            logging.error(f"Error extracting {page.label}: {str(e)}")
+            # Take debug screenshot if possible
+            try:
+                if self.driver:
+                    debug_screenshot = self.capture_screenshot(f"debug_error_{page.prefix}", deduplicate=False)
+                    logging.info(f"Debug screenshot captured: {debug_screenshot}")
+            except Exception:
+                pass
+            return None
+        finally:
+            self._finish_post_records()
+            self._release_driver()
+
+    def capture_via_api(self, page, source, fetch, screenshots=None, incremental=None):
+        """Stream a feed's records from a public API instead of the browser.
+
+        ``fetch(page, records_file, run)`` writes the JSONL records and
+        returns ``(about, counts)``. Browser screenshots are only added when
+        ``screenshots`` is True.
+        """
+        run = IncrementalRun(page.watermark_key, incremental)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        records_file = f"{self.data_dir}/{page.prefix}_{timestamp}.jsonl"
+        try:
+            self.progress.phase("navigate", page.url)
+            about, counts = fetch(page, records_file, run)
+            logging.info(f"Fetched {sum(counts.values())} {self.platform} records for {page.prefix} via {source}")
+        except Exception as e:
+            logging.error(f"Error extracting {page.kind} {page.name} via {source}: {str(e)}")
+            return None
+
+        result = {"profile": None, "posts": None, "posts_all": []}
+        if screenshots:
+            result.update(self.capture_feed(page, incremental, run) or {})
+        for key in page.result_keys:
+            result.setdefault(key, None)
+
+        metadata = dict(page.fields)
+        metadata.update({
+            "extraction_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "url": page.url,
+            "source": source,
+            "about": about,
+            "records_file": records_file,
+            "record_counts": counts,
+            "incremental": run.summary(),
+            "browser_metadata": result.get("metadata"),
+            "screenshots": self._blob_refs([next(filter(None, (result[key] for key in page.result_keys)), None)]
+                                           + result["posts_all"])
+        })
+        metadata_file = self._write_metadata(metadata, page.prefix, run, timestamp)
+        result.update({"metadata": metadata_file, "records": records_file, "record_counts": counts})
+        return result
+
+    def capture_page(self, spec, profile=None, base_url=None):
+        """Open, load and screenshot one PageSpec; returns the screenshot path or None"""
+        name = spec.name.format(profile=profile)
+        try:
+            if spec.path is not None:
+                self._navigate(f"{base_url}/{spec.path.format(profile=profile)}")
+            if spec.click:
+                link = self.readiness.element_clickable(spec.click, name=f"{name}_link")
+                if not link:
+                    raise RuntimeError(f"Link not found: {spec.click[1]}")
+                link.click()
+            if spec.path is not None or spec.locators:
+                self._wait_for_page(spec.locators)
+            if spec.scroll:
+                self._load_feed(records=spec.records.format(profile=profile) if spec.records else None)
+            return self.capture_screenshot(name)
+        except Exception as e:
+            logging.error(f"Failed to extract {name}: {str(e)}")
+            return None
+
+    def _save_run(self, target, data_type, url, result):
+        """Write the run's metadata JSON, add it to the evidence catalog and pass ``result`` through"""
+        if not result:
+            return result
+        self._flush_frames()
+        metadata = {
+            "target": target,
+            "data_type": data_type,
+            "extraction_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "url": url,
+            "scroll": self.last_scroll,
+            "encoding": self.capture_profile.describe(),
+            "dropped_frames": self.deduplicator.dropped,
+            "posts_file": self.last_posts_file,
+            "frames": self.frames,
+            "screenshots": [BlobStore.ref(frame["sha256"]) for frame in self.frames]
+        }
+        try:
+            self._write_metadata(metadata, target)
+        except OSError as e:
+            logging.error(f"Could not write run metadata for {target}: {str(e)}")
+        return result
+
+    def page_screenshot(self, result, data_type):
+        """(label, path) of the page screenshot in a feed result, for summaries"""
+        key, label = self.page_screenshots.get(data_type, ("profile", "Profile screenshot"))
+        return label, result.get(key)
+
+    def extract(self, target, data_type, mode=None, incremental=None, instance=None):
+        """Public extraction of ``data_type`` for ``target``; adapters map data types to their methods"""
+        raise NotImplementedError
+
+    def close(self):
+        """Return the browser to the shared driver pool"""
+        if self.driver:
+            self._release_driver()
+            logging.info("Browser released")
@@ -0,0 +1,176 @@
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin, urlparse
+import hashlib
+import json
+import logging
+import re
+
+FIELDS = ("id", "author", "timestamp", "text", "permalink", "media")
+
+
+def _text(element):
+    return element.get_text(" ", strip=True) if element else None
+
+
+def _media(element, base_url):
+    """Absolute URLs of the images and videos inside a post"""
+    urls = []
+    for tag in element.select("img[src], video[src], video source[src]"):
+        src = tag.get("src")
+        if src and not src.startswith("data:"):
+            url = urljoin(base_url, src)
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+
+def _record(post_id, author, timestamp, text, permalink, media):
+    if not post_id:
+        # No id in the markup: derive a stable one from what identifies the post
+        basis = permalink or f"{author}|{timestamp}|{text}"
+        post_id = "sha1:" + hashlib.sha1(basis.encode("utf-8")).hexdigest()
+    return dict(zip(FIELDS, (post_id, author, timestamp, text or None, permalink, media)))
+
+
+def parse_reddit(soup, base_url):
+    """Posts from the shreddit web components, falling back to old.reddit markup"""
+    posts = []
+    for post in soup.select("shreddit-post"):
+        permalink = post.get("permalink")
+        body = post.select_one("[slot='text-body']")
+        text = " ".join(filter(None, [post.get("post-title"), _text(body)]))
+        media = _media(post, base_url)
+        content_href = post.get("content-href")
+        if content_href and post.get("post-type") in ("image", "video", "gallery") and content_href not in media:
+            media.append(content_href)
+        posts.append(_record(post.get("id"), post.get("author"), post.get("created-timestamp"), text,
+                             urljoin(base_url, permalink) if permalink else None, media))
+    for thing in soup.select("div.thing[data-fullname]"):
+        permalink = thing.get("data-permalink")
+        timestamp = thing.get("data-timestamp")
+        posts.append(_record(thing.get("data-fullname"), thing.get("data-author"), timestamp,
+                             _text(thing.select_one("a.title")) or _text(thing.select_one(".md")),
+                             urljoin(base_url, permalink) if permalink else None, _media(thing, base_url)))
+    return posts
+
+
+def parse_mastodon(soup, base_url):
+    """Statuses rendered by the Mastodon web UI"""
+    posts = []
+    for status in soup.select("div.status[data-id], article[data-id]"):
+        if status.name == "div" and status.find_parent("article", attrs={"data-id": True}):
+            continue  # Counted through its enclosing <article>
+        link = status.select_one("a.status__relative-time, a.detailed-status__datetime")
+        time_tag = status.select_one("time[datetime]")
+        author = _text(status.select_one(".display-name__account"))
+        posts.append(_record(status.get("data-id"), author, time_tag.get("datetime") if time_tag else None,
+                             _text(status.select_one(".status__content")),
+                             urljoin(base_url, link["href"]) if link and link.get("href") else None,
+                             _media(status.select_one(".media-gallery, .video-player, .audio-player") or status, base_url)))
+    return posts
+
+
+_FACEBOOK_PERMALINK = re.compile(r"/(posts|videos|photos|permalink)/|story_fbid=")
+_FACEBOOK_POST_ID = re.compile(r"(?:/(?:posts|videos|permalink)/|story_fbid=|fbid=)([\w.-]+)")
+
+
+def parse_facebook(soup, base_url):
+    """Feed stories (``role=article``) that are not nested comments"""
+    posts = []
+    for article in soup.select("div[role='article']"):
+        if article.find_parent("div", attrs={"role": "article"}):
+            continue
+        link = article.find("a", href=_FACEBOOK_PERMALINK)
+        permalink = urljoin(base_url, link["href"].split("?__")[0]) if link else None
+        author = _text(article.select_one("h2 a, h3 a, h4 a, strong a"))
+        time_tag = article.select_one("abbr[data-utime]")
+        timestamp = time_tag.get("data-utime") if time_tag else (_text(link) if link else None)
+        text = _text(article.select_one("div[data-ad-preview='message'], div[data-ad-comet-preview='message']"))
+        match = _FACEBOOK_POST_ID.search(permalink or "")
+        post_id = match.group(1) if match else None
+        posts.append(_record(post_id, author, timestamp, text, permalink, _media(article, base_url)))
+    return posts
+
+
+def parse_instagram(soup, base_url, author=None):
+    """Grid tiles linking to /p/<shortcode>/ or /reel/<shortcode>/"""
+    posts = []
+    for link in soup.select("a[href*='/p/'], a[href*='/reel/']"):
+        parts = [part for part in urlparse(link["href"]).path.split("/") if part]
+        if len(parts) < 2 or parts[-2] not in ("p", "reel"):
+            continue
+        image = link.select_one("img[alt]")
+        time_tag = link.select_one("time[datetime]")
+        posts.append(_record(f"{parts[-2]}/{parts[-1]}", author, time_tag.get("datetime") if time_tag else None,
+                             image.get("alt") if image else None, urljoin(base_url, link["href"]),
+                             _media(link, base_url)))
+    return posts
+
+
+PARSERS = {
+    "reddit": parse_reddit,
+    "mastodon": parse_mastodon,
+    "facebook": parse_facebook,
+    "instagram": parse_instagram,
+}
+
+
+def parse_posts(platform, html, base_url, **kwargs):
+    """Post records (id, author, timestamp, text, permalink, media) found in a page"""
+    soup = BeautifulSoup(html, "html.parser")
+    return PARSERS[platform](soup, base_url, **kwargs)
+
+
+class PostRecorder:
+    """Appends the posts parsed after each scroll step to a JSONL file.
+
+    Feeds that unload off-screen posts only show a window of the timeline,
+    so the page is parsed at every step and records are deduplicated by id.
+    With an IncrementalRun, posts captured by the previous run are skipped.
+    """
+    def __init__(self, platform, path, run=None, **parser_kwargs):
+        self.platform = platform
+        self.path = path
+        self.run = run
+        self.parser_kwargs = parser_kwargs
+        self.seen = set()
+        self.count = 0
+        self.reached_watermark = False
+        self._file = None
+
+    def ingest(self, driver):
+        """Parse the current DOM of ``driver`` and append posts not seen before"""
+        try:
+            posts = parse_posts(self.platform, driver.page_source, driver.current_url, **self.parser_kwargs)
+        except Exception as e:
+            logging.warning(f"Could not parse {self.platform} posts: {str(e)}")
+            return 0
+        added = 0
+        fresh = 0
+        for post in posts:
+            if post["id"] in self.seen:
+                continue
+            self.seen.add(post["id"])
+            fresh += 1
+            if self.run:
+                if self.run.seen("post", post["id"], post["timestamp"]):
+                    continue
+                self.run.observe("post", post["id"], post["timestamp"])
+            if self._file is None:
+                self._file = open(self.path, 'w', encoding='utf-8')
+            self._file.write(json.dumps(post) + "\n")
+            added += 1
+        if added:
+            self._file.flush()
+            self.count += added
+        elif fresh and self.run:
+            # Everything that scrolled into view was captured by an earlier run
+            self.reached_watermark = True
+        return added
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        logging.info(f"Recorded {self.count} {self.platform} posts to {self.path}")
+        return self.path if self.count else None
@@ -0,0 +1,51 @@
+import threading
+import logging
+from automation.tracing import enter_phase
+
+
+class ExtractionCancelled(BaseException):
+    """Raised at a phase boundary once a running job has been cancelled.
+
+    Derives from BaseException so the broad ``except Exception`` handlers in
+    the automation modules let it through while their ``finally`` blocks still
+    hand the browser back to the pool.
+    """
+
+
+class ProgressReporter:
+    """Reports extraction phases to a listener and carries the cancel flag.
+
+    Phases are ``driver``, ``navigate``, ``consent``, ``capture``,
+    ``metadata`` and ``report``. The callback receives
+    ``(phase, message, step, total)`` where step/total are optional.
+    """
+    def __init__(self, callback=None, cancel_event=None):
+        self.callback = callback
+        self.cancel_event = cancel_event or threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Request cancellation; the job stops at its next phase boundary"""
+        self.cancel_event.set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise ExtractionCancelled()
+
+    def phase(self, name, message="", step=None, total=None):
+        """Announce a phase, aborting first if the job was cancelled"""
+        self.check_cancelled()
+        enter_phase(name, message)
+        if self.callback:
+            try:
+                self.callback(name, message, step, total)
+            except Exception as e:
+                logging.warning(f"Progress callback failed: {str(e)}")
+
+    def sleep(self, seconds):
+        """Sleep that wakes up immediately when the job is cancelled"""
+        if self.cancel_event.wait(seconds):
+            raise ExtractionCancelled()
@@ -0,0 +1,180 @@
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+import json
+import logging
+import time
+from automation.tracing import record
+
+# Performance log events used to follow in-flight network requests
+_REQUEST_STARTED = "Network.requestWillBeSent"
+_REQUEST_DONE = ("Network.loadingFinished", "Network.loadingFailed")
+
+
+class PageReadiness:
+    """Waits for real page conditions instead of fixed sleeps.
+
+    Every wait has a timeout ceiling, never raises on timeout (the caller
+    carries on like it did after the old fixed sleep) and is recorded in
+    ``timings`` with how long it actually took.
+    """
+    def __init__(self, driver, progress=None, poll_interval=0.1):
+        self.driver = driver
+        self.progress = progress
+        self.poll_interval = poll_interval
+        self.timings = []
+        self._inflight = set()
+        self._performance_log = True
+
+    def _sleep(self, seconds):
+        if self.progress:
+            self.progress.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def _wait(self, name, condition, timeout):
+        """Poll ``condition`` until it returns a truthy value or the timeout expires"""
+        start = time.perf_counter()
+        value = None
+        while True:
+            try:
+                value = condition()
+            except (StaleElementReferenceException, WebDriverException):
+                value = None
+            elapsed = time.perf_counter() - start
+            if value or elapsed >= timeout:
+                break
+            self._sleep(min(self.poll_interval, timeout - elapsed))
+        self._record(name, elapsed, timeout, bool(value))
+        return value
+
+    def wait_until(self, name, condition, timeout):
+        """Wait for a custom condition; recorded like the built-in waits"""
+        return self._wait(name, condition, timeout)
+
+    def _record(self, name, elapsed, timeout, satisfied):
+        record(name, "wait", time.perf_counter() - elapsed, satisfied=satisfied)
+        self.timings.append({
+            "condition": name,
+            "elapsed": round(elapsed, 3),
+            "timeout": timeout,
+            "satisfied": satisfied
+        })
+        if satisfied:
+            logging.info(f"Wait '{name}' satisfied after {elapsed:.2f}s")
+        else:
+            logging.warning(f"Wait '{name}' timed out after {elapsed:.2f}s")
+
+    def total_wait_time(self):
+        return round(sum(t["elapsed"] for t in self.timings), 3)
+
+    def document_ready(self, timeout=15):
+        """Wait until document.readyState is 'complete'"""
+        return self._wait("document_ready",
+                          lambda: self.driver.execute_script("return document.readyState") == "complete",
+                          timeout)
+
+    def element_present(self, locator, timeout=10, name=None):
+        """Wait for an element matching a (By, value) locator"""
+        return self._wait(name or f"element_present {locator[1]}",
+                          lambda: next(iter(self.driver.find_elements(*locator)), None),
+                          timeout)
+
+    def any_element_present(self, locators, timeout=10, name=None):
+        """Wait for the first element matching any of several locators"""
+        def condition():
+            for locator in locators:
+                elements = self.driver.find_elements(*locator)
+                if elements:
+                    return elements[0]
+            return None
+        return self._wait(name or "any_element_present", condition, timeout)
+
+    def element_clickable(self, locator, timeout=10, name=None):
+        """Wait for a visible and enabled element"""
+        def condition():
+            for element in self.driver.find_elements(*locator):
+                if element.is_displayed() and element.is_enabled():
+                    return element
+            return None
+        return self._wait(name or f"element_clickable {locator[1]}", condition, timeout)
+
+    def element_gone(self, element, timeout=5, name="element_gone"):
+        """Wait for an element to be detached from the page or hidden"""
+        def condition():
+            try:
+                return not element.is_displayed()
+            except (StaleElementReferenceException, WebDriverException):
+                return True
+        return self._wait(name, condition, timeout)
+
+    def count(self, css_selector):
+        """Number of elements currently matching a CSS selector"""
+        try:
+            return self.driver.execute_script("return document.querySelectorAll(arguments[0]).length", css_selector)
+        except WebDriverException:
+            return 0
+
+    def content_appended(self, css_selector, previous_count, timeout=5):
+        """Wait for new elements (e.g. posts) to be appended after a scroll"""
+        return self._wait(f"content_appended {css_selector}",
+                          lambda: self.count(css_selector) > previous_count,
+                          timeout)
+
+    def reset_network(self):
+        """Forget in-flight requests; call right before a navigation"""
+        self._inflight.clear()
+        self._drain_performance_log()
+
+    def _drain_performance_log(self):
+        """Update in-flight requests from CDP events; False if the log is unavailable"""
+        if not self._performance_log:
+            return False
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception:
+            self._performance_log = False
+            return False
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            if method == _REQUEST_STARTED:
+                self._inflight.add(message["params"]["requestId"])
+            elif method in _REQUEST_DONE:
+                self._inflight.discard(message["params"]["requestId"])
+        return True
+
+    def network_idle(self, idle_time=0.5, timeout=10, max_inflight=0):
+        """Wait until no requests have been in flight for ``idle_time`` seconds.
+
+        Uses Network.* events from the CDP performance log when the browser
+        was started with performance logging, otherwise falls back to the
+        number of Resource Timing entries staying constant.
+        """
+        state = {"since": None, "resources": -1}
+
+        def condition():
+            now = time.perf_counter()
+            if self._drain_performance_log():
+                busy = len(self._inflight) > max_inflight
+            else:
+                resources = self.driver.execute_script("return performance.getEntriesByType('resource').length")
+                busy = resources != state["resources"]
+                state["resources"] = resources
+            if busy:
+                state["since"] = None
+                return False
+            if state["since"] is None:
+                state["since"] = now
+            return now - state["since"] >= idle_time
+        return self._wait("network_idle", condition, timeout)
+
+    def page_loaded(self, locators=None, timeout=15, idle_timeout=10):
+        """Document ready, optionally a key element present, then network idle"""
+        self.document_ready(timeout)
+        element = None
+        if locators:
+            element = self.any_element_present(locators, timeout, name="page_content")
+        self.network_idle(timeout=idle_timeout)
+        return element
@@ -0,0 +1,102 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
+import logging
+import time
+import config
+from automation.tracing import span
+
+API_USER_AGENT = "ForensicCapture/1.0 (public evidence collection)"
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(base_url):
+    """Keep-alive session shared by every client talking to ``base_url``"""
+    with _sessions_lock:
+        session = _sessions.get(base_url)
+        if session is None:
+            session = requests.Session()
+            retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=("GET",), respect_retry_after_header=True)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config.HTTP_POOL_SIZE, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"User-Agent": API_USER_AGENT, "Accept": "application/json"})
+            _sessions[base_url] = session
+        return session
+
+
+class RedditJsonClient:
+    """Reads Reddit's public ``.json`` endpoints without a browser.
+
+    Listings are paged with the ``after`` cursor and yielded item by item
+    so callers can stream them to disk as they arrive.
+    """
+    def __init__(self, base_url=None, page_size=100, timeout=20, progress=None):
+        self.base_url = (base_url or config.REDDIT_BASE_URL).rstrip("/")
+        self.session = get_session(self.base_url)
+        self.page_size = page_size
+        self.timeout = timeout
+        self.progress = progress
+
+    def _get(self, path, params=None):
+        with span("http_get", "api", path=path):
+            response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        self._respect_rate_limit(response)
+        return response.json()
+
+    def _respect_rate_limit(self, response):
+        """Pause when Reddit reports the rate-limit window is used up"""
+        try:
+            remaining = float(response.headers.get("x-ratelimit-remaining", "1"))
+            reset = float(response.headers.get("x-ratelimit-reset", "0"))
+        except ValueError:
+            return
+        if remaining < 1 and reset > 0:
+            logging.warning(f"Reddit rate limit reached, waiting {reset:.0f}s")
+            if self.progress:
+                self.progress.sleep(reset)
+            else:
+                time.sleep(reset)
+
+    def about_user(self, username):
+        return self._get(f"/user/{username}/about.json").get("data", {})
+
+    def about_subreddit(self, name):
+        return self._get(f"/r/{name}/about.json").get("data", {})
+
+    def iter_listing(self, path, limit=None, params=None):
+        """Yield ``(kind, data)`` for every item of a listing, following ``after`` cursors"""
+        limit = config.REDDIT_API_MAX_ITEMS if limit is None else limit
+        params = dict(params or {})
+        after = None
+        fetched = 0
+        while True:
+            page_params = dict(params, limit=self.page_size, raw_json=1)
+            if after:
+                page_params["after"] = after
+            if self.progress:
+                self.progress.phase("capture", f"{path} ({fetched} items)")
+            listing = self._get(path, page_params).get("data", {})
+            children = listing.get("children", [])
+            for child in children:
+                yield child.get("kind"), child.get("data", {})
+                fetched += 1
+                if limit and fetched >= limit:
+                    return
+            after = listing.get("after")
+            if not after or not children:
+                return
+
+    def user_submissions(self, username, limit=None):
+        return self.iter_listing(f"/user/{username}/submitted.json", limit, {"sort": "new"})
+
+    def user_comments(self, username, limit=None):
+        return self.iter_listing(f"/user/{username}/comments.json", limit, {"sort": "new"})
+
+    def subreddit_new(self, name, limit=None):
+        return self.iter_listing(f"/r/{name}/new.json", limit)
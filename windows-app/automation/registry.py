@@ -0,0 +1,67 @@
+import importlib
+import logging
+
+# Platform name -> adapter module/class and what the GUI offers for it.
+# Modules are imported on first use only, so the UI reads everything it needs from here.
+PLATFORMS = {
+    "Facebook": {
+        "module": "automation.facebook_automation", "class": "FacebookAutomation",
+        "data_types": ["Posts", "Messages", "Timeline", "Friends List", "Account Info"],
+        "authorized": True, "target_label": "Profile ID/Username",
+    },
+    "Instagram": {
+        "module": "automation.instagram_automation", "class": "InstagramAutomation",
+        "data_types": ["Posts", "Messages", "Timeline", "Friends List", "Account Info"],
+        "authorized": True, "target_label": "Profile ID/Username",
+    },
+    "Reddit": {
+        "module": "automation.reddit_automation", "class": "RedditAutomation",
+        "data_types": ["User Profile", "User Posts", "Subreddit"],
+        "authorized": False, "target_label": "Reddit Username",
+    },
+    "Mastodon": {
+        "module": "automation.mastodon_automation", "class": "MastodonAutomation",
+        "data_types": ["User Profile", "User Posts", "Hashtag"],
+        "authorized": False, "target_label": "Mastodon Username",
+    },
+}
+
+
+def platform_info(platform):
+    """Static description of a platform, or None if it has no adapter"""
+    return PLATFORMS.get(platform)
+
+
+def automation_class(platform):
+    """Import and return the automation class of a platform"""
+    if platform not in PLATFORMS:
+        raise ValueError(f"{platform} functionality is not yet implemented")
+    info = PLATFORMS[platform]
+    return getattr(importlib.import_module(info["module"]), info["class"])
+
+
+class PlatformRegistry:
+    """One automation instance per platform, created when the platform is first used.
+
+    Importing an automation module pulls in Selenium, PIL and the HTTP
+    clients, so nothing is imported until a job for that platform starts.
+    """
+    def __init__(self):
+        self._instances = {}
+
+    def names(self):
+        return list(PLATFORMS)
+
+    def get(self, platform):
+        if platform not in self._instances:
+            self._instances[platform] = automation_class(platform)()
+            logging.info(f"Loaded {platform} automation")
+        return self._instances[platform]
+
+    def close_all(self):
+        """Close every automation that was created"""
+        for platform, automation in self._instances.items():
+            try:
+                automation.close()
+            except Exception as e:
+                logging.warning(f"Failed to close {platform} automation: {str(e)}")
@@ -0,0 +1,212 @@
+from automation.blob_store import get_blob_store
+from automation.image_dedup import perceptual_hash
+from automation.tracing import span
+import contextvars
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+import config
+
+
+class PendingFrame:
+    """A screenshot handed to the writer pool; its path is known once the frame is written"""
+    def __init__(self, name, data, deduplicate, sequence):
+        self.name = name
+        self.data = data
+        self.deduplicate = deduplicate
+        self.sequence = sequence
+        self.digest = None
+        self.original_digest = None  # SHA-256 of the bytes Chrome returned, before re-encoding
+        self.encoding = None
+        self.path = None
+        self.duplicate_of = None  # Pending frame this one repeats, if dropped
+        self.error = None
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self):
+        self._done.wait()
+        return self
+
+    def frame(self):
+        """Entry written into the ``frames`` list of the run metadata"""
+        return {"name": self.name, "sha256": self.digest, "path": self.path,
+                "original_sha256": self.original_digest, "encoding": self.encoding}
+
+
+class FrameBatch:
+    """Frames of one extraction, deduplicated in the order they were captured.
+
+    Workers hash frames in parallel but take turns, by sequence number,
+    when comparing them with the frames already kept, so which frame of a
+    near-duplicate pair survives does not depend on thread timing.
+    ``profile`` (a CaptureProfile) re-encodes the frames before storage.
+    """
+    def __init__(self, deduplicator, profile=None):
+        self.deduplicator = deduplicator
+        self.profile = profile
+        self.frames = []
+        self._turn = 0
+        self._turn_changed = threading.Condition()
+        self._unsynced = []
+
+    def new_frame(self, name, data, deduplicate):
+        frame = PendingFrame(name, data, deduplicate, len(self.frames))
+        self.frames.append(frame)
+        return frame
+
+    def check_duplicate(self, frame, hash_value):
+        """Keep or drop ``frame`` once every earlier frame of the batch was checked"""
+        with self._turn_changed:
+            self._turn_changed.wait_for(lambda: self._turn == frame.sequence)
+            try:
+                if hash_value is None:
+                    return None
+                original = self.deduplicator.check_hash(hash_value, frame.name)
+                if original:
+                    return next(kept for kept in self.frames if kept.name == original)
+                return None
+            finally:
+                self._turn += 1
+                self._turn_changed.notify_all()
+
+    def written(self, path):
+        with self._turn_changed:
+            self._unsynced.append(path)
+
+    def take_unsynced(self):
+        with self._turn_changed:
+            paths, self._unsynced = self._unsynced, []
+        return paths
+
+
+class ScreenshotWriter:
+    """Bounded pool that stores screenshots off the browser thread.
+
+    The browser thread only fetches the encoded capture and calls ``submit``;
+    the perceptual hash, SHA-256, re-encoding for the batch's capture profile
+    and the blob write run on
+    ``SCREENSHOT_WRITERS`` threads. When ``SCREENSHOT_QUEUE_SIZE`` frames
+    are waiting, ``submit`` blocks until a writer catches up, which bounds
+    the memory held by raw captures. ``flush`` is the barrier taken before
+    metadata or reports use the paths: it waits for a batch and fsyncs the
+    files it wrote in one pass.
+    """
+    def __init__(self, workers=None, queue_size=None, blob_store=None):
+        self.blob_store = blob_store or get_blob_store()
+        self._queue = queue.Queue(maxsize=queue_size or config.SCREENSHOT_QUEUE_SIZE)
+        self._threads = []
+        for i in range(max(1, workers or config.SCREENSHOT_WRITERS)):
+            thread = threading.Thread(target=self._work, name=f"screenshot-writer-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, batch, data, name, deduplicate=True):
+        """Queue a captured frame and return its PendingFrame (blocks while the queue is full)"""
+        frame = batch.new_frame(name, data, deduplicate)
+        task = (batch, frame, contextvars.copy_context())  # Keep the run's log fields in the worker
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            start = time.perf_counter()
+            with span("writer_backpressure", "capture", frame=name):
+                self._queue.put(task)
+            logging.info(f"Screenshot queue full, capture waited {time.perf_counter() - start:.2f}s for a writer")
+        return frame
+
+    def _work(self):
+        while True:
+            batch, frame, context = self._queue.get()
+            try:
+                context.run(self._store, batch, frame)
+            finally:
+                frame.data = None  # Release the raw capture
+                frame._done.set()
+                self._queue.task_done()
+
+    def _store(self, batch, frame):
+        hash_value = None
+        try:
+            if frame.deduplicate:
+                with span("dedup_hash", "capture"):
+                    hash_value = perceptual_hash(frame.data)
+        except Exception as e:
+            frame.error = e
+        original = batch.check_duplicate(frame, hash_value)  # Always take the turn so later frames are not held up
+        if frame.error:
+            logging.error(f"Could not hash screenshot {frame.name}: {str(frame.error)}")
+            return
+        if original:
+            frame.duplicate_of = original
+            return
+        try:
+            data, ext = frame.data, ".png"
+            frame.original_digest = hashlib.sha256(data).hexdigest()
+            if batch.profile:
+                with span("encode", "capture", profile=batch.profile.name):
+                    data, ext = batch.profile.encode(data)
+                frame.encoding = batch.profile.name
+            with span("blob_put", "capture", bytes=len(data)):
+                frame.digest, frame.path = self.blob_store.put(data, ext)
+            batch.written(frame.path)
+            logging.info(f"Screenshot {frame.name} stored as {frame.path}")
+        except Exception as e:
+            frame.error = e
+            logging.error(f"Could not store screenshot {frame.name}: {str(e)}")
+
+    def flush(self, batch, frames=None):
+        """Wait until ``frames`` (default: the whole batch) are stored and sync them to disk.
+
+        Raises the first storage error so a run never records a screenshot
+        that is not on disk.
+        """
+        frames = batch.frames if frames is None else frames
+        with span("writer_flush", "capture", frames=len(frames)):
+            for frame in frames:
+                frame.wait()
+            if config.SCREENSHOT_FSYNC:
+                self._sync(batch.take_unsynced())
+        for frame in frames:
+            if frame.error:
+                raise frame.error
+
+    def _sync(self, paths):
+        """fsync written blobs and then their directories, once per directory"""
+        directories = set()
+        for path in paths:
+            try:
+                with open(path, 'r+b') as f:  # Windows needs a writable handle to flush
+                    os.fsync(f.fileno())
+                directories.add(os.path.dirname(path))
+            except OSError as e:
+                logging.warning(f"Could not sync {path}: {str(e)}")
+        if os.name == "nt":
+            return  # Directory entries cannot be opened for fsync on Windows
+        for directory in directories:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                logging.warning(f"Could not sync {directory}: {str(e)}")
+
+
+_default_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_screenshot_writer():
+    """Process-wide screenshot writer pool, started on first use"""
+    global _default_writer
+    with _writer_lock:
+        if _default_writer is None:
+            _default_writer = ScreenshotWriter()
+        return _default_writer
@@ -0,0 +1,175 @@
+from datetime import datetime, timezone
+import logging
+import re
+import time
+import config
+from automation.tracing import record
+
+# Height, scroll position and post count of the page in one round trip
+_PAGE_STATE_JS = """
+var selector = arguments[0];
+return {
+    height: Math.max(document.body.scrollHeight, document.documentElement.scrollHeight),
+    offset: window.pageYOffset,
+    viewport: window.innerHeight,
+    count: selector ? document.querySelectorAll(selector).length : 0
+};
+"""
+
+# Oldest timestamp among the <time datetime="..."> elements on the page
+_OLDEST_DATE_JS = """
+var times = document.querySelectorAll(arguments[0]);
+var oldest = null;
+for (var i = 0; i < times.length; i++) {
+    var value = times[i].getAttribute('datetime');
+    if (value && (oldest === null || value < oldest)) { oldest = value; }
+}
+return oldest;
+"""
+
+
+# ISO-8601 as sites write it: "Z" or +HHMM/+HH offsets and any number of fraction
+# digits, none of which datetime.fromisoformat accepts before Python 3.11
+_ISO_TIMESTAMP = re.compile(r"^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}(?::\d{2})?)(?:[.,](\d+))?"
+                            r"(Z|[+-]\d{2}(?::?\d{2})?)?$", re.IGNORECASE)
+
+
+def _normalise_iso(value):
+    """Rewrite an ISO-8601 string into the subset every fromisoformat accepts"""
+    match = _ISO_TIMESTAMP.match(value.strip())
+    if not match:
+        return value
+    date, time_part, fraction, offset = match.groups()
+    normalised = f"{date}T{time_part}"
+    if fraction:
+        normalised += "." + fraction[:6].ljust(6, "0")
+    if offset:
+        if offset.upper() == "Z":
+            offset = "+00:00"
+        elif ":" not in offset:
+            offset = f"{offset[:3]}:{offset[3:5] or '00'}"
+        normalised += offset
+    return normalised
+
+
+def parse_timestamp(value):
+    """Parse an ISO-8601 timestamp (``Z``, ``+0000`` or ``+00:00`` offsets) into an aware datetime"""
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(_normalise_iso(str(value)))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class ScrollEngine:
+    """Scrolls infinite feeds until the content, not a fixed count, says stop.
+
+    Stop conditions: page height/post count stable for ``stable_polls``
+    scrolls, ``target_count`` posts loaded, ``time_budget`` seconds spent,
+    posts older than ``date_cutoff`` reached, or a caller-supplied
+    ``stop_condition`` firing. The wait after each scroll
+    backs off while nothing new arrives and shrinks again once it does.
+    """
+    def __init__(self, driver, readiness, item_selector=None, date_selector="time[datetime]"):
+        self.driver = driver
+        self.readiness = readiness
+        self.item_selector = item_selector
+        self.date_selector = date_selector
+
+    def _state(self):
+        return self.driver.execute_script(_PAGE_STATE_JS, self.item_selector)
+
+    def _oldest_date(self):
+        value = self.driver.execute_script(_OLDEST_DATE_JS, self.date_selector)
+        if not value:
+            return None
+        try:
+            return parse_timestamp(value)
+        except ValueError:
+            return None
+
+    def scroll(self, mode="bottom", max_steps=None, stable_polls=None, target_count=None, time_budget=None,
+               date_cutoff=None, on_step=None, stop_condition=None, min_wait=0.25, max_wait=4.0):
+        """Scroll until a stop condition fires and return a summary dict.
+
+        ``mode`` is ``"bottom"`` (jump to the end to load the next batch) or
+        ``"viewport"`` (advance one screen at a time, e.g. to screenshot each
+        screen). ``on_step(step, state)`` is called after every scroll that
+        revealed something new. ``stop_condition()`` is checked before each
+        scroll and stops it by returning a reason string.
+        """
+        max_steps = config.SCROLL_MAX_STEPS if max_steps is None else max_steps
+        stable_polls = config.SCROLL_STABLE_POLLS if stable_polls is None else stable_polls
+        time_budget = config.SCROLL_TIME_BUDGET if time_budget is None else time_budget
+        if target_count is None and config.SCROLL_TARGET_POSTS:
+            target_count = config.SCROLL_TARGET_POSTS
+        cutoff = parse_timestamp(date_cutoff) if date_cutoff else None
+
+        start = time.perf_counter()
+        state = self._state()
+        wait = min_wait
+        stable = 0
+        steps = 0
+        reason = "max_steps"
+
+        while steps < max_steps:
+            if target_count and state["count"] >= target_count:
+                reason = "target_count"
+                break
+            if time_budget and time.perf_counter() - start >= time_budget:
+                reason = "time_budget"
+                break
+            if cutoff:
+                oldest = self._oldest_date()
+                if oldest and oldest <= cutoff:
+                    reason = "date_cutoff"
+                    break
+            if stop_condition:
+                caller_reason = stop_condition()
+                if caller_reason:
+                    reason = caller_reason
+                    break
+
+            previous = state
+            step_start = time.perf_counter()
+            if mode == "viewport":
+                self.driver.execute_script("window.scrollBy(0, Math.floor(window.innerHeight * 0.9));")
+            else:
+                self.driver.execute_script("window.scrollTo(0, Math.max(document.body.scrollHeight, document.documentElement.scrollHeight));")
+            steps += 1
+
+            def advanced():
+                current = self._state()
+                grew = current["height"] > previous["height"] or current["count"] > previous["count"]
+                moved = mode == "viewport" and current["offset"] > previous["offset"]
+                return current if (grew or moved) else None
+
+            current = self.readiness.wait_until(f"scroll_step_{steps}", advanced, wait)
+            if current:
+                state = current
+                stable = 0
+                wait = max(min_wait, wait / 2)
+                self.readiness.network_idle(idle_time=0.2, timeout=wait + 1)
+                if on_step:
+                    on_step(steps, state)
+                record("scroll_step", "scroll", step_start, step=steps, mode=mode, items=state["count"])
+            else:
+                state = self._state()
+                stable += 1
+                wait = min(max_wait, wait * 2)  # Back off while the feed is slow or exhausted
+                record("scroll_step", "scroll", step_start, step=steps, mode=mode, stable=stable)
+                if stable >= stable_polls:
+                    reason = "height_stable"
+                    break
+
+        summary = {
+            "steps": steps,
+            "stop_reason": reason,
+            "elapsed": round(time.perf_counter() - start, 3),
+            "height": state["height"],
+            "item_count": state["count"]
+        }
+        logging.info(f"Scrolled {steps} step(s) in {summary['elapsed']}s, stopped on {reason} ({state['count']} items)")
+        return summary
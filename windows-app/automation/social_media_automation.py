@@ -4,7 +4,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from automation.chromedriver import resolve_chromedriver
 from PIL import Image
 import os
 import time
@@ -26,7 +26,7 @@ class SocialMediaAutomation:
         chrome_options.add_argument("--start-maximized")
         chrome_options.add_argument("--disable-notifications")
         
-        service = Service(ChromeDriverManager().install())
+        service = Service(executable_path=resolve_chromedriver())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
         
     def login_facebook(self, username, password):
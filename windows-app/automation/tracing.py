@@ -0,0 +1,176 @@
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import config
+
+PHASES = ("driver", "navigate", "consent", "capture", "metadata", "report")
+PHASE_TID = 0  # Trace lane holding the progress phases; spans use their thread id
+
+
+class Tracer:
+    """Timing spans of one extraction, exported in Chrome trace-event format.
+
+    Two kinds of events are recorded: the progress phases (``driver``,
+    ``navigate``, ``consent``, ``capture``, ``metadata``, ``report``), each
+    running until the next one starts, and explicit spans around finer
+    steps such as a scroll step or a screenshot. The JSON file opens in
+    chrome://tracing or https://ui.perfetto.dev.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.events = []
+        self._lock = threading.Lock()
+        self._wall_origin = time.time()
+        self._origin = time.perf_counter()
+        self._phase = None
+        self._pid = os.getpid()
+        self.finished = None
+        self.trace_file = None
+
+    def _micros(self, moment):
+        return int((self._wall_origin + moment - self._origin) * 1e6)
+
+    def add(self, name, category, start, end, tid=None, args=None):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._micros(start),
+            "dur": max(0, int((end - start) * 1e6)),
+            "pid": self._pid,
+            "tid": threading.get_ident() if tid is None else tid,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category=None, **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, category or name, start, time.perf_counter(), args=args)
+
+    def enter_phase(self, phase, message=""):
+        """Close the running phase and start ``phase`` (repeats of the same phase are merged)"""
+        now = time.perf_counter()
+        with self._lock:
+            current = self._phase
+            if current and current[0] == phase:
+                return
+            self._phase = (phase, now, message)
+        if current:
+            self.add(current[0], "phase", current[1], now, PHASE_TID, {"message": current[2]} if current[2] else None)
+
+    def close(self):
+        self.enter_phase(None)
+        with self._lock:
+            self._phase = None
+        self.finished = time.perf_counter()
+
+    def phase_totals(self):
+        """Seconds spent per phase, plus the total run time"""
+        totals = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            if event["cat"] == "phase":
+                totals[event["name"]] = totals.get(event["name"], 0) + event["dur"] / 1e6
+        totals["total"] = (self.finished or time.perf_counter()) - self._origin
+        return totals
+
+    def write(self, directory=None):
+        """Write the trace JSON and return its path"""
+        directory = directory or config.TRACE_DIR
+        os.makedirs(directory, exist_ok=True)
+        safe_name = re.sub(r"[^\w.-]+", "_", self.name)
+        path = os.path.join(directory, f"{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.trace.json")
+        with self._lock:
+            events = list(self.events)
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self._pid, "tid": PHASE_TID, "args": {"name": self.name}},
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": PHASE_TID, "args": {"name": "phases"}},
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+_active = None
+
+
+def current_tracer():
+    return _active
+
+
+@contextmanager
+def span(name, category=None, **args):
+    """Time a block under the active trace; a no-op when no run is being traced"""
+    tracer = _active
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, category, **args):
+        yield
+
+
+def record(name, category, start, **args):
+    """Add a span that started at ``start`` (a perf_counter value) and ends now"""
+    if _active is not None:
+        _active.add(name, category, start, time.perf_counter(), args=args)
+
+
+def enter_phase(phase, message=""):
+    if _active is not None:
+        _active.enter_phase(phase, message)
+
+
+@contextmanager
+def trace_run(name, enabled=None):
+    """Trace one extraction; yields the Tracer (None when tracing is off) and writes it on exit"""
+    global _active
+    enabled = config.TRACE_ENABLED if enabled is None else enabled
+    if not enabled:
+        yield None
+        return
+    tracer = Tracer(name)
+    previous, _active = _active, tracer
+    try:
+        yield tracer
+    finally:
+        _active = previous
+        tracer.close()
+        try:
+            tracer.trace_file = tracer.write()
+            logging.info(f"Trace written to {tracer.trace_file}")
+        except OSError as e:
+            logging.error(f"Could not write trace for {name}: {str(e)}")
+        logging.info("Phase timings: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in tracer.phase_totals().items()))
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(1, math.ceil(fraction * len(ordered))) - 1]
+
+
+def phase_summary(runs):
+    """``[(phase, count, p50, p95)]`` across the phase totals of several runs"""
+    by_phase = {}
+    for totals in runs:
+        for phase, seconds in (totals or {}).items():
+            by_phase.setdefault(phase, []).append(seconds)
+    known = [phase for phase in PHASES if phase in by_phase]
+    phases = known + sorted(set(by_phase) - set(known) - {"total"}) + (["total"] if "total" in by_phase else [])
+    return [(phase, len(by_phase[phase]), percentile(by_phase[phase], 0.5), percentile(by_phase[phase], 0.95))
+            for phase in phases]
@@ -0,0 +1,148 @@
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import threading
+import config
+from automation.scroll_engine import parse_timestamp
+
+
+def to_timestamp(value):
+    """Normalise an ISO string, epoch seconds/milliseconds or datetime to a UTC ISO string"""
+    if value in (None, ""):
+        return None
+    try:
+        if isinstance(value, (int, float)) or str(value).replace(".", "", 1).isdigit():
+            seconds = float(value)
+            if seconds > 1e11:  # Milliseconds, as in old.reddit data-timestamp
+                seconds /= 1000
+            parsed = datetime.fromtimestamp(seconds, tz=timezone.utc)
+        else:
+            parsed = parse_timestamp(value)
+    except (ValueError, OverflowError, OSError):
+        return None
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def is_seen(mark, record_id, timestamp):
+    """True when a record is the watermarked one or older than it"""
+    if not mark:
+        return False
+    if record_id is not None and str(record_id) == str(mark.get("id")):
+        return True
+    timestamp = to_timestamp(timestamp)
+    return bool(timestamp and mark.get("timestamp") and timestamp <= mark["timestamp"])
+
+
+class DeltaTracker:
+    """Keeps the newest (id, timestamp) seen per record type during one run"""
+    def __init__(self):
+        self.marks = {}
+
+    def observe(self, record_type, record_id, timestamp):
+        timestamp = to_timestamp(timestamp)
+        record_id = None if record_id is None else str(record_id)
+        current = self.marks.get(record_type)
+        if current is None:
+            newer = True
+        elif timestamp or current["timestamp"]:
+            newer = bool(timestamp) and (not current["timestamp"] or timestamp > current["timestamp"])
+        else:
+            # No timestamps: numeric ids (Mastodon, snowflakes) still sort by time
+            newer = bool(record_id and record_id.isdigit() and (current["id"] or "").isdigit()
+                         and int(record_id) > int(current["id"]))
+        if newer:
+            self.marks[record_type] = {"id": record_id, "timestamp": timestamp}
+
+
+class WatermarkStore:
+    """Remembers the newest post captured per target so re-runs fetch only the delta.
+
+    Entries live in one JSON file keyed by ``platform:kind:name``::
+
+        {"marks": {record_type: {"id", "timestamp"}}, "last_run": metadata file,
+         "runs": count, "updated": time}
+    """
+    def __init__(self, path=None):
+        self.path = path or config.WATERMARK_FILE
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(platform, kind, name, instance=None):
+        name = name.lower()
+        return f"{platform}:{kind}:{name}@{instance}" if instance else f"{platform}:{kind}:{name}"
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read watermarks from {self.path}: {str(e)}")
+            return {}
+
+    def get(self, key):
+        with self._lock:
+            return self._load().get(key, {})
+
+    def update(self, key, marks, run_file):
+        """Advance the marks of ``key`` and point it at the run that produced them"""
+        with self._lock:
+            data = self._load()  # Re-read so concurrent runs on other targets are kept
+            entry = data.setdefault(key, {"marks": {}, "runs": 0})
+            for record_type, mark in marks.items():
+                current = entry["marks"].get(record_type)
+                if not current or (mark["timestamp"] and (not current.get("timestamp") or mark["timestamp"] > current["timestamp"])):
+                    entry["marks"][record_type] = mark
+            entry["last_run"] = run_file
+            entry["runs"] = entry.get("runs", 0) + 1
+            entry["updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4)
+            os.replace(temp_path, self.path)
+        return entry
+
+
+class IncrementalRun:
+    """Watermark bookkeeping for one extraction of one target.
+
+    ``since(record_type)`` is where the previous run stopped (None on a
+    full run), ``seen()`` tells whether a record was already captured and
+    ``commit()`` advances the store once the run's metadata is written.
+    """
+    def __init__(self, key, enabled=None, store=None):
+        self.key = key
+        self.enabled = config.INCREMENTAL_CAPTURE if enabled is None else enabled
+        self.store = store or WatermarkStore()
+        self.previous = self.store.get(key)
+        self.tracker = DeltaTracker()
+
+    def since(self, record_type):
+        return self.previous.get("marks", {}).get(record_type) if self.enabled else None
+
+    def seen(self, record_type, record_id, timestamp):
+        return is_seen(self.since(record_type), record_id, timestamp)
+
+    def observe(self, record_type, record_id, timestamp):
+        self.tracker.observe(record_type, record_id, timestamp)
+
+    def summary(self):
+        """Metadata block linking this run to the one before it"""
+        return {
+            "enabled": self.enabled,
+            "watermark_key": self.key,
+            "since": self.previous.get("marks", {}) if self.enabled else {},
+            "previous_run": self.previous.get("last_run")
+        }
+
+    def commit(self, run_file):
+        try:
+            self.store.update(self.key, self.tracker.marks, run_file)
+        except OSError as e:
+            logging.error(f"Could not save watermark for {self.key}: {str(e)}")
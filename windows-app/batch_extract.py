@@ -0,0 +1,188 @@
+"""Headless batch extraction runner.
+
+Reads a CSV file of ``platform,target,data_type[,instance]`` rows and fans
+them out across a pool of worker processes, each owning its own browser.
+Outputs (screenshots, metadata JSON) are written exactly as the GUI does.
+
+Example:
+    python batch_extract.py targets.csv --workers 4
+"""
+import argparse
+import csv
+import logging
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+import config
+from automation.tracing import phase_summary, trace_run
+from automation.log_setup import configure_logging, log_context, new_run_id
+from automation.registry import PlatformRegistry
+
+DEFAULT_INSTANCE = "mastodon.social"
+
+_platforms = PlatformRegistry()
+
+
+def read_targets(path):
+    """Read (platform, target, data_type, instance) rows from a CSV file"""
+    targets = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            row = [cell.strip() for cell in row]
+            if not row or not row[0] or row[0].startswith('#'):
+                continue
+            if row[0].lower() == "platform":
+                continue  # Header row
+            if len(row) < 3:
+                raise ValueError(f"Expected platform,target,data_type but got: {','.join(row)}")
+            instance = row[3] if len(row) > 3 and row[3] else DEFAULT_INSTANCE
+            targets.append((row[0], row[1], row[2], instance))
+    return targets
+
+
+def _get_automation(platform):
+    """Return this worker's automation instance for a platform"""
+    return _platforms.get(platform)
+
+
+def extract_target(platform, target, data_type, instance=DEFAULT_INSTANCE, mode=None, incremental=None):
+    """Run one public extraction the same way the GUI does"""
+    return _get_automation(platform).extract(target, data_type, mode=mode, incremental=incremental, instance=instance)
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp')
+
+
+def count_screenshots(result):
+    """Count the distinct screenshot files referenced by an extraction result"""
+    if isinstance(result, str):
+        return 1
+    if isinstance(result, dict):
+        paths = set(result.get("posts_all") or [])
+        paths.update(value for value in result.values() if isinstance(value, str))
+        return len([path for path in paths if path.lower().endswith(IMAGE_EXTENSIONS)])
+    return 0
+
+
+_mode = None
+_incremental = None
+
+
+def _init_worker(headless, max_pages, mode=None, incremental=None, log_queue=None):
+    """Give each worker process a single-browser pool of its own"""
+    global _mode, _incremental
+    if log_queue is not None:
+        configure_logging(log_queue, listen=False)  # The parent process writes the log file
+    _mode = mode
+    _incremental = incremental
+    from automation.driver_pool import DriverPool, set_driver_pool
+    pool = set_driver_pool(DriverPool(size=1, max_pages=max_pages, headless=headless))
+    if mode == "api":
+        return  # Browsers start lazily, only for platforms without an API path
+    try:
+        pool.warm(1)
+    except Exception as e:
+        logging.error(f"Failed to warm worker browser: {str(e)}")
+
+
+def _run_job(job):
+    index, (platform, target, data_type, instance) = job
+    start = time.perf_counter()
+    tracer = None
+    try:
+        with log_context(platform=platform, target=target, run=new_run_id()), \
+                trace_run(f"{platform}_{target}_{data_type}") as tracer:
+            result = extract_target(platform, target, data_type, instance, _mode, _incremental)
+        error = None if result else "extraction returned no result"
+    except Exception as e:
+        result, error = None, str(e)
+    return {
+        "index": index,
+        "platform": platform,
+        "target": target,
+        "data_type": data_type,
+        "ok": error is None,
+        "error": error,
+        "screenshots": count_screenshots(result),
+        "metadata": result.get("metadata") if isinstance(result, dict) else None,
+        "elapsed": time.perf_counter() - start,
+        "phases": tracer.phase_totals() if tracer else None,
+        "trace": tracer.trace_file if tracer else None,
+    }
+
+
+def run_batch(targets, workers=2, headless=True, max_pages=config.DRIVER_MAX_PAGES, mode=None, incremental=None):
+    """Extract every target across a process pool, yielding results as they finish"""
+    jobs = list(enumerate(targets))
+    log_queue = multiprocessing.Queue()
+    configure_logging(log_queue)
+    if mode != "api":
+        from automation.chromedriver import resolve_chromedriver
+        # Resolve once here; workers inherit the path instead of searching again
+        os.environ["CHROMEDRIVER_PATH"] = resolve_chromedriver()
+    initargs = (headless, max_pages, mode, incremental, log_queue)
+    with multiprocessing.Pool(processes=workers, initializer=_init_worker, initargs=initargs) as pool:
+        for outcome in pool.imap_unordered(_run_job, jobs):
+            yield outcome
+
+
+def print_summary(outcomes, wall_time, workers, out=sys.stdout):
+    """Print a throughput summary for a finished batch"""
+    succeeded = [o for o in outcomes if o["ok"]]
+    failed = [o for o in outcomes if not o["ok"]]
+    durations = [o["elapsed"] for o in outcomes]
+    screenshots = sum(o["screenshots"] for o in outcomes)
+
+    print("", file=out)
+    print("Batch summary", file=out)
+    print(f"  Targets:      {len(outcomes)} ({len(succeeded)} succeeded, {len(failed)} failed)", file=out)
+    print(f"  Workers:      {workers}", file=out)
+    print(f"  Wall time:    {wall_time:.1f} s", file=out)
+    if wall_time > 0:
+        print(f"  Throughput:   {len(outcomes) / wall_time * 60:.1f} targets/min, {screenshots / wall_time * 60:.1f} screenshots/min", file=out)
+    if durations:
+        print(f"  Per target:   mean {statistics.mean(durations):.1f} s, median {statistics.median(durations):.1f} s, max {max(durations):.1f} s", file=out)
+    phases = phase_summary(o.get("phases") for o in outcomes)
+    if phases:
+        print("", file=out)
+        print(f"  {'Phase':<12}{'Runs':>6}{'p50 (s)':>10}{'p95 (s)':>10}", file=out)
+        for phase, count, p50, p95 in phases:
+            print(f"  {phase:<12}{count:>6}{p50:>10.2f}{p95:>10.2f}", file=out)
+    for o in failed:
+        print(f"  FAILED {o['platform']} {o['target']} ({o['data_type']}): {o['error']}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run social media extractions in batch without the GUI")
+    parser.add_argument("targets", help="CSV file with platform,target,data_type[,instance] rows")
+    parser.add_argument("-w", "--workers", type=int, default=config.DRIVER_POOL_SIZE, help="Number of worker processes (one browser each)")
+    parser.add_argument("--show-browser", action="store_true", help="Run browsers with a visible window instead of headless")
+    parser.add_argument("--max-pages", type=int, default=config.DRIVER_MAX_PAGES, help="Pages a worker browser serves before it is recycled")
+    parser.add_argument("--api", action="store_true", help="Use public JSON APIs instead of the browser where supported (Reddit, Mastodon)")
+    parser.add_argument("--full", action="store_true", help="Re-capture everything instead of only content newer than the last run")
+    args = parser.parse_args(argv)
+
+    targets = read_targets(args.targets)
+    if not targets:
+        print("No targets found", file=sys.stderr)
+        return 1
+    workers = max(1, min(args.workers, len(targets)))
+
+    outcomes = []
+    start = time.perf_counter()
+    for outcome in run_batch(targets, workers, headless=not args.show_browser, max_pages=args.max_pages,
+                             mode="api" if args.api else None, incremental=False if args.full else None):
+        outcomes.append(outcome)
+        status = "ok" if outcome["ok"] else "FAILED"
+        print(f"[{len(outcomes)}/{len(targets)}] {status} {outcome['platform']} {outcome['target']} "
+              f"({outcome['data_type']}) in {outcome['elapsed']:.1f} s")
+    print_summary(outcomes, time.perf_counter() - start, workers)
+    return 0 if all(o["ok"] for o in outcomes) else 2
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Capture profile benchmark: bytes per capture and capture latency.
+
+With ``--url`` every profile captures the same page in a headless browser
+``--runs`` times; latency covers the CDP capture (Chrome's own encoding)
+plus any Pillow re-encoding done by the screenshot writer. Without a URL,
+existing PNG screenshots are re-encoded offline, so only the Pillow cost is
+measured and the CDP profiles are approximated with Pillow's encoder.
+
+Examples:
+    python bench_capture.py --url https://www.reddit.com/r/python --runs 5
+    python bench_capture.py --images screenshots --scale 0.5
+"""
+import argparse
+import glob
+import io
+import os
+import statistics
+import sys
+import time
+
+from PIL import Image
+from automation.encoding import PROFILES, get_capture_profile
+from automation.tracing import percentile
+
+
+def _profiles(names, scale):
+    return [get_capture_profile(name, scale=scale) for name in names]
+
+
+def bench_offline(profiles, images):
+    """Re-encode Chrome PNGs from disk with every profile"""
+    samples = []
+    for path in images:
+        with open(path, 'rb') as f:
+            samples.append(f.read())
+    rows = []
+    for profile in profiles:
+        sizes, encode_times = [], []
+        for data in samples:
+            if profile.scale != 1:
+                image = Image.open(io.BytesIO(data))
+                out = io.BytesIO()
+                image.resize((max(1, int(image.width * profile.scale)), max(1, int(image.height * profile.scale))),
+                             Image.LANCZOS).save(out, "PNG")
+                data = out.getvalue()  # Chrome would have rendered at this size
+            start = time.perf_counter()
+            encoded = profile.pillow_encode(data) if profile.encoder != "none" else data
+            encode_times.append(time.perf_counter() - start)
+            sizes.append(len(encoded))
+        encoder = "pillow (offline)" if profile.encoder == "cdp" else profile.encoder
+        rows.append((profile.name, encoder, sizes, [0.0] * len(sizes), encode_times))
+    return rows
+
+
+def bench_live(profiles, url, runs):
+    """Capture ``url`` in a headless browser with every profile"""
+    from automation.driver_pool import get_driver_pool
+    from automation.page_capture import capture_viewport
+    pool = get_driver_pool()
+    driver = pool.acquire(headless=True)
+    rows = []
+    try:
+        pool.navigate(driver, url)
+        time.sleep(2)  # Let late content settle so every profile captures the same frame
+        capture_viewport(driver)  # Warm-up
+        for profile in profiles:
+            sizes, capture_times, encode_times = [], [], []
+            for _ in range(runs):
+                start = time.perf_counter()
+                data = capture_viewport(driver, profile)
+                captured = time.perf_counter()
+                encoded, _ = profile.encode(data)
+                encode_times.append(time.perf_counter() - captured)
+                capture_times.append(captured - start)
+                sizes.append(len(encoded))
+            rows.append((profile.name, profile.encoder, sizes, capture_times, encode_times))
+    finally:
+        pool.release(driver)
+        pool.shutdown()
+    return rows
+
+
+def print_table(rows):
+    baseline = next((statistics.mean(sizes) for name, _, sizes, _, _ in rows if name == "png"), None)
+    print(f"{'Profile':<15} {'Encoder':<17} {'KB/capture':>10} {'vs png':>7} {'Capture p50':>12} {'Encode p50':>11} {'Total p50':>10}")
+    for name, encoder, sizes, capture_times, encode_times in rows:
+        size = statistics.mean(sizes)
+        totals = [c + e for c, e in zip(capture_times, encode_times)]
+        ratio = f"{size / baseline:.0%}" if baseline else "-"
+        print(f"{name:<15} {encoder:<17} {size / 1024:10.0f} {ratio:>7} "
+              f"{percentile(capture_times, 0.5) * 1000:10.0f}ms {percentile(encode_times, 0.5) * 1000:9.0f}ms "
+              f"{percentile(totals, 0.5) * 1000:8.0f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare screenshot capture profiles by size and latency")
+    parser.add_argument("--url", help="Page captured live in a headless browser")
+    parser.add_argument("--images", default="screenshots", help="Folder of PNG screenshots re-encoded when no --url is given")
+    parser.add_argument("--runs", type=int, default=5, help="Captures per profile in live mode")
+    parser.add_argument("--limit", type=int, default=20, help="Sample images used in offline mode")
+    parser.add_argument("--scale", type=float, default=1.0, help="Device scale factor for every profile")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    args = parser.parse_args(argv)
+
+    profiles = _profiles(args.profiles, args.scale)
+    if args.url:
+        rows = bench_live(profiles, args.url, args.runs)
+    else:
+        images = sorted(path for path in glob.glob(os.path.join(args.images, "**", "*.png"), recursive=True)
+                        if os.sep + "cache" + os.sep not in path)[:args.limit]
+        if not images:
+            print(f"No PNG screenshots found under {args.images}; pass --url to capture a page instead")
+            return 1
+        print(f"Re-encoding {len(images)} screenshot(s) from {args.images}")
+        rows = bench_offline(profiles, images)
+    print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Time-to-first-window benchmark for the GUI.
+
+Starts the application in fresh interpreters and measures the time from
+interpreter start-up to the main window being shown, with platforms loaded
+lazily (the normal start-up) and with every automation module and report
+generator imported up front (how the GUI used to start).
+
+Example:
+    python bench_startup.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("selenium", "webdriver_manager", "reportlab", "PIL", "numpy", "aiohttp", "requests", "bs4")
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+if {eager}:
+    import importlib
+    from automation.registry import PLATFORMS
+    for info in PLATFORMS.values():
+        importlib.import_module(info["module"])
+    import reports.report_generator, reports.html_report
+from PyQt5.QtWidgets import QApplication
+import main
+app = QApplication(sys.argv[:1])
+window = main.SocialMediaEvidenceTool()
+window.show()
+app.processEvents()
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def measure(eager):
+    """Seconds to first window and the heavy modules loaded by then, in a new interpreter"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    output = subprocess.run([sys.executable, "-c", _PROBE.format(eager=eager, heavy=HEAVY_MODULES)],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                            capture_output=True, text=True, check=True).stdout.split()
+    return float(output[0]), output[1] if len(output) > 1 else ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure GUI time-to-first-window with lazy and eager platform loading")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters started per variant")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for label, eager in (("eager imports", True), ("lazy registry", False)):
+        timings = []
+        for _ in range(args.runs):
+            seconds, loaded = measure(eager)
+            timings.append(seconds)
+        results[label] = statistics.median(timings)
+        print(f"{label:<14} median {results[label] * 1000:7.0f} ms, min {min(timings) * 1000:7.0f} ms  "
+              f"(loaded before window: {loaded or 'none'})")
+    saved = results["eager imports"] - results["lazy registry"]
+    print(f"Time to first window reduced by {saved * 1000:.0f} ms ({saved / results['eager imports']:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
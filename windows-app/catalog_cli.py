@@ -0,0 +1,82 @@
+"""Evidence catalog command line.
+
+Imports existing per-run metadata JSON files into the SQLite catalog and
+answers questions across runs without opening them one by one.
+
+Examples:
+    python catalog_cli.py import data
+    python catalog_cli.py runs --platform reddit --target spez --since 2025-05-01
+    python catalog_cli.py posts --platform mastodon --author alice@mastodon.social --text election
+    python catalog_cli.py blob 3f2a...e9  # every run that captured this screenshot
+"""
+import argparse
+import json
+import sys
+
+import config
+from automation.catalog import Catalog
+
+
+def _print_rows(rows, columns, as_json, out=sys.stdout):
+    if as_json:
+        json.dump(rows, out, indent=2, default=str)
+        print(file=out)
+        return
+    for row in rows:
+        print("  ".join(str(row.get(column) if row.get(column) is not None else "-") for column in columns), file=out)
+    print(f"{len(rows)} row(s)", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the evidence catalog")
+    parser.add_argument("--db", default=config.CATALOG_DB, help="Catalog database file")
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true", help="Print results as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Import existing <data>/<platform>/*.json metadata files")
+    importer.add_argument("root", nargs="?", default=config.DATA_DIR, help="Data directory to scan")
+
+    runs = commands.add_parser("runs", parents=[output], help="List extraction runs")
+    runs.add_argument("--platform")
+    runs.add_argument("--target")
+    runs.add_argument("--type", dest="data_type")
+    runs.add_argument("--since", help="Earliest capture time, e.g. 2025-05-01")
+    runs.add_argument("--until", help="Capture time upper bound (exclusive)")
+    runs.add_argument("--limit", type=int)
+    runs.add_argument("--screenshots", action="store_true", help="Also list each run's screenshots")
+
+    posts = commands.add_parser("posts", parents=[output], help="List captured posts")
+    posts.add_argument("--platform")
+    posts.add_argument("--author")
+    posts.add_argument("--since", help="Earliest post time, e.g. 2025-05-01")
+    posts.add_argument("--until", help="Post time upper bound (exclusive)")
+    posts.add_argument("--text", help="Substring the post text must contain")
+    posts.add_argument("--limit", type=int)
+
+    blob = commands.add_parser("blob", parents=[output], help="Runs that captured the screenshot with this SHA-256")
+    blob.add_argument("sha256")
+
+    args = parser.parse_args(argv)
+    catalog = Catalog(args.db)
+
+    if args.command == "import":
+        imported, skipped = catalog.import_tree(args.root)
+        print(f"Imported {imported} run(s), skipped {skipped} (already cataloged or unreadable)")
+    elif args.command == "runs":
+        rows = catalog.find_runs(args.platform, args.target, args.data_type, args.since, args.until, args.limit)
+        if args.screenshots:
+            for row in rows:
+                row["screenshots"] = catalog.screenshots(row["id"])
+        _print_rows(rows, ["captured_at", "platform", "target", "data_type", "source", "metadata_file"], args.json)
+    elif args.command == "posts":
+        rows = catalog.find_posts(args.platform, args.author, args.since, args.until, args.text, args.limit)
+        _print_rows(rows, ["posted_at", "platform", "author", "post_id", "permalink"], args.json)
+    elif args.command == "blob":
+        rows = catalog.runs_with_blob(args.sha256.lower())
+        _print_rows(rows, ["captured_at", "platform", "target", "data_type", "metadata_file"], args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
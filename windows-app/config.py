@@ -11,4 +11,77 @@ INSTAGRAM_PASSWORD = os.getenv("INSTAGRAM_PASSWORD", "")
 # Other configuration settings
 SCREENSHOTS_DIR = "screenshots"
 LOGS_DIR = "logs"
-DATA_DIR = "data" 
\ No newline at end of file
+DATA_DIR = "data"
+
+# WebDriver pool settings
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "2"))  # Maximum browsers alive at once
+DRIVER_POOL_WARM = int(os.getenv("DRIVER_POOL_WARM", "0"))  # Browsers started ahead of the first lease
+DRIVER_MAX_PAGES = int(os.getenv("DRIVER_MAX_PAGES", "50"))  # Pages served before a browser is recycled
+DRIVER_ACQUIRE_TIMEOUT = int(os.getenv("DRIVER_ACQUIRE_TIMEOUT", "300"))  # Seconds to wait for a free browser
+
+# ChromeDriver resolution settings
+DRIVERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "drivers")  # Bundled with the repository
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH", "")  # Explicit driver binary, used as is
+CHROMEDRIVER_DIRS = [d for d in os.getenv("CHROMEDRIVER_DIRS", "").split(os.pathsep) if d]  # Extra folders searched before PATH
+CHROMEDRIVER_CACHE_DIR = os.getenv("CHROMEDRIVER_CACHE_DIR", os.path.join(DRIVERS_DIR, "cache"))  # Drivers kept per Chrome major version
+CHROMEDRIVER_DOWNLOAD = os.getenv("CHROMEDRIVER_DOWNLOAD", "false").lower() in ("1", "true", "yes")  # Allow webdriver-manager downloads
+CHROME_BINARY = os.getenv("CHROME_BINARY", "")  # Chrome executable used to read the installed version
+
+# Screenshot capture settings
+CAPTURE_MODE = os.getenv("CAPTURE_MODE", "full_page")  # "full_page" (one CDP capture) or "viewport" (scroll screenshots)
+BLOB_DIR = os.getenv("BLOB_DIR", os.path.join(SCREENSHOTS_DIR, "blobs"))  # Content-addressed screenshot store (sha256 fan-out)
+DEDUP_THRESHOLD = int(os.getenv("DEDUP_THRESHOLD", "4"))  # Max pHash bit distance for a frame to count as a duplicate
+CAPTURE_PROFILE = os.getenv("CAPTURE_PROFILE", "png")  # png, png_optimized, webp_lossless, webp or jpeg (see automation/encoding.py)
+CAPTURE_QUALITY = int(os.getenv("CAPTURE_QUALITY", "0"))  # Quality for the lossy webp/jpeg profiles (0 = profile default)
+CAPTURE_SCALE = float(os.getenv("CAPTURE_SCALE", "1"))  # Device scale factor of captures (0.5 halves width and height)
+SCREENSHOT_WRITERS = int(os.getenv("SCREENSHOT_WRITERS", "2"))  # Background threads hashing and writing captures
+SCREENSHOT_QUEUE_SIZE = int(os.getenv("SCREENSHOT_QUEUE_SIZE", "8"))  # Captures waiting for a writer before capture blocks
+SCREENSHOT_FSYNC = os.getenv("SCREENSHOT_FSYNC", "true").lower() in ("1", "true", "yes")  # fsync written screenshots at each flush
+
+# Infinite-scroll settings
+SCROLL_MAX_STEPS = int(os.getenv("SCROLL_MAX_STEPS", "30"))  # Hard cap on scroll steps per page
+SCROLL_STABLE_POLLS = int(os.getenv("SCROLL_STABLE_POLLS", "3"))  # Stop after this many scrolls without new content
+SCROLL_TIME_BUDGET = float(os.getenv("SCROLL_TIME_BUDGET", "60"))  # Seconds spent scrolling one page at most
+SCROLL_TARGET_POSTS = int(os.getenv("SCROLL_TARGET_POSTS", "0"))  # Stop once this many posts are loaded (0 = no target)
+
+# HTTP API settings
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "8"))  # Keep-alive connections per host
+REDDIT_BASE_URL = os.getenv("REDDIT_BASE_URL", "https://www.reddit.com")
+REDDIT_API_MAX_ITEMS = int(os.getenv("REDDIT_API_MAX_ITEMS", "1000"))  # Items fetched per listing (Reddit stops near 1000)
+MASTODON_API_SCHEME = os.getenv("MASTODON_API_SCHEME", "https")
+MASTODON_API_MAX_ITEMS = int(os.getenv("MASTODON_API_MAX_ITEMS", "800"))  # Statuses fetched per timeline
+EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "browser")  # "browser" or "api" for platforms with a public API
+
+# Incremental capture settings
+INCREMENTAL_CAPTURE = os.getenv("INCREMENTAL_CAPTURE", "true").lower() in ("1", "true", "yes")  # Stop at content captured by the previous run
+CATALOG_DB = os.getenv("CATALOG_DB", os.path.join(DATA_DIR, "catalog.sqlite3"))  # SQLite index of runs, screenshots and posts
+WATERMARK_FILE = os.getenv("WATERMARK_FILE", os.path.join(DATA_DIR, "watermarks.json"))  # Newest post seen per target
+
+# PDF report settings
+REPORT_IMAGE_DPI = int(os.getenv("REPORT_IMAGE_DPI", "150"))  # Resolution images are downscaled to for printing
+REPORT_IMAGE_FORMAT = os.getenv("REPORT_IMAGE_FORMAT", "JPEG")  # "JPEG" or "PNG" for the embedded copies
+REPORT_IMAGE_QUALITY = int(os.getenv("REPORT_IMAGE_QUALITY", "85"))  # JPEG quality of the embedded copies
+REPORT_IMAGE_WORKERS = int(os.getenv("REPORT_IMAGE_WORKERS", "0"))  # Downscaling processes (0 = one per CPU)
+REPORT_IMAGE_CACHE_DIR = os.getenv("REPORT_IMAGE_CACHE_DIR", os.path.join("reports", "cache"))  # Keyed by source sha256 and size
+REPORT_TALL_RATIO = float(os.getenv("REPORT_TALL_RATIO", "0.8"))  # Height/width above which images are tiled, not fitted to the box
+REPORT_STREAMING_THRESHOLD = int(os.getenv("REPORT_STREAMING_THRESHOLD", "200"))  # Images above which reports are streamed page by page
+REPORT_VOLUME_MAX_PAGES = int(os.getenv("REPORT_VOLUME_MAX_PAGES", "500"))  # Pages per streamed PDF volume
+REPORT_VOLUME_MAX_MB = int(os.getenv("REPORT_VOLUME_MAX_MB", "200"))  # Embedded image data per streamed PDF volume
+REPORT_CASE_DIR = os.getenv("REPORT_CASE_DIR", os.path.join("reports", "cases"))  # Append-only case report per target
+
+# HTML report settings
+HTML_THUMBNAIL_WIDTH = int(os.getenv("HTML_THUMBNAIL_WIDTH", "320"))  # Thumbnail width in pixels
+HTML_THUMBNAIL_MAX_HEIGHT = int(os.getenv("HTML_THUMBNAIL_MAX_HEIGHT", "1600"))  # Tall captures are scaled down to this height
+
+# Tracing settings
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "true").lower() in ("1", "true", "yes")  # Write a timing trace per extraction
+TRACE_DIR = os.getenv("TRACE_DIR", os.path.join(LOGS_DIR, "traces"))  # Chrome trace-event JSON files
+
+# Logging settings
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FILE = os.getenv("LOG_FILE", os.path.join(LOGS_DIR, "evidence_tool.log"))  # Shared by all platforms and runs
+LOG_ROTATION = os.getenv("LOG_ROTATION", "size")  # "size" (LOG_MAX_MB per file) or "time" (LOG_ROTATE_WHEN)
+LOG_MAX_MB = int(os.getenv("LOG_MAX_MB", "10"))  # Size at which the log file is rotated
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")  # TimedRotatingFileHandler interval, e.g. "midnight" or "H"
+LOG_BACKUPS = int(os.getenv("LOG_BACKUPS", "5"))  # Rotated log files kept
+LOG_JSON = os.getenv("LOG_JSON", "false").lower() in ("1", "true", "yes")  # Also write JSON lines next to LOG_FILE, extension replaced by .jsonl (app.log -> app.jsonl)
@@ -0,0 +1,98 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from automation.progress import ProgressReporter, ExtractionCancelled
+from automation.tracing import trace_run
+from automation.log_setup import log_context, new_run_id
+import logging
+
+# Share of the progress bar covered by each phase (start, end)
+PHASE_RANGES = {
+    "driver": (0, 10),
+    "navigate": (10, 20),
+    "consent": (20, 25),
+    "capture": (25, 80),
+    "metadata": (80, 85),
+    "report": (85, 100),
+}
+
+PHASE_LABELS = {
+    "driver": "Starting browser",
+    "navigate": "Navigating",
+    "consent": "Handling consent dialogs",
+    "capture": "Capturing",
+    "metadata": "Saving metadata",
+    "report": "Building PDF",
+}
+
+
+class ExtractionFailed(Exception):
+    """Expected failure of an extraction job (shown as a warning, not a crash)"""
+
+
+class ExtractionWorker(QThread):
+    """Runs one extraction job off the GUI thread.
+
+    ``job`` is a callable taking a ProgressReporter and returning a result
+    object; ``automation`` is the automation instance the job drives, so its
+    browser can be released when the job is cancelled. ``name`` labels the
+    timing trace written for the run; ``platform`` and a fresh run id are
+    attached to everything the job logs.
+    """
+    progress = pyqtSignal(int, str)
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str, bool)  # message, expected failure
+    cancelled = pyqtSignal()
+
+    def __init__(self, job, automation=None, parent=None, name="extraction", platform=None):
+        super().__init__(parent)
+        self.job = job
+        self.automation = automation
+        self.name = name
+        self.platform = platform
+        self.reporter = ProgressReporter(self._on_phase)
+        self._percent = 0
+
+    def cancel(self):
+        """Ask the job to stop at its next phase boundary"""
+        self.reporter.cancel()
+
+    def _on_phase(self, phase, message, step, total):
+        start, end = PHASE_RANGES.get(phase, (self._percent, self._percent))
+        percent = start
+        if step and total:
+            percent = start + (end - start) * min(step, total) / total
+        # Never move the bar backwards when a phase repeats (e.g. several navigations)
+        self._percent = max(self._percent, int(percent))
+        label = PHASE_LABELS.get(phase, phase.title())
+        if step and total:
+            label = f"{label} ({step}/{total})"
+        self.progress.emit(self._percent, f"{label}: {message}" if message else label)
+
+    def run(self):
+        previous = None
+        if self.automation is not None:
+            previous = self.automation.progress
+            self.automation.progress = self.reporter
+        try:
+            with log_context(platform=self.platform, run=new_run_id()), trace_run(self.name):
+                result = self.job(self.reporter)
+            self.progress.emit(100, "Done")
+            self.succeeded.emit(result)
+        except ExtractionCancelled:
+            logging.info("Extraction cancelled by user")
+            self._release_browser()
+            self.cancelled.emit()
+        except ExtractionFailed as e:
+            self.failed.emit(str(e), True)
+        except Exception as e:
+            logging.error(f"Extraction job failed: {str(e)}")
+            self.failed.emit(str(e), False)
+        finally:
+            if self.automation is not None:
+                self.automation.progress = previous
+
+    def _release_browser(self):
+        try:
+            if self.automation is not None:
+                self.automation.close()
+        except Exception as e:
+            logging.warning(f"Failed to release browser after cancel: {str(e)}")
@@ -1,14 +1,16 @@
 import sys
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QFormLayout, 
                              QPushButton, QComboBox, QLabel, QLineEdit, QMessageBox,
-                             QGroupBox, QHBoxLayout, QRadioButton, QCheckBox)
+                             QGroupBox, QHBoxLayout, QRadioButton, QCheckBox, QProgressBar)
 from PyQt5.QtCore import Qt
-from automation.facebook_automation import FacebookAutomation
-from automation.instagram_automation import InstagramAutomation
-from automation.reddit_automation import RedditAutomation
-from automation.mastodon_automation import MastodonAutomation
-from reports.report_generator import ReportGenerator
+from automation.registry import PlatformRegistry, platform_info
+from automation.progress import ExtractionCancelled
+from automation.blob_store import get_blob_store
+from extraction_worker import ExtractionWorker, ExtractionFailed
+from automation.log_setup import configure_logging
+from automation.chromedriver import preload_chromedriver
 import os
+import config
 
 class SocialMediaEvidenceTool(QMainWindow):
     def __init__(self):
@@ -16,11 +18,10 @@ class SocialMediaEvidenceTool(QMainWindow):
         self.setWindowTitle("Social Media Evidence Tool")
         self.setGeometry(100, 100, 1000, 800)
         
-        self.facebook_automation = None
-        self.instagram_automation = None
-        self.reddit_automation = None
-        self.mastodon_automation = None
-        self.report_generator = ReportGenerator()
+        self.platforms = PlatformRegistry()
+        self._report_generator = None
+        self._html_report_generator = None
+        self.worker = None
         
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -95,6 +96,18 @@ class SocialMediaEvidenceTool(QMainWindow):
         self.save_as_pdf_checkbox = QCheckBox("Save as PDF Report")
         self.save_as_pdf_checkbox.setChecked(False)
         output_layout.addWidget(self.save_as_pdf_checkbox)
+        self.case_report_checkbox = QCheckBox("Append to the target's case report instead of a new PDF")
+        self.case_report_checkbox.setChecked(False)
+        output_layout.addWidget(self.case_report_checkbox)
+        self.save_as_html_checkbox = QCheckBox("Save as HTML Report")
+        self.save_as_html_checkbox.setChecked(False)
+        output_layout.addWidget(self.save_as_html_checkbox)
+        self.api_mode_checkbox = QCheckBox("Use public API instead of the browser (Reddit, Mastodon)")
+        self.api_mode_checkbox.setChecked(config.EXTRACTION_MODE == "api")
+        output_layout.addWidget(self.api_mode_checkbox)
+        self.incremental_checkbox = QCheckBox("Only capture content newer than the last run (Reddit, Mastodon)")
+        self.incremental_checkbox.setChecked(config.INCREMENTAL_CAPTURE)
+        output_layout.addWidget(self.incremental_checkbox)
         output_group.setLayout(output_layout)
         main_layout.addWidget(output_group)
         
@@ -106,9 +119,22 @@ class SocialMediaEvidenceTool(QMainWindow):
         self.clear_button = QPushButton("Clear")
         self.clear_button.clicked.connect(self.clear_inputs)
         self.clear_button.setMinimumHeight(40)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_extraction)
+        self.cancel_button.setMinimumHeight(40)
+        self.cancel_button.setEnabled(False)
         button_layout.addWidget(self.extract_button)
+        button_layout.addWidget(self.cancel_button)
         button_layout.addWidget(self.clear_button)
         main_layout.addLayout(button_layout)
+        
+        # Progress display
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.status_label = QLabel("Ready")
+        main_layout.addWidget(self.progress_bar)
+        main_layout.addWidget(self.status_label)
         main_layout.addStretch()
         
         self.public_radio.toggled.connect(self.toggle_input_fields)
@@ -122,6 +148,7 @@ class SocialMediaEvidenceTool(QMainWindow):
         QGroupBox::title { subcontrol-origin: margin; subcontrol-position: top left; padding: 0 5px; }
         QPushButton { background-color: #007ACC; color: white; border-radius: 5px; padding: 8px 16px; }
         QPushButton:hover { background-color: #005EA6; }
+        QPushButton:disabled { background-color: #9BBBD4; }
         QComboBox, QLineEdit { padding: 4px; border: 1px solid #999; border-radius: 3px; }
         """)
 
@@ -138,298 +165,279 @@ class SocialMediaEvidenceTool(QMainWindow):
         
     def on_platform_changed(self, platform):
         self.data_combo.clear()
-        if platform in ["Facebook", "Instagram"]:
-            self.data_combo.addItems([
-                "Posts",
-                "Messages",
-                "Timeline",
-                "Friends List",
-                "Account Info"
-            ])
+        info = platform_info(platform)
+        if info:
+            self.data_combo.addItems(info["data_types"])
         elif platform == "Twitter":
             self.data_combo.addItems([
                 "Tweets",
                 "Timeline",
                 "Account Info"
             ])
-        elif platform == "Reddit":
-            self.data_combo.addItems([
-                "User Profile",
-                "User Posts",
-                "Subreddit"
-            ])
-        elif platform == "Mastodon":
-            self.data_combo.addItems([
-                "User Profile",
-                "User Posts",
-                "Hashtag"
-            ])
-            
+
     def clear_inputs(self):
         self.profile_id_input.clear()
         self.username_input.clear()
         self.password_input.clear()
         self.target_profile_input.setText("me")
         self.data_combo.setCurrentIndex(0)
-        
-    def _generate_pdf_if_requested(self, platform, username, data_type, screenshot_paths):
-        """Generate PDF report if the checkbox is selected"""
-        if self.save_as_pdf_checkbox.isChecked():
-            try:                # Ensure screenshot_paths is a list
-                if isinstance(screenshot_paths, str):
-                    screenshot_paths = [screenshot_paths]
-                elif isinstance(screenshot_paths, dict):
-                    # Extract all screenshots from the result dict
-                    paths = []
-                    
-                    # First, handle the profile screenshot (always want this first)
-                    if "profile" in screenshot_paths and isinstance(screenshot_paths["profile"], str):
-                        paths.append(screenshot_paths["profile"])
-                    
-                    # Next, check for posts_all which contains all post screenshots
-                    if "posts_all" in screenshot_paths and isinstance(screenshot_paths["posts_all"], list):
-                        paths.extend(screenshot_paths["posts_all"])
-                    
-                    # Next, check for numbered posts (posts_1, posts_2, etc.)
-                    for i in range(1, 10):  # Look for up to 10 numbered posts
-                        key = f"posts_{i}"
-                        if key in screenshot_paths and isinstance(screenshot_paths[key], str):
-                            paths.append(screenshot_paths[key])
-                    
-                    # Finally, add any other string values that might be screenshots
-                    for key, value in screenshot_paths.items():
-                        if isinstance(value, str) and key not in ["profile", "metadata"] and not key.startswith("posts_"):
-                            paths.append(value)
-                            
-                    screenshot_paths = paths
-                
-                # Filter out None values, ensure files exist, and only include image files
-                valid_screenshots = []
-                image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.bmp']
-                
-                for path in screenshot_paths:
-                    if path and os.path.exists(path):
-                        # Check if the file has an image extension
-                        _, ext = os.path.splitext(path.lower())
-                        if ext in image_extensions:
-                            valid_screenshots.append(path)
-                
+
+    @property
+    def report_generator(self):
+        """PDF generator, created (and reportlab imported) on first use"""
+        if self._report_generator is None:
+            from reports.report_generator import ReportGenerator
+            self._report_generator = ReportGenerator()
+        return self._report_generator
+
+    @property
+    def html_report_generator(self):
+        if self._html_report_generator is None:
+            from reports.html_report import HtmlReportGenerator
+            self._html_report_generator = HtmlReportGenerator()
+        return self._html_report_generator
+
+    def _collect_screenshots(self, screenshot_paths):
+        """Existing screenshot image paths from an automation result, in report order"""
+        # Ensure screenshot_paths is a list
+        if isinstance(screenshot_paths, str):
+            screenshot_paths = [screenshot_paths]
+        elif isinstance(screenshot_paths, dict):
+            # Extract all screenshots from the result dict
+            paths = []
+
+            # First, handle the profile screenshot (always want this first)
+            if "profile" in screenshot_paths and isinstance(screenshot_paths["profile"], str):
+                paths.append(screenshot_paths["profile"])
+
+            # Next, check for posts_all which contains all post screenshots
+            if "posts_all" in screenshot_paths and isinstance(screenshot_paths["posts_all"], list):
+                paths.extend(screenshot_paths["posts_all"])
+
+            # Next, check for numbered posts (posts_1, posts_2, etc.)
+            for i in range(1, 10):  # Look for up to 10 numbered posts
+                key = f"posts_{i}"
+                if key in screenshot_paths and isinstance(screenshot_paths[key], str):
+                    paths.append(screenshot_paths[key])
+
+            # Finally, add any other string values that might be screenshots
+            for key, value in screenshot_paths.items():
+                if isinstance(value, str) and key not in ["profile", "metadata"] and not key.startswith("posts_"):
+                    paths.append(value)
+
+            screenshot_paths = paths
+
+        # Filter out None values and repeated paths, ensure files exist, and only include image files
+        valid_screenshots = []
+        image_extensions = ['.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp']
+
+        for path in screenshot_paths:
+            path = get_blob_store().resolve(path)  # sha256: references as well as paths
+            if path and path not in valid_screenshots and os.path.exists(path):
+                # Check if the file has an image extension
+                _, ext = os.path.splitext(path.lower())
+                if ext in image_extensions:
+                    valid_screenshots.append(path)
+        return valid_screenshots
+
+    def _generate_pdf_if_requested(self, save_pdf, platform, username, data_type, screenshot_paths, progress=None):
+        """Generate PDF report if requested; returns (pdf_path, warning)
+
+        ``save_pdf`` is False, "new" for a stand-alone report or "case" to
+        append the capture to the target's case report.
+        """
+        if save_pdf:
+            try:
+                valid_screenshots = self._collect_screenshots(screenshot_paths)
                 if valid_screenshots:
-                    pdf_path = self.report_generator.generate_report(platform, username, data_type, valid_screenshots)
-                    return pdf_path
+                    if save_pdf == "case":
+                        pdf_path = self.report_generator.append_to_case(platform, username, data_type, valid_screenshots, progress=progress)
+                    else:
+                        pdf_path = self.report_generator.generate_report(platform, username, data_type, valid_screenshots, progress=progress)
+                    if isinstance(pdf_path, list):
+                        # Large reports are split into volumes
+                        pdf_path = "\n".join(pdf_path)
+                    return pdf_path, None
                 else:
-                    QMessageBox.warning(self, "PDF Warning", "No valid screenshot images found to include in PDF")
-                    return None
+                    return None, "No valid screenshot images found to include in PDF"
+            except ExtractionCancelled:
+                raise
             except Exception as e:
-                QMessageBox.warning(self, "PDF Error", f"Failed to generate PDF: {str(e)}")
-                return None
-        return None
-        
+                return None, f"Failed to generate PDF: {str(e)}"
+        return None, None
+
+    def _generate_html_if_requested(self, save_html, platform, username, data_type, result, progress=None):
+        """Generate the HTML report if requested; returns (html_path, warning)"""
+        if save_html:
+            try:
+                screenshots = self._collect_screenshots(result)
+                metadata_file = result.get("metadata") if isinstance(result, dict) else None
+                if screenshots or metadata_file:
+                    return self.html_report_generator.generate_report(platform, username, data_type, screenshots,
+                                                                      progress=progress, metadata_file=metadata_file), None
+                return None, "No screenshots or records found to include in the HTML report"
+            except ExtractionCancelled:
+                raise
+            except Exception as e:
+                return None, f"Failed to generate HTML report: {str(e)}"
+        return None, None
+
+    def _finish_job(self, save_pdf, save_html, platform, username, data_type, result, progress, details, details_no_pdf=None):
+        """Generate the optional PDF and HTML reports and build the success message for a job"""
+        pdf_path, warning = self._generate_pdf_if_requested(save_pdf, platform, username, data_type, result, progress)
+        html_path, html_warning = self._generate_html_if_requested(save_html, platform, username, data_type, result, progress)
+        if pdf_path:
+            message = f"Data extracted successfully!\n{details}\nPDF Report: {pdf_path}"
+        else:
+            message = f"Data extracted successfully!\n{details_no_pdf or details}"
+        if html_path:
+            message += f"\nHTML Report: {html_path}"
+        return {"message": message, "warning": "\n".join(filter(None, [warning, html_warning])) or None}
+
+    def _result_details(self, result, label, screenshot):
+        """Summary lines for a dict result from a feed capture"""
+        if result.get("records") and not screenshot:
+            return f"Records: {result['records']}\nMetadata: {result['metadata']}"
+        details = f"{label}: {screenshot}\nPosts screenshot: {result['posts']}"
+        if result.get("records"):
+            details += f"\nRecords: {result['records']}"
+        return details
+
     def extract_data(self):
+        if self.worker and self.worker.isRunning():
+            return
         platform = self.platform_combo.currentText()
         data_type = self.data_combo.currentText()
         
         try:
-            if platform == "Facebook":
-                if self.public_radio.isChecked():
-                    profile_id = self.profile_id_input.text()
-                    if not profile_id:
-                        QMessageBox.warning(self, "Error", "Please enter a Profile ID/Username")
-                        return
-                    
-                    if not self.facebook_automation:
-                        self.facebook_automation = FacebookAutomation()
-                    
-                    screenshot_path = self.facebook_automation.extract_public_profile(profile_id, data_type)
-                    if screenshot_path:
-                        # Generate PDF if requested
-                        pdf_path = self._generate_pdf_if_requested(platform, profile_id, data_type, screenshot_path)
-                        
-                        if pdf_path:
-                            QMessageBox.information(self, "Success", f"Data extracted successfully!\nScreenshot: {screenshot_path}\nPDF Report: {pdf_path}")
-                        else:
-                            QMessageBox.information(self, "Success", f"Data extracted successfully!\nSaved to: {screenshot_path}")
-                    else:
-                        QMessageBox.warning(self, "Error", "Failed to extract data")
-                else:
-                    username = self.username_input.text()
-                    password = self.password_input.text()
-                    target_profile = self.target_profile_input.text() or "me"
-                    
-                    if not username or not password:
-                        QMessageBox.warning(self, "Error", "Please enter both username and password")
-                        return
-                    
-                    if not target_profile:
-                        QMessageBox.warning(self, "Error", "Please enter a Target Profile ID/Username")
-                        return
-                    
-                    if not self.facebook_automation:
-                        self.facebook_automation = FacebookAutomation()
-                    
-                    if self.facebook_automation.login(username, password):
-                        screenshot_path = self.facebook_automation.extract_authorized_data(data_type, target_profile)
-                        if screenshot_path:
-                            # Generate PDF if requested
-                            pdf_path = self._generate_pdf_if_requested(platform, target_profile, data_type, screenshot_path)
-                            
-                            if pdf_path:
-                                QMessageBox.information(self, "Success", f"Data extracted successfully!\nScreenshot: {screenshot_path}\nPDF Report: {pdf_path}")
-                            else:
-                                QMessageBox.information(self, "Success", f"Data extracted successfully!\nSaved to: {screenshot_path}")
-                        else:
-                            QMessageBox.warning(self, "Error", "Failed to extract data")
-                    else:
-                        QMessageBox.warning(self, "Error", "Login failed")
-            
-            elif platform == "Twitter":
-                QMessageBox.information(self, "Info", "Twitter functionality is not yet implemented")
-                return
-            
-            elif platform == "Instagram":
-                if self.public_radio.isChecked():
-                    profile_id = self.profile_id_input.text()
-                    if not profile_id:
-                        QMessageBox.warning(self, "Error", "Please enter a Profile ID/Username")
-                        return
-                    
-                    if not self.instagram_automation:
-                        self.instagram_automation = InstagramAutomation()
-                    
-                    screenshot_path = self.instagram_automation.extract_public_profile(profile_id, data_type)
-                    if screenshot_path:
-                        # Generate PDF if requested
-                        pdf_path = self._generate_pdf_if_requested(platform, profile_id, data_type, screenshot_path)
-                        
-                        if pdf_path:
-                            QMessageBox.information(self, "Success", f"Data extracted successfully!\nScreenshot: {screenshot_path}\nPDF Report: {pdf_path}")
-                        else:
-                            QMessageBox.information(self, "Success", f"Data extracted successfully!\nSaved to: {screenshot_path}")
-                    else:
-                        QMessageBox.warning(self, "Error", "Failed to extract data")
-                else:
-                    username = self.username_input.text()
-                    password = self.password_input.text()
-                    target_profile = self.target_profile_input.text() or "me"
-                    
-                    if not username or not password:
-                        QMessageBox.warning(self, "Error", "Please enter both username and password")
-                        return
-                    
-                    if not target_profile:
-                        QMessageBox.warning(self, "Error", "Please enter a Target Profile ID/Username")
-                        return
-                    
-                    if not self.instagram_automation:
-                        self.instagram_automation = InstagramAutomation()
-                    
-                    if self.instagram_automation.login(username, password):
-                        screenshot_path = self.instagram_automation.extract_authorized_data(data_type, target_profile)
-                        if screenshot_path:
-                            # Generate PDF if requested
-                            pdf_path = self._generate_pdf_if_requested(platform, target_profile, data_type, screenshot_path)
-                            
-                            if pdf_path:
-                                QMessageBox.information(self, "Success", f"Data extracted successfully!\nScreenshot: {screenshot_path}\nPDF Report: {pdf_path}")
-                            else:
-                                QMessageBox.information(self, "Success", f"Data extracted successfully!\nSaved to: {screenshot_path}")
-                        else:
-                            QMessageBox.warning(self, "Error", "Failed to extract data")
-                    else:
-                        QMessageBox.warning(self, "Error", "Login failed")
-            
-            elif platform == "Reddit":
-                if self.public_radio.isChecked():
-                    username = self.profile_id_input.text()
-                    if not username:
-                        QMessageBox.warning(self, "Error", "Please enter a Reddit Username")
-                        return
-                    
-                    if not self.reddit_automation:
-                        self.reddit_automation = RedditAutomation()
-                    
-                    data_type = self.data_combo.currentText()
-                    if data_type == "User Profile" or data_type == "User Posts":
-                        result = self.reddit_automation.extract_public_profile(username)
-                        if result:
-                            # Generate PDF if requested
-                            pdf_path = self._generate_pdf_if_requested(platform, username, data_type, result)
-                            
-                            if pdf_path:
-                                QMessageBox.information(self, "Success", f"Data extracted successfully!\nProfile screenshot: {result['profile']}\nPosts screenshot: {result['posts']}\nPDF Report: {pdf_path}")
-                            else:
-                                QMessageBox.information(self, "Success", f"Data extracted successfully!\nProfile screenshot: {result['profile']}\nPosts screenshot: {result['posts']}")
-                        else:
-                            QMessageBox.warning(self, "Error", "Failed to extract data from Reddit")
-                    elif data_type == "Subreddit":
-                        result = self.reddit_automation.extract_subreddit(username)
-                        if result:
-                            # Generate PDF if requested
-                            pdf_path = self._generate_pdf_if_requested(platform, username, data_type, result)
-                            
-                            if pdf_path:
-                                QMessageBox.information(self, "Success", f"Data extracted successfully!\nSubreddit screenshot: {result['subreddit']}\nPosts screenshot: {result['posts']}\nPDF Report: {pdf_path}")
-                            else:
-                                QMessageBox.information(self, "Success", f"Data extracted successfully!\nSubreddit screenshot: {result['subreddit']}\nPosts screenshot: {result['posts']}")
-                        else:
-                            QMessageBox.warning(self, "Error", "Failed to extract data from Reddit")
-                    else:
-                        QMessageBox.warning(self, "Error", "This data type is not yet implemented for Reddit")
-                        return
-                else:
-                    QMessageBox.information(self, "Info", "Reddit only supports public profile extraction. Please select 'Public Profile' option.")
-                    return
-            
-            elif platform == "Mastodon":
-                if self.public_radio.isChecked():
-                    username = self.profile_id_input.text()
-                    if not username:
-                        QMessageBox.warning(self, "Error", "Please enter a Mastodon Username")
-                        return
-                    
-                    # Additional input for Mastodon instance
-                    instance = "mastodon.social"  # Default instance
-                    
-                    if not self.mastodon_automation:
-                        self.mastodon_automation = MastodonAutomation()
-                    
-                    data_type = self.data_combo.currentText()
-                    if data_type == "User Profile" or data_type == "User Posts":
-                        result = self.mastodon_automation.extract_public_profile(username, instance)
-                    elif data_type == "Hashtag":
-                        result = self.mastodon_automation.extract_hashtag(username, instance)
-                    else:
-                        QMessageBox.warning(self, "Error", "This data type is not yet implemented for Mastodon")
-                        return
-                    
-                    if result:
-                        # Generate PDF if requested
-                        pdf_path = self._generate_pdf_if_requested(platform, username, data_type, result)
-                        
-                        if pdf_path:
-                            QMessageBox.information(self, "Success", f"Data extracted successfully!\nProfile screenshot: {result['profile']}\nPosts screenshot: {result['posts']}\nPDF Report: {pdf_path}")
-                        else:
-                            QMessageBox.information(self, "Success", f"Data extracted successfully!\nProfile screenshot: {result['profile']}\nPosts screenshot: {result['posts']}")
-                    else:
-                        QMessageBox.warning(self, "Error", "Failed to extract data from Mastodon")
-                else:
-                    QMessageBox.information(self, "Info", "Mastodon only supports public profile extraction. Please select 'Public Profile' option.")
-                    return
-                    
-            else:
-                QMessageBox.information(self, "Info", f"{platform} functionality is not yet implemented")
-                
+            job = self._build_job(platform, data_type)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
+            return
+        if job:
+            automation, run = job
+            self._start_worker(run, automation, f"{platform}_{data_type}", platform)
+
+    def _build_job(self, platform, data_type):
+        """Validate the inputs and return (automation, job) or None"""
+        save_pdf = self.save_as_pdf_checkbox.isChecked() and ("case" if self.case_report_checkbox.isChecked() else "new")
+        save_html = self.save_as_html_checkbox.isChecked()
+        mode = "api" if self.api_mode_checkbox.isChecked() else "browser"
+        incremental = self.incremental_checkbox.isChecked()
+
+        info = platform_info(platform)
+        if not info:
+            QMessageBox.information(self, "Info", f"{platform} functionality is not yet implemented")
+            return None
+
+        if self.public_radio.isChecked():
+            target = self.profile_id_input.text()
+            if not target:
+                QMessageBox.warning(self, "Error", f"Please enter a {info['target_label']}")
+                return None
+            automation = self.platforms.get(platform)
+
+            def run(progress):
+                try:
+                    result = automation.extract(target, data_type, mode=mode, incremental=incremental)
+                except ValueError as e:
+                    raise ExtractionFailed(str(e))
+                return self._finish_result(automation, save_pdf, save_html, platform, target, data_type, result, progress)
+            return automation, run
+
+        if not info["authorized"]:
+            QMessageBox.information(self, "Info", f"{platform} only supports public profile extraction. Please select 'Public Profile' option.")
+            return None
+
+        username = self.username_input.text()
+        password = self.password_input.text()
+        target_profile = self.target_profile_input.text() or "me"
+
+        if not username or not password:
+            QMessageBox.warning(self, "Error", "Please enter both username and password")
+            return None
+
+        if not target_profile:
+            QMessageBox.warning(self, "Error", "Please enter a Target Profile ID/Username")
+            return None
+        automation = self.platforms.get(platform)
+
+        def run(progress):
+            if not automation.login(username, password):
+                raise ExtractionFailed("Login failed")
+            result = automation.extract_authorized_data(data_type, target_profile)
+            return self._finish_result(automation, save_pdf, save_html, platform, target_profile, data_type, result, progress)
+        return automation, run
+
+    def _finish_result(self, automation, save_pdf, save_html, platform, target, data_type, result, progress):
+        """Check an adapter's result and finish the job with the matching summary"""
+        if not result:
+            raise ExtractionFailed(f"Failed to extract data from {platform}")
+        if isinstance(result, dict):
+            label, screenshot = automation.page_screenshot(result, data_type)
+            return self._finish_job(save_pdf, save_html, platform, target, data_type, result, progress,
+                                    self._result_details(result, label, screenshot))
+        return self._finish_job(save_pdf, save_html, platform, target, data_type, result, progress,
+                                f"Screenshot: {result}", f"Saved to: {result}")
+
+    def _start_worker(self, run, automation, name="extraction", platform=None):
+        """Run an extraction job on a worker thread"""
+        self.worker = ExtractionWorker(run, automation, self, name, platform)
+        self.worker.progress.connect(self.on_job_progress)
+        self.worker.succeeded.connect(self.on_job_succeeded)
+        self.worker.failed.connect(self.on_job_failed)
+        self.worker.cancelled.connect(self.on_job_cancelled)
+        self.worker.finished.connect(self.on_job_finished)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Starting...")
+        self._set_running(True)
+        self.worker.start()
+
+    def cancel_extraction(self):
+        if self.worker and self.worker.isRunning():
+            self.status_label.setText("Cancelling...")
+            self.cancel_button.setEnabled(False)
+            self.worker.cancel()
+
+    def _set_running(self, running):
+        self.extract_button.setEnabled(not running)
+        self.clear_button.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
+
+    def on_job_progress(self, percent, message):
+        self.progress_bar.setValue(percent)
+        self.status_label.setText(message)
+
+    def on_job_succeeded(self, outcome):
+        if outcome.get("warning"):
+            QMessageBox.warning(self, "PDF Warning", outcome["warning"])
+        QMessageBox.information(self, "Success", outcome["message"])
+
+    def on_job_failed(self, message, expected):
+        self.status_label.setText("Failed")
+        if expected:
+            QMessageBox.warning(self, "Error", message)
+        else:
+            QMessageBox.critical(self, "Error", f"An error occurred: {message}")
+
+    def on_job_cancelled(self):
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Cancelled")
+
+    def on_job_finished(self):
+        self._set_running(False)
+        self.worker = None
 
     def closeEvent(self, event):
-        if self.facebook_automation:
-            self.facebook_automation.close()
-        if self.instagram_automation:
-            self.instagram_automation.close()
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        self.platforms.close_all()
         event.accept()
             
 if __name__ == "__main__":
+    configure_logging()
+    preload_chromedriver()
     app = QApplication(sys.argv)
     window = SocialMediaEvidenceTool()
     window.show()
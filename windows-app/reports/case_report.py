@@ -0,0 +1,187 @@
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject,
+                           TextStringObject)
+import io
+import logging
+import os
+import re
+
+_STARTXREF = re.compile(rb"startxref\s+(\d+)\s+%%EOF\s*$")
+
+
+class CaseReport:
+    """One PDF per target that grows by a section per capture run.
+
+    Sections are added as incremental updates: the bytes of the existing
+    file are kept as they are and only the new pages, the extended page
+    tree and the outline are appended, so earlier pages are never
+    re-rendered and their content stays byte-identical. The PDF outline
+    is the case's table of contents, with one entry per run.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def append_section(self, section_paths, title):
+        """Append the pages of ``section_paths`` under one outline entry; returns its first page index"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as existing:
+                original = existing.read()
+            update, first_page = _IncrementalUpdate(original).build(section_paths, title)
+            with open(temp_path, 'wb') as f:
+                f.write(original)
+                f.write(update)
+        else:
+            writer = PdfWriter()
+            first_page = len(writer.pages)
+            for section_path in section_paths:
+                with open(section_path, 'rb') as f:
+                    writer.append(f, import_outline=False)
+            writer.add_outline_item(title, first_page)
+            with open(temp_path, 'wb') as f:
+                writer.write(f)
+        os.replace(temp_path, self.path)
+        logging.info(f"Appended '{title}' to case report {self.path} at page {first_page + 1}")
+        return first_page
+
+    def sections(self):
+        """Table of contents as ``[(title, first page number)]``"""
+        if not os.path.exists(self.path):
+            return []
+        reader = PdfReader(self.path)
+        return [(item.title, reader.get_destination_page_number(item) + 1)
+                for item in reader.outline if not isinstance(item, list)]
+
+
+class _IncrementalUpdate:
+    """Builds one incremental update section for an existing PDF.
+
+    New objects are numbered from the trailer's ``/Size``, so they can never
+    reuse a number taken by an earlier update, its cross-reference stream
+    included. The section ends with a classic cross-reference table whose
+    ``/Prev`` points at the previous one.
+    """
+    def __init__(self, original):
+        self.original = original
+        self.reader = PdfReader(io.BytesIO(original))
+        self.next_number = int(self.reader.trailer["/Size"])
+        self.objects = {}  # Object number -> (generation, object) written in this update
+
+    def _add(self, obj):
+        number = self.next_number
+        self.next_number += 1
+        self.objects[number] = (0, obj)
+        return IndirectObject(number, 0, None)
+
+    def _replace(self, reference, obj):
+        self.objects[reference.idnum] = (reference.generation, obj)
+
+    def _import(self, value, source, numbers):
+        """Renumber ``value`` and every object it references from ``source`` into this update"""
+        if isinstance(value, IndirectObject):
+            if value.idnum not in numbers:
+                target = source.get_object(value)
+                numbers[value.idnum] = self._add(target)
+                self._import(target, source, numbers)
+            return numbers[value.idnum]
+        if isinstance(value, DictionaryObject):
+            for key, item in list(value.items()):
+                value[key] = self._import(item, source, numbers)
+        elif isinstance(value, ArrayObject):
+            for i, item in enumerate(list(value)):
+                value[i] = self._import(item, source, numbers)
+        return value
+
+    def build(self, section_paths, title):
+        """Return ``(bytes to append, index of the section's first page)``"""
+        catalog_ref = self.reader.trailer.raw_get("/Root")
+        catalog = self.reader.get_object(catalog_ref)
+        pages_ref = catalog.raw_get("/Pages")
+        pages = self.reader.get_object(pages_ref)
+        first_page = int(pages["/Count"])
+
+        new_pages = []
+        for section_path in section_paths:
+            source = PdfReader(section_path)
+            numbers = {}
+            for page_ref in [page.indirect_reference for page in source.pages]:
+                page = source.get_object(page_ref)
+                page.pop(NameObject("/Parent"), None)  # Re-parented under the case's page tree below
+                new_pages.append(self._import(page_ref, source, numbers))
+                page[NameObject("/Parent")] = pages_ref
+        pages[NameObject("/Kids")] = ArrayObject(list(pages.raw_get("/Kids")) + new_pages)
+        pages[NameObject("/Count")] = NumberObject(first_page + len(new_pages))
+        self._replace(pages_ref, pages)
+        if new_pages:
+            self._add_outline_item(catalog_ref, catalog, title, new_pages[0])
+        return self._serialize(catalog_ref), first_page
+
+    def _add_outline_item(self, catalog_ref, catalog, title, page_ref):
+        item = DictionaryObject({
+            NameObject("/Title"): TextStringObject(title),
+            NameObject("/Dest"): ArrayObject([page_ref, NameObject("/Fit")]),
+        })
+        item_ref = self._add(item)
+        outlines_ref = catalog.raw_get("/Outlines") if "/Outlines" in catalog else None
+        if outlines_ref is None:
+            outlines = DictionaryObject({NameObject("/Type"): NameObject("/Outlines")})
+            outlines_ref = self._add(outlines)
+            catalog[NameObject("/Outlines")] = outlines_ref
+            self._replace(catalog_ref, catalog)
+        else:
+            outlines = self.reader.get_object(outlines_ref)
+            self._replace(outlines_ref, outlines)
+        item[NameObject("/Parent")] = outlines_ref
+        if "/Last" in outlines:
+            last_ref = outlines.raw_get("/Last")
+            last = self.reader.get_object(last_ref)
+            last[NameObject("/Next")] = item_ref
+            item[NameObject("/Prev")] = last_ref
+            self._replace(last_ref, last)
+        else:
+            outlines[NameObject("/First")] = item_ref
+        outlines[NameObject("/Last")] = item_ref
+        outlines[NameObject("/Count")] = NumberObject(int(outlines.get("/Count", 0)) + 1)
+
+    def _serialize(self, catalog_ref):
+        match = _STARTXREF.search(self.original[-1024:])
+        if not match:
+            raise ValueError("Existing case report has no startxref; it may be truncated")
+        out = io.BytesIO()
+        out.write(b"\n")
+        offsets = {}
+        for number in sorted(self.objects):
+            generation, obj = self.objects[number]
+            offsets[number] = len(self.original) + out.tell()
+            out.write(f"{number} {generation} obj\n".encode())
+            obj.write_to_stream(out)
+            out.write(b"\nendobj\n")
+
+        xref_offset = len(self.original) + out.tell()
+        out.write(b"xref\n")
+        numbers = sorted(offsets)
+        start = 0
+        while start < len(numbers):
+            end = start
+            while end + 1 < len(numbers) and numbers[end + 1] == numbers[end] + 1:
+                end += 1
+            out.write(f"{numbers[start]} {end - start + 1}\n".encode())
+            for number in numbers[start:end + 1]:
+                out.write(f"{offsets[number]:010d} {self.objects[number][0]:05d} n\r\n".encode())
+            start = end + 1
+
+        trailer = DictionaryObject({
+            NameObject("/Size"): NumberObject(self.next_number),
+            NameObject("/Root"): catalog_ref,
+            NameObject("/Prev"): NumberObject(int(match.group(1))),
+        })
+        for key in ("/Info", "/ID"):
+            if key in self.reader.trailer:
+                trailer[NameObject(key)] = self.reader.trailer.raw_get(key)
+        out.write(b"trailer\n")
+        trailer.write_to_stream(out)
+        out.write(f"\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+        return out.getvalue()
@@ -0,0 +1,172 @@
+from datetime import datetime
+from html import escape
+import json
+import logging
+import os
+import shutil
+import config
+from automation.blob_store import get_blob_store
+from automation.catalog import normalize_record
+from automation.tracing import span
+from reports.image_cache import ImageCache, source_digest
+
+BATCH = 100  # Screenshots thumbnailed ahead of the rows being written
+
+_STYLE = """
+body { font-family: Segoe UI, Helvetica, Arial, sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 2em; }
+th, td { border: 1px solid #ccc; padding: 6px 8px; text-align: left; vertical-align: top; }
+th { background: #f3f3f3; }
+td.hash { font-family: Consolas, monospace; font-size: 12px; word-break: break-all; }
+img.thumb { border: 1px solid #999; }
+#search { width: 100%; padding: 8px; font-size: 16px; margin-bottom: 1em; }
+.hidden { display: none; }
+"""
+
+_SCRIPT = """
+(function () {
+  var index = JSON.parse(document.getElementById("search-index").textContent);
+  var box = document.getElementById("search");
+  var count = document.getElementById("search-count");
+  box.addEventListener("input", function () {
+    var terms = box.value.toLowerCase().split(/\\s+/).filter(Boolean);
+    var shown = 0;
+    index.forEach(function (entry) {
+      var match = terms.every(function (term) { return entry.t.indexOf(term) !== -1; });
+      document.getElementById(entry.id).classList.toggle("hidden", !match);
+      if (match) { shown++; }
+    });
+    count.textContent = terms.length ? shown + " of " + index.length + " rows match" : "";
+  });
+})();
+"""
+
+
+def _link(path, base_dir):
+    """Relative link from the report to a local file"""
+    return escape(os.path.relpath(os.path.abspath(path), base_dir).replace(os.sep, "/"), quote=True)
+
+
+class HtmlReportGenerator:
+    """Self-contained HTML evidence report, written as a stream.
+
+    Rows are written as soon as their thumbnails are ready, so generation
+    time grows with the number of new screenshots only: thumbnails come
+    from the SHA-256 keyed image cache and hashes are read from blob
+    names. The page embeds its CSS, script and search index; thumbnails
+    are copied next to it and link to the full-resolution originals.
+    """
+    def __init__(self, output_dir="reports"):
+        self.output_dir = output_dir
+        self.image_cache = ImageCache()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def generate_report(self, platform, username, data_type, screenshot_paths, progress=None, metadata_file=None):
+        """Write the report and return its path; ``metadata_file`` adds the run's metadata and posts"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(self.output_dir, f"{platform}_{username}_{data_type}_{timestamp}.html")
+        assets_dir = os.path.splitext(filename)[0] + "_files"
+        os.makedirs(assets_dir, exist_ok=True)
+        base_dir = os.path.dirname(os.path.abspath(filename))
+        screenshot_paths = [path for path in map(get_blob_store().resolve, screenshot_paths) if path and os.path.exists(path)]
+        metadata = self._load_metadata(metadata_file)
+        search_index = []
+
+        with open(filename, 'w', encoding='utf-8') as out:
+            title = escape(f"Social Media Evidence Report - {platform}")
+            out.write(f"<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n<title>{title}</title>\n"
+                      f"<style>{_STYLE}</style>\n</head>\n<body>\n<h1>{title}</h1>\n")
+            self._write_table(out, "Report", [
+                ("Platform", platform),
+                ("Username", username),
+                ("Data Type", data_type),
+                ("Date", datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+                ("Screenshots", len(screenshot_paths))
+            ])
+            if metadata:
+                rows = [(key, value if isinstance(value, (str, int, float)) else json.dumps(value))
+                        for key, value in metadata.items() if key not in ("screenshots", "frames")]
+                self._write_table(out, "Run Metadata", [("Metadata file", metadata_file)] + rows)
+            out.write("<input id=\"search\" type=\"search\" placeholder=\"Search screenshots and posts\">\n"
+                      "<p id=\"search-count\"></p>\n")
+
+            self._write_screenshots(out, screenshot_paths, assets_dir, base_dir, search_index, progress)
+            for records_file in filter(None, [metadata.get("posts_file"), metadata.get("records_file")]):
+                self._write_posts(out, platform, records_file, search_index)
+
+            if progress:
+                progress.phase("report", f"Writing {filename}")
+            index_json = json.dumps(search_index, separators=(",", ":")).replace("</", "<\\/")
+            out.write(f"<script type=\"application/json\" id=\"search-index\">{index_json}</script>\n"
+                      f"<script>{_SCRIPT}</script>\n</body>\n</html>\n")
+        logging.info(f"HTML report {filename}: {len(screenshot_paths)} screenshot(s), {len(search_index)} searchable row(s)")
+        return filename
+
+    def _load_metadata(self, metadata_file):
+        if not metadata_file:
+            return {}
+        try:
+            with open(metadata_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read {metadata_file} for the HTML report: {str(e)}")
+            return {}
+
+    def _write_table(self, out, heading, rows):
+        out.write(f"<h2>{escape(heading)}</h2>\n<table>\n")
+        for key, value in rows:
+            out.write(f"<tr><th>{escape(str(key))}</th><td>{escape(str(value))}</td></tr>\n")
+        out.write("</table>\n")
+
+    def _write_screenshots(self, out, screenshot_paths, assets_dir, base_dir, search_index, progress):
+        out.write("<h2>Screenshots</h2>\n<table>\n<tr><th>#</th><th>Screenshot</th><th>File</th>"
+                  "<th>SHA-256</th><th>Size</th></tr>\n")
+        for start in range(0, len(screenshot_paths), BATCH):
+            batch = screenshot_paths[start:start + BATCH]
+            with span("thumbnails", "report", images=len(batch)):
+                thumbs = self.image_cache.thumbnails(batch, config.HTML_THUMBNAIL_WIDTH, config.HTML_THUMBNAIL_MAX_HEIGHT,
+                                                     progress=progress)
+            for number, (path, thumb) in enumerate(zip(batch, thumbs), start + 1):
+                if progress:
+                    progress.phase("report", f"Adding {os.path.basename(path)}", number, len(screenshot_paths))
+                digest = source_digest(path)
+                row_id = f"shot-{number}"
+                original = _link(path, base_dir)
+                if thumb:
+                    thumb_path = os.path.join(assets_dir, os.path.basename(thumb[0]))
+                    if not os.path.exists(thumb_path):
+                        shutil.copyfile(thumb[0], thumb_path)
+                    image = (f"<img class=\"thumb\" src=\"{_link(thumb_path, base_dir)}\" width=\"{thumb[1]}\" "
+                             f"height=\"{thumb[2]}\" loading=\"lazy\" decoding=\"async\" alt=\"Screenshot {number}\">")
+                else:
+                    image = "(no preview)"
+                name = os.path.basename(path)
+                out.write(f"<tr id=\"{row_id}\"><td>{number}</td><td><a href=\"{original}\">{image}</a></td>"
+                          f"<td><a href=\"{original}\">{escape(name)}</a></td><td class=\"hash\">{digest}</td>"
+                          f"<td>{os.path.getsize(path):,} bytes</td></tr>\n")
+                search_index.append({"id": row_id, "t": f"{name} {digest}".lower()})
+        out.write("</table>\n")
+
+    def _write_posts(self, out, platform, records_file, search_index):
+        if not os.path.exists(records_file):
+            logging.warning(f"Post records file not found: {records_file}")
+            return
+        out.write(f"<h2>Posts ({escape(os.path.basename(records_file))})</h2>\n<table>\n"
+                  "<tr><th>Time</th><th>Author</th><th>Text</th><th>Link</th></tr>\n")
+        with open(records_file, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                post = normalize_record(platform, json.loads(line))
+                if not post:
+                    continue
+                row_id = f"post-{len(search_index)}"
+                permalink = post.get("permalink")
+                link = escape(str(post.get("id")))
+                if permalink and permalink.startswith(("https://", "http://")):  # Scraped values never become script URLs
+                    link = f"<a href=\"{escape(permalink, quote=True)}\">{link}</a>"
+                text = post.get("text") or ""
+                out.write(f"<tr id=\"{row_id}\"><td>{escape(str(post.get('timestamp') or ''))}</td>"
+                          f"<td>{escape(str(post.get('author') or ''))}</td><td>{escape(text)}</td><td>{link}</td></tr>\n")
+                search_index.append({"id": row_id, "t": f"{post.get('author') or ''} {text}".lower()})
+        out.write("</table>\n")
@@ -0,0 +1,235 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image
+import hashlib
+import logging
+import math
+import os
+import re
+import config
+from reports.png_bands import image_size, iter_bands
+
+POINTS_PER_INCH = 72
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+_EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png"}
+
+
+def print_size(width_pt, height_pt, dpi=None):
+    """Pixel size of an image printed in a ``width_pt`` x ``height_pt`` box"""
+    dpi = dpi or config.REPORT_IMAGE_DPI
+    return round(width_pt * dpi / POINTS_PER_INCH), round(height_pt * dpi / POINTS_PER_INCH)
+
+
+def source_digest(path):
+    """SHA-256 of an image; blob store files already carry it in their name"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if _DIGEST.match(stem):
+        return stem
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _save(image, target_path, image_format, quality):
+    temp_path = f"{target_path}.{os.getpid()}.tmp"
+    if image_format == "JPEG":
+        image.save(temp_path, "JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(temp_path, "PNG", optimize=True)
+    os.replace(temp_path, target_path)  # Readers never see a half-written cache entry
+
+
+def _render(source_path, target_path, size, image_format, quality):
+    """Resize and re-encode one image (runs in a worker process)"""
+    with Image.open(source_path) as image:
+        image.draft("RGB", size)  # JPEG sources decode straight at a reduced scale
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")  # Screenshots are opaque; JPEG has no alpha channel
+        resized = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+    _save(resized, target_path, image_format, quality)
+    return target_path
+
+
+def _render_tiles(source_path, target_paths, band_rows, width, image_format, quality):
+    """Cut a tall image into bands, decoding one band at a time (runs in a worker process)"""
+    for (top, band), target_path in zip(iter_bands(source_path, band_rows), target_paths):
+        size = (width, max(1, round(band.height * width / band.width)))
+        if band.mode not in ("RGB", "L"):
+            band = band.convert("RGB")
+        _save(band.resize(size, Image.LANCZOS, reducing_gap=3.0), target_path, image_format, quality)
+    return target_paths
+
+
+def _render_thumbnail(source_path, target_path, size, image_format, quality):
+    """Reduce an image to ``size`` one band at a time (runs in a worker process)"""
+    width, height = image_size(source_path)
+    scale = size[1] / height
+    thumbnail = Image.new("RGB", size, "white")
+    band_rows = max(1, (16 * 1024 * 1024) // (width * 4))  # About 16 MB of decoded pixels per band
+    for top, band in iter_bands(source_path, band_rows):
+        y0, y1 = round(top * scale), round((top + band.height) * scale)
+        if y1 > y0:
+            thumbnail.paste(band.convert("RGB").resize((size[0], y1 - y0), Image.LANCZOS, reducing_gap=3.0), (0, y0))
+    _save(thumbnail, target_path, image_format, quality)
+    return target_path
+
+
+_RENDERERS = {"image": _render, "tiles": _render_tiles, "thumbnail": _render_thumbnail}
+
+
+def _run(job):
+    kind, args = job
+    return _RENDERERS[kind](*args)
+
+
+class ImageCache:
+    """Print-resolution copies of report images, cached on disk.
+
+    Screenshots are captured at full screen resolution but printed in a
+    500x300 pt box, so each is fitted inside that box, keeping its aspect
+    ratio, downscaled at REPORT_IMAGE_DPI and re-encoded once. Images
+    taller than REPORT_TALL_RATIO (full-page captures) are printed at the
+    full box width instead and cut into page-sized
+    tiles. Entries are keyed by the source SHA-256 and the target
+    size/encoding, so regenerating a report reuses earlier work; cache
+    misses are rendered in a process pool.
+    """
+    def __init__(self, root=None, dpi=None, image_format=None, quality=None, workers=None):
+        self.root = root or config.REPORT_IMAGE_CACHE_DIR
+        self.dpi = dpi or config.REPORT_IMAGE_DPI
+        self.image_format = (image_format or config.REPORT_IMAGE_FORMAT).upper()
+        self.quality = quality or config.REPORT_IMAGE_QUALITY
+        self.workers = workers or config.REPORT_IMAGE_WORKERS or os.cpu_count() or 1
+        if self.image_format not in _EXTENSIONS:
+            raise ValueError(f"Unsupported report image format: {self.image_format}")
+
+    def path_for(self, digest, size, tile=None):
+        variant = f"{size[0]}x{size[1]}"
+        if tile:
+            variant += f"_t{tile[0]}of{tile[1]}"
+        if self.image_format == "JPEG":
+            variant += f"_q{self.quality}"
+        return os.path.join(self.root, digest[:2], f"{digest}_{variant}{_EXTENSIONS[self.image_format]}")
+
+    def _plan(self, path, width_pt, height_pt, tile_height_pt):
+        """Placements ``[(cache path, width_pt, height_pt)]`` for one image and the job rendering them"""
+        digest = source_digest(path)
+        width, height = image_size(path)
+        if not tile_height_pt or height / width <= config.REPORT_TALL_RATIO:
+            # Fit inside the box without distorting: full width, or full height for narrower images
+            fit_width, fit_height = width_pt, width_pt * height / width
+            if fit_height > height_pt:
+                fit_width, fit_height = height_pt * width / height, height_pt
+            size = tuple(max(1, side) for side in print_size(fit_width, fit_height, self.dpi))
+            target = self.path_for(digest, size)
+            return [(target, fit_width, fit_height)], ("image", (path, target, size, self.image_format, self.quality))
+
+        tile_width = print_size(width_pt, 0, self.dpi)[0]
+        band_rows = max(1, int(tile_height_pt * width / width_pt))
+        count = math.ceil(height / band_rows)
+        placements = []
+        for index in range(count):
+            rows = min(band_rows, height - index * band_rows)
+            placements.append((self.path_for(digest, (tile_width, band_rows), (index + 1, count)),
+                               width_pt, rows * width_pt / width))
+        targets = [target for target, _, _ in placements]
+        return placements, ("tiles", (path, targets, band_rows, tile_width, self.image_format, self.quality))
+
+    def prepare(self, paths, width_pt, height_pt, progress=None, tile_height_pt=None):
+        """Print-ready placements for ``paths`` in the same order.
+
+        Each entry is a list of ``(path, width_pt, height_pt)``: one item for
+        a screenshot fitted inside the box at its aspect ratio, several for a tall image tiled at
+        ``tile_height_pt``. Images that cannot be processed keep their
+        original path so the report still includes them.
+        """
+        prepared = [[(path, width_pt, height_pt)] for path in paths]
+        pending = {}
+        for i, path in enumerate(paths):
+            try:
+                placements, job = self._plan(path, width_pt, height_pt, tile_height_pt)
+            except OSError as e:
+                logging.warning(f"Could not read {path} for the report cache: {str(e)}")
+                continue
+            if len(placements) == 1:
+                prepared[i] = [(path, placements[0][1], placements[0][2])]  # Fallback keeps the fitted size
+            if all(os.path.exists(target) for target, _, _ in placements):
+                prepared[i] = placements
+            else:
+                pending.setdefault(placements[0][0], (job, placements, []))[2].append(i)
+
+        logging.info(f"Report images: {len(paths) - sum(len(entry[2]) for entry in pending.values())} cached, "
+                     f"{len(pending)} to render")
+        self._render_pending(pending, paths, prepared, progress)
+        return prepared
+
+    def thumbnails(self, paths, max_width, max_height, progress=None):
+        """``(path, width, height)`` of a cached thumbnail per image, None where it failed.
+
+        Thumbnails keep the aspect ratio and fit ``max_width`` x ``max_height``
+        pixels; tall PNGs are reduced band by band.
+        """
+        thumbs = [None] * len(paths)
+        pending = {}
+        for i, path in enumerate(paths):
+            try:
+                width, height = image_size(path)
+                scale = min(max_width / width, max_height / height, 1)
+                size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                target = self.path_for(source_digest(path), size)
+            except OSError as e:
+                logging.warning(f"Could not read {path} for a thumbnail: {str(e)}")
+                continue
+            if os.path.exists(target):
+                thumbs[i] = (target, size[0], size[1])
+            else:
+                job = ("thumbnail", (path, target, size, self.image_format, self.quality))
+                pending.setdefault(target, (job, (target, size[0], size[1]), []))[2].append(i)
+        self._render_pending(pending, paths, thumbs, progress)
+        return thumbs
+
+    def _render_pending(self, pending, paths, results, progress):
+        """Run ``{key: (job, result, indices)}`` and fill ``results`` for the jobs that succeed"""
+        if not pending:
+            return
+        for _, result, _ in pending.values():
+            target = result[0][0] if isinstance(result, list) else result[0]
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+        done = 0
+
+        def finished(key, error=None):
+            nonlocal done
+            done += 1
+            job, result, indices = pending[key]
+            if error:
+                logging.warning(f"Could not downscale {paths[indices[0]]}: {str(error)}")
+            else:
+                for index in indices:
+                    results[index] = result
+            if progress:
+                progress.phase("report", f"Downscaling images ({done}/{len(pending)})", done, len(pending))
+
+        if len(pending) == 1 or self.workers == 1:
+            # Not worth starting worker processes
+            for key, (job, _, _) in pending.items():
+                try:
+                    _run(job)
+                    finished(key)
+                except Exception as e:
+                    finished(key, e)
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as executor:
+            futures = {executor.submit(_run, job): key for key, (job, _, _) in pending.items()}
+            try:
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                        finished(futures[future])
+                    except Exception as e:
+                        finished(futures[future], e)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
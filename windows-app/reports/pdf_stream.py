@@ -0,0 +1,127 @@
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+import logging
+import os
+
+MARGIN = inch
+IMAGE_GAP = 20
+MARKER_HEIGHT = 14  # Caption line above and below image tiles
+
+
+class VolumeWriter:
+    """Writes a report page by page, starting a new PDF volume past a limit.
+
+    Pages are drawn straight onto a reportlab canvas instead of building a
+    platypus story, so only the current volume is held in memory. A volume
+    is closed once it reaches ``max_pages`` or its embedded images reach
+    ``max_bytes``; every volume repeats the report header.
+    """
+    def __init__(self, base_path, title, metadata, max_pages, max_bytes, progress=None, total_images=None):
+        self.base_path = base_path
+        self.title = title
+        self.metadata = metadata
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.progress = progress
+        self.total_images = total_images
+        self.width, self.height = letter
+        self.volumes = []
+        self.images_written = 0
+        self._canvas = None
+        self._pages = 0
+        self._bytes = 0
+        self._y = None
+
+    def _volume_path(self, number):
+        root, ext = os.path.splitext(self.base_path)
+        return f"{root}_vol{number}{ext}"
+
+    def _open_volume(self):
+        path = self._volume_path(len(self.volumes) + 1)
+        self.volumes.append(path)
+        self._canvas = canvas.Canvas(path, pagesize=letter, pageCompression=1)
+        self._canvas.setTitle(self.title)
+        self._pages = 1
+        self._bytes = 0
+        self._draw_header()
+
+    def _draw_header(self):
+        c = self._canvas
+        y = self.height - MARGIN
+        c.setFont("Helvetica-Bold", 24)
+        c.drawString(MARGIN, y - 24, self.title)
+        y -= 24 + 30
+        c.setFont("Helvetica", 12)
+        for line in self.metadata + [f"Volume: {len(self.volumes)}"]:
+            c.drawString(MARGIN, y - 12, line)
+            y -= 12 + 20
+        self._y = y - 20
+
+    def _draw_footer(self):
+        c = self._canvas
+        c.setFont("Helvetica", 9)
+        c.drawRightString(self.width - MARGIN, MARGIN / 2, f"Volume {len(self.volumes)} - page {self._pages}")
+
+    def _draw_marker(self, text):
+        self._canvas.setFont("Helvetica-Oblique", 9)
+        self._canvas.drawString(MARGIN, self._y - MARKER_HEIGHT + 4, text)
+        self._y -= MARKER_HEIGHT
+
+    def _end_page(self):
+        self._draw_footer()
+        self._canvas.showPage()  # Page content is serialised and released here
+        if self.progress:
+            self.progress.phase("report", f"Wrote page {self._pages} of volume {len(self.volumes)}",
+                                self.images_written, self.total_images)
+
+    def _close_volume(self):
+        self._end_page()
+        self._canvas.save()
+        logging.info(f"Report volume {self.volumes[-1]}: {self._pages} page(s), {self._bytes // 1024} KiB of images")
+        self._canvas = None
+
+    def add_image(self, path, width, height, caption=None, continues=False):
+        """Place one image below the previous one, breaking pages and volumes as needed.
+
+        ``caption`` is printed above the image; ``continues`` marks a tile
+        whose next part follows on the next page.
+        """
+        size = os.path.getsize(path)
+        if self._canvas is not None and self._bytes and self._bytes + size > self.max_bytes:
+            self._close_volume()
+        if self._canvas is None:
+            self._open_volume()
+        needed = height + (MARKER_HEIGHT if caption else 0) + (MARKER_HEIGHT if continues else 0)
+        if self._y - needed < MARGIN:
+            if self._pages >= self.max_pages:
+                self._close_volume()
+                self._open_volume()
+            else:
+                self._end_page()
+                self._pages += 1
+                self._y = self.height - MARGIN
+        if caption:
+            self._draw_marker(caption)
+        self._canvas.drawImage(path, MARGIN, self._y - height, width=width, height=height)
+        self._y -= height
+        if continues:
+            self._draw_marker("Continued on next page")
+            self._y = MARGIN  # The next part starts a new page
+        else:
+            self._y -= IMAGE_GAP
+        self._bytes += size
+        if not continues:
+            self.images_written += 1  # Counted once its last tile is placed
+
+    def close(self):
+        """Finish the last volume and return the paths of all volumes"""
+        if self._canvas is None and not self.volumes:
+            self._open_volume()  # Header-only report
+        if self._canvas is not None:
+            self._close_volume()
+        if len(self.volumes) == 1:
+            # A single volume keeps the usual report file name
+            os.replace(self.volumes[0], self.base_path)
+            self.volumes = [self.base_path]
+        return self.volumes
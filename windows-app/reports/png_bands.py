@@ -0,0 +1,120 @@
+from PIL import Image
+import io
+import struct
+import zlib
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+READ_SIZE = 1024 * 1024
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}  # Colour type -> samples per pixel
+_DECODE_CHUNKS = (b"PLTE", b"tRNS")  # Ancillary chunks needed to decode pixel data
+
+
+def image_size(path):
+    """(width, height) read from the file header only"""
+    with Image.open(path) as image:
+        return image.size
+
+
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+
+class _PngRows:
+    """Streams the filtered scanlines of a non-interlaced 8-bit PNG"""
+    def __init__(self, f):
+        if f.read(8) != PNG_SIGNATURE:
+            raise ValueError("Not a PNG file")
+        self.f = f
+        self.extra = b""
+        length, kind = struct.unpack(">I4s", f.read(8))
+        header = f.read(length)
+        f.read(4)
+        self.width, self.height, depth, self.color_type, _, _, interlace = struct.unpack(">IIBBBBB", header)
+        if kind != b"IHDR" or depth != 8 or interlace or self.color_type not in _CHANNELS:
+            raise ValueError("Only non-interlaced 8-bit PNGs are decoded in bands")
+        self.row_size = self.width * _CHANNELS[self.color_type] + 1  # Filter byte + samples
+        self._idat_left = self._next_idat()
+        self._inflate = zlib.decompressobj()
+        self._buffer = bytearray()
+        self._pending = b""
+
+    def _next_idat(self):
+        """Skip to the next IDAT chunk, keeping chunks needed for decoding; returns its length"""
+        while True:
+            header = self.f.read(8)
+            if len(header) < 8:
+                return 0
+            length, kind = struct.unpack(">I4s", header)
+            if kind == b"IDAT":
+                return length
+            data = self.f.read(length)
+            self.f.read(4)
+            if kind == b"IEND":
+                return 0
+            if kind in _DECODE_CHUNKS:
+                self.extra += _chunk(kind, data)
+
+    def read_rows(self, count):
+        """The next ``count`` filtered scanlines as one bytes object"""
+        needed = count * self.row_size
+        while len(self._buffer) < needed:
+            if not self._pending:
+                if not self._idat_left:
+                    raise ValueError("PNG image data ended early")
+                self._pending = self.f.read(min(self._idat_left, READ_SIZE))
+                self._idat_left -= len(self._pending)
+                if not self._idat_left:
+                    self.f.read(4)  # CRC
+                    self._idat_left = self._next_idat()
+            # Inflate no more than the band needs; flat screenshots compress a thousandfold
+            self._buffer += self._inflate.decompress(self._pending, needed - len(self._buffer))
+            self._pending = self._inflate.unconsumed_tail
+        rows = bytes(self._buffer[:needed])
+        del self._buffer[:needed]
+        return rows
+
+    def decode(self, rows, count, previous):
+        """Unfilter ``count`` scanlines with PIL.
+
+        Scanlines are filtered against the row above, so the band is wrapped
+        in a small PNG whose first, unfiltered row is the last decoded row
+        of the previous band; that row is dropped again after decoding.
+        """
+        if previous is not None:
+            rows = b"\x00" + previous + rows
+            count += 1
+        header = struct.pack(">IIBBBBB", self.width, count, 8, self.color_type, 0, 0, 0)
+        data = (PNG_SIGNATURE + _chunk(b"IHDR", header) + self.extra
+                + _chunk(b"IDAT", zlib.compress(rows, 0)) + _chunk(b"IEND", b""))
+        band = Image.open(io.BytesIO(data))
+        band.load()
+        if previous is not None:
+            band = band.crop((0, 1, self.width, count))
+        return band
+
+
+def iter_bands(path, band_rows):
+    """Yield ``(top, image)`` horizontal bands of at most ``band_rows`` pixels.
+
+    8-bit non-interlaced PNGs (what browsers capture) are inflated band by
+    band, so only one band is ever decoded in memory. Other images fall
+    back to a full decode and are cropped.
+    """
+    with open(path, 'rb') as f:
+        try:
+            png = _PngRows(f)
+        except (ValueError, struct.error):
+            png = None
+        if png is not None:
+            previous = None
+            for top in range(0, png.height, band_rows):
+                count = min(band_rows, png.height - top)
+                band = png.decode(png.read_rows(count), count, previous)
+                previous = band.crop((0, count - 1, png.width, count)).tobytes()
+                yield top, band
+            return
+
+    with Image.open(path) as image:
+        image.load()
+        for top in range(0, image.height, band_rows):
+            yield top, image.crop((0, top, image.width, min(top + band_rows, image.height)))
@@ -1,22 +1,70 @@
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, KeepTogether, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from datetime import datetime
+from automation.blob_store import get_blob_store
+from reports.image_cache import ImageCache
+from reports.case_report import CaseReport
+from reports.pdf_stream import VolumeWriter
+import logging
 import os
+import tempfile
+import config
+from automation.tracing import span
+
+IMAGE_WIDTH = 500  # Points; images are printed in this box
+IMAGE_HEIGHT = 300
+TILE_HEIGHT = 560  # Points; tall captures are cut into tiles of at most this height
+STREAM_BATCH = 50  # Images downscaled ahead of the pages being written
 
 class ReportGenerator:
     def __init__(self, output_dir="reports"):
         self.output_dir = output_dir
+        self.image_cache = ImageCache()
         self._create_output_dir()
         
     def _create_output_dir(self):
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
             
-    def generate_report(self, platform, username, data_type, screenshot_paths):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{self.output_dir}/{platform}_{username}_{data_type}_{timestamp}.pdf"
+    def _metadata_lines(self, platform, username, data_type):
+        return [
+            f"Platform: {platform}",
+            f"Username: {username}",
+            f"Data Type: {data_type}",
+            f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        ]
+
+    def _tiles(self, screenshot_path, tiles):
+        """``(path, caption, continues, width, height)`` per part; only tiled images get markers"""
+        if len(tiles) == 1:
+            path, width, height = tiles[0]
+            return [(path, None, False, width, height)]
+        name = os.path.basename(screenshot_path)
+        return [(path, f"{name} - part {part} of {len(tiles)}" + (" (continued)" if part > 1 else ""),
+                 part < len(tiles), width, height)
+                for part, (path, width, height) in enumerate(tiles, 1)]
+
+    def generate_report(self, platform, username, data_type, screenshot_paths, progress=None, streaming=None,
+                        filename=None, title=None):
+        """Build a PDF report from screenshot paths or ``sha256:`` blob references.
+
+        ``progress`` is an optional ProgressReporter. Reports with more than
+        REPORT_STREAMING_THRESHOLD images (or ``streaming=True``) are written
+        page by page; if they are split into volumes the list of volume
+        paths is returned instead of a single path.
+        """
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{self.output_dir}/{platform}_{username}_{data_type}_{timestamp}.pdf"
+        title = title or f"Social Media Evidence Report - {platform}"
+        screenshot_paths = [path for path in map(get_blob_store().resolve, screenshot_paths) if os.path.exists(path)]
+        if streaming is None:
+            streaming = len(screenshot_paths) > config.REPORT_STREAMING_THRESHOLD
+        if streaming:
+            volumes = self.generate_streaming_report(filename, platform, username, data_type, screenshot_paths, progress, title)
+            return volumes[0] if len(volumes) == 1 else volumes
         
         doc = SimpleDocTemplate(filename, pagesize=letter)
         styles = getSampleStyleSheet()
@@ -29,8 +77,7 @@ class ReportGenerator:
             fontSize=24,
             spaceAfter=30
         )
-        title = Paragraph(f"Social Media Evidence Report - {platform}", title_style)
-        story.append(title)
+        story.append(Paragraph(title, title_style))
         
         # Add metadata
         metadata_style = ParagraphStyle(
@@ -39,25 +86,81 @@ class ReportGenerator:
             fontSize=12,
             spaceAfter=20
         )
-        metadata = [
-            f"Platform: {platform}",
-            f"Username: {username}",
-            f"Data Type: {data_type}",
-            f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        ]
-        
-        for line in metadata:
+        for line in self._metadata_lines(platform, username, data_type):
             story.append(Paragraph(line, metadata_style))
         
         story.append(Spacer(1, 20))
         
-        # Add screenshots
-        for screenshot_path in screenshot_paths:
-            if os.path.exists(screenshot_path):
-                img = Image(screenshot_path, width=500, height=300)
-                story.append(img)
-                story.append(Spacer(1, 20))
+        # Downscale to print resolution once (tall captures become tiles), then add screenshots
+        marker_style = ParagraphStyle(
+            'TileMarker',
+            parent=styles['Italic'],
+            fontSize=9
+        )
+        with span("prepare_images", "report", images=len(screenshot_paths)):
+            placements = self.image_cache.prepare(screenshot_paths, IMAGE_WIDTH, IMAGE_HEIGHT, progress=progress,
+                                                  tile_height_pt=TILE_HEIGHT)
+        for i, (screenshot_path, tiles) in enumerate(zip(screenshot_paths, placements)):
+            if progress:
+                progress.phase("report", f"Adding {os.path.basename(screenshot_path)}", i + 1, len(screenshot_paths) + 1)
+            for print_path, caption, continues, width, height in self._tiles(screenshot_path, tiles):
+                if not os.path.exists(print_path):
+                    continue
+                flowables = [Image(print_path, width=width, height=height)]
+                if caption:
+                    flowables.insert(0, Paragraph(caption, marker_style))
+                if continues:
+                    flowables.append(Paragraph("Continued on next page", marker_style))
+                story.append(KeepTogether(flowables))
+                story.append(PageBreak() if continues else Spacer(1, 20))
         
         # Build PDF
-        doc.build(story)
-        return filename 
\ No newline at end of file
+        if progress:
+            progress.phase("report", f"Writing {filename}", len(screenshot_paths) + 1, len(screenshot_paths) + 1)
+        with span("pdf_build", "report", images=len(screenshot_paths)):
+            doc.build(story)
+        return filename
+
+    def generate_streaming_report(self, filename, platform, username, data_type, screenshot_paths, progress=None, title=None):
+        """Write a report page by page with bounded memory; returns the volume paths.
+
+        Images are downscaled in batches just ahead of the pages that use
+        them and the output is split into volumes past REPORT_VOLUME_MAX_PAGES
+        pages or REPORT_VOLUME_MAX_MB of image data.
+        """
+        writer = VolumeWriter(filename, title or f"Social Media Evidence Report - {platform}",
+                              self._metadata_lines(platform, username, data_type),
+                              config.REPORT_VOLUME_MAX_PAGES, config.REPORT_VOLUME_MAX_MB * 1024 * 1024,
+                              progress=progress, total_images=len(screenshot_paths))
+        for start in range(0, len(screenshot_paths), STREAM_BATCH):
+            batch = screenshot_paths[start:start + STREAM_BATCH]
+            with span("prepare_images", "report", images=len(batch)):
+                placements = self.image_cache.prepare(batch, IMAGE_WIDTH, IMAGE_HEIGHT, progress=progress,
+                                                      tile_height_pt=TILE_HEIGHT)
+            with span("pdf_pages", "report", images=len(batch)):
+                for screenshot_path, tiles in zip(batch, placements):
+                    for print_path, caption, continues, width, height in self._tiles(screenshot_path, tiles):
+                        writer.add_image(print_path, width, height, caption, continues)
+        volumes = writer.close()
+        logging.info(f"Streamed {writer.images_written} image(s) into {len(volumes)} volume(s)")
+        return volumes
+
+    def append_to_case(self, platform, username, data_type, screenshot_paths, progress=None):
+        """Add this capture as a new section of the target's case report; returns the case report path.
+
+        The section is rendered on its own and appended as an incremental
+        update, so earlier captures in the case are not rebuilt.
+        """
+        path = os.path.join(config.REPORT_CASE_DIR, f"{platform}_{username}_{data_type}.pdf")
+        os.makedirs(config.REPORT_CASE_DIR, exist_ok=True)
+        captured = datetime.now()
+        with tempfile.TemporaryDirectory(dir=config.REPORT_CASE_DIR) as temp_dir:
+            section = self.generate_report(platform, username, data_type, screenshot_paths, progress,
+                                           filename=os.path.join(temp_dir, "section.pdf"),
+                                           title=f"Capture {captured.strftime('%Y-%m-%d %H:%M')} - {platform}")
+            if progress:
+                progress.phase("report", f"Appending capture to {path}")
+            with span("case_append", "report"):
+                CaseReport(path).append_section(section if isinstance(section, list) else [section],
+                                                f"{captured.strftime('%Y-%m-%d %H:%M:%S')} ({len(screenshot_paths)} screenshots)")
+        return path
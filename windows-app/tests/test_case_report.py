@@ -0,0 +1,48 @@
+import io
+from pypdf import PdfReader, PdfWriter
+from reportlab.pdfgen import canvas
+from reports.case_report import CaseReport
+
+
+def _section(tmp_path, name, pages=1):
+    path = str(tmp_path / f"{name}.pdf")
+    pdf = canvas.Canvas(path)
+    for i in range(pages):
+        pdf.drawString(100, 700, f"{name} page {i + 1}")
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+def test_append_twice_keeps_earlier_bytes_and_reads_strictly(tmp_path):
+    report = CaseReport(str(tmp_path / "case.pdf"))
+    assert report.append_section([_section(tmp_path, "run1")], "Run 1") == 0
+    first = open(report.path, 'rb').read()
+    assert report.append_section([_section(tmp_path, "run2", pages=2)], "Run 2") == 1
+    second = open(report.path, 'rb').read()
+    assert report.append_section([_section(tmp_path, "run3")], "Run 3") == 3
+    third = open(report.path, 'rb').read()
+    assert second.startswith(first) and third.startswith(second)
+
+    reader = PdfReader(report.path, strict=True)
+    assert [page.extract_text().strip() for page in reader.pages] == [
+        "run1 page 1", "run2 page 1", "run2 page 2", "run3 page 1"]
+    assert report.sections() == [("Run 1", 1), ("Run 2", 2), ("Run 3", 4)]
+
+    sizes = [PdfReader(io.BytesIO(data), strict=True).trailer["/Size"] for data in (first, second, third)]
+    assert sizes == sorted(set(sizes))  # Each update numbers its objects past the previous /Size
+
+
+def test_append_after_xref_stream_update(tmp_path):
+    # Case files written by pypdf's own incremental mode end in a cross-reference stream
+    path = str(tmp_path / "case.pdf")
+    CaseReport(path).append_section([_section(tmp_path, "run1")], "Run 1")
+    reader = PdfReader(path)
+    writer = PdfWriter(reader, incremental=True)
+    writer.append(_section(tmp_path, "run2"), import_outline=False)
+    with open(path, 'wb') as f:
+        writer.write(f)
+
+    assert CaseReport(path).append_section([_section(tmp_path, "run3")], "Run 3") == 2
+    reader = PdfReader(path, strict=True)
+    assert [page.extract_text().strip() for page in reader.pages] == ["run1 page 1", "run2 page 1", "run3 page 1"]
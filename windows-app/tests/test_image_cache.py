@@ -0,0 +1,32 @@
+from PIL import Image
+from reports.image_cache import ImageCache
+
+
+def _image(tmp_path, name, size):
+    path = str(tmp_path / f"{name}.png")
+    Image.new("RGB", size, "white").save(path)
+    return path
+
+
+def test_screenshots_keep_their_aspect_ratio_in_the_box(tmp_path):
+    cache = ImageCache(root=str(tmp_path / "cache"), workers=1)
+    paths = [_image(tmp_path, "wide", (1920, 600)), _image(tmp_path, "screen", (1920, 1080)),
+             _image(tmp_path, "squarish", (1000, 700))]
+    prepared = cache.prepare(paths, 500, 300, tile_height_pt=600)
+    for path, placements in zip(paths, prepared):
+        assert len(placements) == 1
+        target, width, height = placements[0]
+        source = Image.open(path)
+        assert width <= 500 and height <= 300
+        assert abs(width / height - source.width / source.height) < 0.01
+        with Image.open(target) as printed:
+            assert abs(printed.width / printed.height - source.width / source.height) < 0.01
+    assert prepared[0][0][1:] == (500, 500 * 600 / 1920)  # Wide captures span the box width
+    assert prepared[2][0][1:] == (300 * 1000 / 700, 300)  # Near-square ones fill its height
+
+
+def test_tall_captures_are_tiled_at_full_width(tmp_path):
+    cache = ImageCache(root=str(tmp_path / "cache"), workers=1)
+    prepared = cache.prepare([_image(tmp_path, "tall", (1000, 3000))], 500, 300, tile_height_pt=600)
+    assert len(prepared[0]) == 3
+    assert all(width == 500 for _, width, _ in prepared[0])
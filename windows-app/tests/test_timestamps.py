@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+from automation.scroll_engine import parse_timestamp
+
+EXPECTED = datetime(2025, 6, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def test_reddit_shreddit_timestamp():
+    # shreddit-post created-timestamp: six fraction digits and an offset without a colon
+    assert parse_timestamp("2025-06-01T10:00:00.000000+0000") == EXPECTED
+    assert parse_timestamp("2025-06-01T12:00:00.000000+0200") == EXPECTED
+
+
+def test_mastodon_timestamp():
+    # Mastodon created_at and <time datetime>: milliseconds with a Z suffix
+    assert parse_timestamp("2025-06-01T10:00:00.000Z") == EXPECTED
+    assert parse_timestamp("2025-06-01T10:00:00Z") == EXPECTED
+
+
+def test_other_iso_variants():
+    assert parse_timestamp("2025-06-01T10:00:00+00:00") == EXPECTED
+    assert parse_timestamp("2025-06-01T10:00:00.1234567Z") == datetime(2025, 6, 1, 10, 0, 0, 123456, tzinfo=timezone.utc)
+    assert parse_timestamp("2025-06-01T10:00:00") == EXPECTED  # Naive values are taken as UTC
+
@@ -0,0 +1,9 @@
+from automation.watermarks import to_timestamp, is_seen
+
+
+def test_browser_timestamps_are_kept():
+    mark = {"id": "t3_old", "timestamp": to_timestamp("2025-06-01T10:00:00.000000+0000")}
+    assert mark["timestamp"] == "2025-06-01T10:00:00+00:00"
+    assert is_seen(mark, "t3_other", "2025-06-01T09:00:00.000000+0000")
+    assert not is_seen(mark, "t3_new", "2025-06-01T11:00:00.000000+0000")
+    assert to_timestamp(1748772000) == "2025-06-01T10:00:00+00:00"  # Reddit API created_utc